@@ -12,7 +12,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 
-from shared.constants import BOARD_SPACES
+from shared.constants import space_at
 from shared.enums import GamePhase
 
 
@@ -298,8 +298,8 @@ class ActionPanel(QWidget):
             elif phase == "PROPERTY_DECISION":
                 # Check if can afford
                 position = my_player.get("position", 0)
-                space = BOARD_SPACES.get(position, {})
-                cost = space.get("cost", 0)
+                space = space_at(position)
+                cost = space.cost if space else 0
                 
                 self._buy_btn.setEnabled(my_player.get("money", 0) >= cost)
                 self._buy_btn.setText(f"💰 Buy for ${cost}")
@@ -323,8 +323,8 @@ class ActionPanel(QWidget):
         """Select a property for management."""
         self._selected_position = position
         
-        space = BOARD_SPACES.get(position, {})
-        name = space.get("name", f"Space {position}")
+        space = space_at(position)
+        name = space.name if space else f"Space {position}"
         self._selected_prop_label.setText(f"Selected: {name}")
         
         self._update_property_buttons()
@@ -357,22 +357,22 @@ class ActionPanel(QWidget):
                 my_money = p.get("money", 0)
                 break
         
-        space = BOARD_SPACES.get(self._selected_position, {})
-        house_cost = space.get("house_cost", 0)
+        space = space_at(self._selected_position)
+        house_cost = space.house_cost if space else 0
         is_mortgaged = prop_data.get("is_mortgaged", False)
         houses = prop_data.get("houses", 0)
         has_hotel = prop_data.get("has_hotel", False)
         
         if is_mortgaged:
             # Can only unmortgage
-            mortgage_value = space.get("cost", 0) // 2
+            mortgage_value = (space.cost if space else 0) // 2
             unmortgage_cost = int(mortgage_value * 1.1)
             self._unmortgage_btn.setEnabled(my_money >= unmortgage_cost)
             self._unmortgage_btn.setText(f"💳 Unmortgage (${unmortgage_cost})")
         else:
             # Can mortgage if no buildings
             if houses == 0 and not has_hotel:
-                mortgage_value = space.get("cost", 0) // 2
+                mortgage_value = (space.cost if space else 0) // 2
                 self._mortgage_btn.setEnabled(True)
                 self._mortgage_btn.setText(f"🏦 Mortgage (+${mortgage_value})")
             
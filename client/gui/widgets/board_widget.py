@@ -10,7 +10,7 @@ from PyQt6.QtWidgets import QWidget, QToolTip
 from PyQt6.QtCore import Qt, QRect, QPoint, pyqtSignal
 from PyQt6.QtGui import QPainter, QColor, QFont, QPen, QBrush, QFontMetrics
 
-from shared.constants import BOARD_SIZE, BOARD_SPACES
+from shared.constants import BOARD_SIZE, space_at
 from client.gui.styles import (
     PROPERTY_COLORS, PLAYER_COLORS, SPACE_COLORS,
     BACKGROUND_COLOR, BOARD_EDGE_COLOR, MORTGAGED_OVERLAY
@@ -141,10 +141,10 @@ class BoardWidget(QWidget):
     def _draw_space(self, painter: QPainter, position: int) -> None:
         """Draw a single board space."""
         rect = self._get_space_rect(position)
-        space_data = BOARD_SPACES.get(position, {})
-        space_type = space_data.get("type", "")
-        space_name = space_data.get("name", f"Space {position}")
-        space_group = space_data.get("group")
+        space_data = space_at(position)
+        space_type = space_data.type if space_data else ""
+        space_name = space_data.name if space_data else f"Space {position}"
+        space_group = space_data.group if space_data else None
         
         # Get property data if we have game state
         prop_data = None
@@ -348,9 +348,9 @@ class BoardWidget(QWidget):
             
             # Show tooltip with space info
             if pos is not None:
-                space_data = BOARD_SPACES.get(pos, {})
-                name = space_data.get("name", f"Space {pos}")
-                cost = space_data.get("cost")
+                space_data = space_at(pos)
+                name = space_data.name if space_data else f"Space {pos}"
+                cost = space_data.cost if space_data else None
                 
                 tooltip = name
                 if cost:
@@ -13,7 +13,7 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QPalette, QColor
 
 from client.gui.styles import PLAYER_COLORS, PROPERTY_COLORS
-from shared.constants import BOARD_SPACES
+from shared.constants import space_at
 
 
 class PlayerCard(QFrame):
@@ -112,15 +112,16 @@ class PlayerCard(QFrame):
         self._money_label.setText(f"${money:,}")
         
         # Position
-        space_name = BOARD_SPACES.get(position, {}).get("name", f"Space {position}")
+        space = space_at(position)
+        space_name = space.name if space else f"Space {position}"
         self._position_label.setText(f"📍 {space_name}")
         
         # Properties - group by color
         if properties:
             groups = {}
             for pos in properties:
-                space = BOARD_SPACES.get(pos, {})
-                group = space.get("group", "Other")
+                space = space_at(pos)
+                group = space.group if space else "Other"
                 if group not in groups:
                     groups[group] = 0
                 groups[group] += 1
@@ -12,7 +12,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QColor
 
-from shared.constants import BOARD_SPACES
+from shared.constants import space_at
 from client.gui.styles import PROPERTY_COLORS
 
 
@@ -25,13 +25,13 @@ class PropertyDialog(QDialog):
         self.setWindowTitle("Property Details")
         self.setMinimumWidth(300)
         
-        space = BOARD_SPACES.get(position, {})
+        space = space_at(position)
         prop_data = game_state.get("board", {}).get(str(position), {})
         
         layout = QVBoxLayout(self)
         
         # Color bar
-        group = space.get("group")
+        group = space.group if space else None
         if group and group in PROPERTY_COLORS:
             color_bar = QFrame()
             color_bar.setFixedHeight(30)
@@ -40,14 +40,14 @@ class PropertyDialog(QDialog):
             layout.addWidget(color_bar)
         
         # Name
-        name = space.get("name", f"Space {position}")
+        name = space.name if space else f"Space {position}"
         name_label = QLabel(name)
         name_label.setFont(QFont("Arial", 18, QFont.Weight.Bold))
         name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(name_label)
         
         # Type
-        space_type = space.get("type", "")
+        space_type = space.type if space else ""
         type_label = QLabel(space_type.replace("_", " ").title())
         type_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         type_label.setStyleSheet("color: #7F8C8D;")
@@ -64,7 +64,7 @@ class PropertyDialog(QDialog):
         row = 0
         
         # Cost
-        cost = space.get("cost")
+        cost = space.cost if space else None
         if cost:
             details_layout.addWidget(QLabel("Purchase Price:"), row, 0)
             details_layout.addWidget(QLabel(f"${cost}"), row, 1)
@@ -103,7 +103,7 @@ class PropertyDialog(QDialog):
             row += 1
         
         # Rent table for properties
-        rents = space.get("rents")
+        rents = space.rents if space else None
         if rents and space_type == "PROPERTY":
             details_layout.addWidget(QLabel(""), row, 0)
             row += 1
@@ -118,7 +118,7 @@ class PropertyDialog(QDialog):
                 row += 1
             
             # House cost
-            house_cost = space.get("house_cost", 0)
+            house_cost = space.house_cost if space else 0
             details_layout.addWidget(QLabel(""), row, 0)
             row += 1
             details_layout.addWidget(QLabel("House Cost:"), row, 0)
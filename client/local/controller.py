@@ -9,7 +9,7 @@ from typing import Optional, Callable
 from PyQt6.QtCore import QObject, pyqtSignal
 
 from server.game_engine import Game, Player
-from shared.enums import MessageType, GamePhase
+from shared.enums import MessageType, GamePhase, PlayerState
 
 
 class LocalGameController(QObject):
@@ -197,7 +197,7 @@ class LocalGameController(QObject):
             self._emit_event(MessageType.JAIL_STATUS.value, {
                 "player_id": self._active_player_id,
                 "player_name": player.name,
-                "in_jail": player.state.value == "IN_JAIL",
+                "in_jail": player.state is PlayerState.IN_JAIL,
                 "reason": "rolled_doubles" if result.is_double else "sent_to_jail",
             })
         
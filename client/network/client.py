@@ -18,12 +18,15 @@ import websockets
 from websockets.client import WebSocketClientProtocol
 
 from client.config import settings
-from shared.protocol import Message, parse_message
+from shared.protocol import Message, decode_json, encode_json, parse_message
 from shared.enums import MessageType
 
 
 logger = logging.getLogger(__name__)
 
+# Frames longer than this (in characters) are decoded on a worker thread
+LARGE_MESSAGE_THRESHOLD = 4096
+
 
 class ConnectionState(Enum):
     """Connection state."""
@@ -128,6 +131,7 @@ class NetworkClient(QObject):
                 "data": {
                     "player_id": self._player_id,
                     "player_name": self._player_name,
+                    "supports_batch": True,
                 }
             }
             await self._websocket.send(json.dumps(connect_msg))
@@ -204,8 +208,16 @@ class NetworkClient(QObject):
         try:
             async for raw_message in self._websocket:
                 try:
-                    data = json.loads(raw_message)
-                    await self._handle_message(data)
+                    if len(raw_message) > LARGE_MESSAGE_THRESHOLD:
+                        # Full game states shouldn't stall the event loop
+                        data = await asyncio.to_thread(decode_json, raw_message)
+                    else:
+                        data = decode_json(raw_message)
+                    if data.get("type") == MessageType.BATCH.value:
+                        for message in data.get("data", {}).get("messages", []):
+                            await self._handle_message(message)
+                    else:
+                        await self._handle_message(data)
                 except json.JSONDecodeError as e:
                     logger.error(f"Failed to parse message: {e}")
                 except Exception as e:
@@ -284,7 +296,7 @@ class NetworkClient(QObject):
             if isinstance(message, Message):
                 data = message.to_json()
             else:
-                data = json.dumps(message)
+                data = encode_json(message)
             
             await self._websocket.send(data)
             
@@ -312,19 +324,17 @@ class NetworkClient(QObject):
             if not message.request_id:
                 message.request_id = str(uuid.uuid4())
             request_id = message.request_id
-            data = message.to_dict()
         else:
             if "request_id" not in message:
                 message["request_id"] = str(uuid.uuid4())
             request_id = message["request_id"]
-            data = message
         
         # Create future for response
         future = asyncio.get_event_loop().create_future()
         self._pending_requests[request_id] = future
         
         try:
-            await self.send(data)
+            await self.send(message)
             response = await asyncio.wait_for(future, timeout=timeout)
             return response
         except asyncio.TimeoutError:
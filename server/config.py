@@ -14,9 +14,16 @@ class Config:
     HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
     PORT: int = int(os.getenv("SERVER_PORT", "8765"))
     SECRET_KEY: str = os.getenv("SERVER_SECRET_KEY", "change-me-in-production")
+    WS_COMPRESSION: str = os.getenv("WS_COMPRESSION", "deflate").lower()  # "deflate" or "none"
+    PING_INTERVAL: float = float(os.getenv("PING_INTERVAL", "120"))  # seconds
+    PING_TIMEOUT: float = float(os.getenv("PING_TIMEOUT", "30"))  # seconds
+    MAX_MESSAGE_SIZE: int = int(os.getenv("MAX_MESSAGE_SIZE", "65536"))  # bytes, incoming
     
     # Database
     DATABASE_PATH: Path = Path(os.getenv("DATABASE_PATH", "./data/monopoly.db"))
+    DB_READER_POOL: int = int(os.getenv("DB_READER_POOL", "8"))  # reader connections alongside the writer
+    AUTO_SAVE_DEBOUNCE: float = float(os.getenv("AUTO_SAVE_DEBOUNCE", "0.5"))  # seconds
+    WAL_CHECKPOINT_INTERVAL: float = float(os.getenv("WAL_CHECKPOINT_INTERVAL", "30"))  # seconds
     
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
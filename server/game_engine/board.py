@@ -10,7 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from shared.constants import (
     BOARD_SIZE, BOARD_SPACES, PROPERTY_GROUPS,
-    UTILITY_MULTIPLIERS
+    UTILITY_MULTIPLIERS, BoardSpace, space_at
 )
 from shared.enums import SpaceType, PropertyGroup
 
@@ -223,19 +223,19 @@ class Board:
     
     def _initialize_properties(self) -> None:
         """Create all purchasable properties from constants."""
-        for position, space_data in BOARD_SPACES.items():
-            if space_data["type"] in ("PROPERTY", "RAILROAD", "UTILITY"):
+        for position, space in enumerate(BOARD_SPACES):
+            if space.type in ("PROPERTY", "RAILROAD", "UTILITY"):
                 self.properties[position] = Property(
                     position=position,
-                    name=space_data["name"],
-                    space_type=SpaceType(space_data["type"]),
-                    cost=space_data["cost"],
-                    group=space_data["group"],
-                    rents=space_data["rents"],
-                    house_cost=space_data["house_cost"],
+                    name=space.name,
+                    space_type=SpaceType(space.type),
+                    cost=space.cost,
+                    group=space.group,
+                    rents=list(space.rents) if space.rents else None,
+                    house_cost=space.house_cost,
                 )
     
-    def get_space(self, position: int) -> dict:
+    def get_space(self, position: int) -> BoardSpace | None:
         """
         Get information about a board space.
         
@@ -243,14 +243,14 @@ class Board:
             position: Board position (0-39)
             
         Returns:
-            Space data dictionary
+            Space data, or None for an invalid position
         """
-        return BOARD_SPACES.get(position, {})
+        return space_at(position)
     
     def get_space_type(self, position: int) -> SpaceType:
         """Get the type of space at a position."""
         space = self.get_space(position)
-        return SpaceType(space.get("type", "GO"))
+        return SpaceType(space.type if space else "GO")
     
     def get_property(self, position: int) -> Property | None:
         """Get property at position, if it exists."""
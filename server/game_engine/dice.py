@@ -50,6 +50,23 @@ class Dice:
         die2 = self._random.randint(1, 6)
         return DiceResult(die1=die1, die2=die2)
     
+    def roll_batch(self, count: int) -> tuple[list[int], list[int]]:
+        """
+        Roll two six-sided dice several times in one call.
+        
+        Draws values in the same order as repeated roll() calls, so a
+        seeded Dice produces the same sequence either way.
+        
+        Args:
+            count: Number of rolls
+            
+        Returns:
+            Lists of first-die and second-die values, one entry per roll
+        """
+        randint = self._random.randint
+        values = [randint(1, 6) for _ in range(2 * count)]
+        return values[0::2], values[1::2]
+    
     def set_seed(self, seed: int) -> None:
         """Set random seed for reproducible results."""
         self._random.seed(seed)
@@ -1,6 +1,7 @@
 """
 Main game orchestration - ties all components together.
 """
+import functools
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -23,6 +24,16 @@ from .cards import CardManager, Card, CardAction
 from .rules import RuleEngine, ValidationResult, ActionResult
 
 
+def _mutates_state(method: Callable) -> Callable:
+    """Mark a Game method as one that can change the game state."""
+    @functools.wraps(method)
+    def wrapper(self: "Game", *args, **kwargs):
+        # Bump before running so a failure part-way still invalidates caches
+        self.state_version += 1
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
 @dataclass
 class GameEvent:
     """Represents something that happened in the game."""
@@ -65,6 +76,9 @@ class Game:
     last_dice_roll: Optional[DiceResult] = None
     winner_id: Optional[str] = None
     
+    # Incremented by every mutating action; lets callers cache derived state
+    state_version: int = field(default=0, init=False, repr=False)
+    
     # Event log
     events: List[GameEvent] = field(default_factory=list)
     
@@ -138,6 +152,7 @@ class Game:
     
     # =========== Player Management ===========
     
+    @_mutates_state
     def add_player(self, name: str, player_id: Optional[str] = None) -> Tuple[bool, str, Optional[Player]]:
         """
         Add a player to the game.
@@ -165,6 +180,7 @@ class Game:
         
         return True, f"{name} joined the game", player
     
+    @_mutates_state
     def remove_player(self, player_id: str) -> Tuple[bool, str]:
         """Remove a player from the game."""
         if player_id not in self.players:
@@ -184,6 +200,7 @@ class Game:
         
         return True, f"{player.name} left the game"
     
+    @_mutates_state
     def start_game(self) -> Tuple[bool, str]:
         """Start the game."""
         if self.phase != GamePhase.WAITING:
@@ -210,6 +227,7 @@ class Game:
     
     # =========== Dice Rolling ===========
     
+    @_mutates_state
     def roll_dice(self, player_id: str) -> Tuple[bool, str, Optional[DiceResult]]:
         """
         Roll dice for a player.
@@ -334,8 +352,8 @@ class Game:
     ) -> Tuple[bool, str, DiceResult]:
         """Handle what happens when player lands on a space."""
         space = self.board.get_space(player.position)
-        space_type = SpaceType(space["type"])
-        space_name = space["name"]
+        space_type = SpaceType(space.type)
+        space_name = space.name
         
         if space_type == SpaceType.GO:
             self.phase = GamePhase.POST_ROLL
@@ -359,7 +377,7 @@ class Game:
             return True, "Go to Jail!", dice_result
         
         elif space_type == SpaceType.TAX:
-            tax_amount = space["cost"]
+            tax_amount = space.cost
             if player.can_afford(tax_amount):
                 player.remove_money(tax_amount)
                 self.phase = GamePhase.POST_ROLL
@@ -556,6 +574,7 @@ class Game:
     
     # =========== Property Actions ===========
     
+    @_mutates_state
     def buy_property(self, player_id: str) -> Tuple[bool, str]:
         """Buy the property the player is standing on."""
         player = self.players.get(player_id)
@@ -588,6 +607,7 @@ class Game:
         
         return True, f"Bought {prop.name} for ${prop.cost}"
     
+    @_mutates_state
     def decline_property(self, player_id: str) -> Tuple[bool, str]:
         """Decline to buy property (would trigger auction in full rules)."""
         player = self.players.get(player_id)
@@ -613,6 +633,7 @@ class Game:
         
         return True, f"Declined to buy {prop.name if prop else 'property'}"
     
+    @_mutates_state
     def build_house(self, player_id: str, position: int) -> Tuple[bool, str]:
         """Build a house on a property."""
         player = self.players.get(player_id)
@@ -642,6 +663,7 @@ class Game:
         
         return True, f"Built house on {prop.name} (now {prop.houses} houses)"
     
+    @_mutates_state
     def build_hotel(self, player_id: str, position: int) -> Tuple[bool, str]:
         """Build a hotel on a property."""
         player = self.players.get(player_id)
@@ -670,6 +692,7 @@ class Game:
         
         return True, f"Built hotel on {prop.name}"
     
+    @_mutates_state
     def sell_building(self, player_id: str, position: int) -> Tuple[bool, str]:
         """Sell a house or hotel from a property."""
         player = self.players.get(player_id)
@@ -703,6 +726,7 @@ class Game:
         
         return True, f"Sold {building_type} on {prop.name} for ${refund}"
     
+    @_mutates_state
     def mortgage_property(self, player_id: str, position: int) -> Tuple[bool, str]:
         """Mortgage a property."""
         player = self.players.get(player_id)
@@ -726,6 +750,7 @@ class Game:
         
         return True, f"Mortgaged {prop.name} for ${mortgage_value}"
     
+    @_mutates_state
     def unmortgage_property(self, player_id: str, position: int) -> Tuple[bool, str]:
         """Unmortgage a property."""
         player = self.players.get(player_id)
@@ -752,6 +777,7 @@ class Game:
     
     # =========== Jail Actions ===========
     
+    @_mutates_state
     def pay_bail(self, player_id: str) -> Tuple[bool, str]:
         """Pay bail to get out of jail."""
         player = self.players.get(player_id)
@@ -776,6 +802,7 @@ class Game:
         
         return True, f"Paid ${JAIL_BAIL} bail"
     
+    @_mutates_state
     def use_jail_card(self, player_id: str) -> Tuple[bool, str]:
         """Use Get Out of Jail Free card."""
         player = self.players.get(player_id)
@@ -804,6 +831,7 @@ class Game:
     
     # =========== Turn Management ===========
     
+    @_mutates_state
     def end_turn(self, player_id: str) -> Tuple[bool, str]:
         """End current player's turn."""
         player = self.players.get(player_id)
@@ -855,6 +883,7 @@ class Game:
     
     # =========== Bankruptcy ===========
     
+    @_mutates_state
     def declare_bankruptcy(self, player_id: str, creditor_id: Optional[str] = None) -> Tuple[bool, str]:
         """Declare bankruptcy."""
         player = self.players.get(player_id)
@@ -922,7 +951,7 @@ class Game:
             "phase": self.phase.value,
             "turn_number": self.turn_number,
             "current_player_index": self.current_player_index,
-            "player_order": self.player_order,
+            "player_order": list(self.player_order),
             "winner_id": self.winner_id,
             "last_dice_roll": self.last_dice_roll.to_list() if self.last_dice_roll else None,
             "players": {
@@ -970,13 +999,18 @@ class Game:
         Get game state formatted for a specific player.
         Hides other players' private information if needed.
         """
+        state = self.get_public_state()
+        state.update(self.get_private_overlay(player_id))
+        return state
+    
+    def get_public_state(self) -> dict:
+        """Get the part of the game state that is the same for every player."""
         return {
             "game_id": self.id,
             "game_name": self.name,
             "phase": self.phase.value,
             "turn_number": self.turn_number,
             "current_player_id": self.current_player.id if self.current_player else None,
-            "is_your_turn": self.current_player and self.current_player.id == player_id,
             "last_dice_roll": self.last_dice_roll.to_list() if self.last_dice_roll else None,
             "players": [
                 self.players[pid].to_dict()
@@ -991,3 +1025,9 @@ class Game:
             "hotels_available": self.rules.hotels_available,
             "winner_id": self.winner_id,
         }
+    
+    def get_private_overlay(self, player_id: str) -> dict:
+        """Get the fields of the game state that differ per player."""
+        return {
+            "is_your_turn": self.current_player and self.current_player.id == player_id,
+        }
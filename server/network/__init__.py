@@ -4,13 +4,18 @@ Network layer for the Monopoly game server.
 Provides WebSocket server, connection management, and message handling.
 """
 
-from server.network.connection_manager import ConnectionManager, PlayerConnection
+from server.network.connection_manager import (
+    BatchedSender,
+    ConnectionManager,
+    PlayerConnection,
+)
 from server.network.game_manager import GameManager, ManagedGame
 from server.network.message_handler import MessageHandler, HandleResult
 from server.network.server import MonopolyServer, run_server
 
 
 __all__ = [
+    "BatchedSender",
     "ConnectionManager",
     "PlayerConnection",
     "GameManager",
@@ -13,11 +13,14 @@ from typing import Any
 
 from websockets.server import WebSocketServerProtocol
 
-from shared.protocol import Message
+from shared.protocol import Message, BatchMessage, encode_json
 
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on messages packed into a single BATCH frame
+MAX_BATCH_FRAMES = 128
+
 
 @dataclass
 class PlayerConnection:
@@ -28,6 +31,7 @@ class PlayerConnection:
     game_id: str | None = None
     is_host: bool = False
     is_spectator: bool = False
+    supports_batch: bool = False
     connected_at: datetime = field(default_factory=datetime.utcnow)
     last_activity: datetime = field(default_factory=datetime.utcnow)
     
@@ -36,6 +40,48 @@ class PlayerConnection:
         self.last_activity = datetime.utcnow()
 
 
+class BatchedSender:
+    """
+    Coalesces outgoing frames for a single websocket.
+    
+    Frames are queued with feed() and written on flush(). Clients that
+    negotiated batching receive them as one BATCH frame (up to
+    MAX_BATCH_FRAMES messages each); other clients get the frames
+    one after another, in the order they were fed.
+    """
+    
+    def __init__(
+        self,
+        websocket: WebSocketServerProtocol,
+        batching: bool = False,
+        max_frames: int = MAX_BATCH_FRAMES
+    ):
+        self.websocket = websocket
+        self.batching = batching
+        self._max_frames = max_frames
+        self._buf: list[str] = []
+    
+    def feed(self, payload: str) -> None:
+        """Queue a serialized message for the next flush."""
+        self._buf.append(payload)
+    
+    async def flush(self) -> None:
+        """Write all queued frames to the websocket."""
+        buf, self._buf = self._buf, []
+        
+        if not self.batching:
+            for payload in buf:
+                await self.websocket.send(payload)
+            return
+        
+        for start in range(0, len(buf), self._max_frames):
+            chunk = buf[start:start + self._max_frames]
+            if len(chunk) == 1:
+                await self.websocket.send(chunk[0])
+            else:
+                await self.websocket.send(BatchMessage.json_from_frames(chunk))
+
+
 class ConnectionManager:
     """
     Manages WebSocket connections and player-to-game mappings.
@@ -72,12 +118,14 @@ class ConnectionManager:
         self,
         websocket: WebSocketServerProtocol,
         player_id: str,
-        player_name: str
+        player_name: str,
+        supports_batch: bool = False
     ) -> PlayerConnection:
         """
         Register a new player connection.
         
         If the player was previously disconnected, restores their game association.
+        supports_batch records whether the client accepts BATCH frames.
         
         Returns:
             The PlayerConnection object
@@ -87,6 +135,7 @@ class ConnectionManager:
             if player_id in self._disconnected_players:
                 connection = self._disconnected_players.pop(player_id)
                 connection.websocket = websocket
+                connection.supports_batch = supports_batch
                 connection.connected_at = datetime.utcnow()
                 connection.update_activity()
                 logger.info(f"Player {player_name} ({player_id}) reconnected")
@@ -95,6 +144,7 @@ class ConnectionManager:
                     player_id=player_id,
                     player_name=player_name,
                     websocket=websocket,
+                    supports_batch=supports_batch,
                 )
                 logger.info(f"Player {player_name} ({player_id}) connected")
             
@@ -355,19 +405,18 @@ class ConnectionManager:
         Returns:
             Number of players the message was sent to
         """
-        connections = self.get_connected_players_in_game(game_id)
-        sent_count = 0
-        
-        for conn in connections:
-            if exclude_player_id and conn.player_id == exclude_player_id:
-                continue
-            if exclude_spectators and conn.is_spectator:
-                continue
-            
-            if await self._send_to_websocket(conn.websocket, message):
-                sent_count += 1
+        data = self._serialize(message)
+        sends = [
+            self._send_to_websocket(conn.websocket, data)
+            for conn in self.get_connected_players_in_game(game_id)
+            if not (exclude_player_id and conn.player_id == exclude_player_id)
+            and not (exclude_spectators and conn.is_spectator)
+        ]
         
-        return sent_count
+        # Each recipient gets a single frame, so sending concurrently
+        # can't reorder messages for any one player
+        results = await asyncio.gather(*sends)
+        return sum(results)
     
     async def broadcast_to_all(self, message: Message | dict | str) -> int:
         """
@@ -376,11 +425,12 @@ class ConnectionManager:
         Returns:
             Number of players the message was sent to
         """
-        sent_count = 0
-        for websocket in list(self._connections.keys()):
-            if await self._send_to_websocket(websocket, message):
-                sent_count += 1
-        return sent_count
+        data = self._serialize(message)
+        results = await asyncio.gather(*(
+            self._send_to_websocket(websocket, data)
+            for websocket in list(self._connections.keys())
+        ))
+        return sum(results)
     
     async def _send_to_websocket(
         self,
@@ -389,15 +439,7 @@ class ConnectionManager:
     ) -> bool:
         """Internal helper to send a message to a websocket."""
         try:
-            if isinstance(message, Message):
-                data = message.to_json()
-            elif isinstance(message, dict):
-                import json
-                data = json.dumps(message)
-            else:
-                data = message
-            
-            await websocket.send(data)
+            await websocket.send(self._serialize(message))
             
             # Update activity timestamp
             connection = self._connections.get(websocket)
@@ -410,6 +452,15 @@ class ConnectionManager:
             logger.error(f"Failed to send message: {e}")
             return False
     
+    @staticmethod
+    def _serialize(message: Message | dict | str) -> str:
+        """Convert a message to the JSON string sent over the wire."""
+        if isinstance(message, Message):
+            return message.to_json()
+        if isinstance(message, dict):
+            return encode_json(message)
+        return message
+    
     # =========================================================================
     # Host Management
     # =========================================================================
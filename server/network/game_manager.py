@@ -5,7 +5,7 @@ Manages game lifecycle: creation, joining, starting, saving, and loading.
 Integrates with the persistence layer for auto-save and game recovery.
 """
 
-import json
+import asyncio
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -21,7 +21,7 @@ from server.persistence import (
     GameSummary,
     get_database,
 )
-from shared.protocol import GameSettings
+from shared.protocol import GameSettings, decode_json, encode_json
 from shared.enums import GamePhase, PlayerState
 
 
@@ -38,6 +38,19 @@ class ManagedGame:
     last_saved_at: datetime | None = None
     last_saved_turn: int = 0
     
+    # Serialized public state, keyed by (turn_number, state_version)
+    _public_state_key: tuple[int, int] | None = field(default=None, repr=False)
+    _public_state_json: str = field(default="", repr=False)
+    
+    # Per-player state dicts for the same (turn_number, state_version)
+    _player_states_key: tuple[int, int] | None = field(default=None, repr=False)
+    _player_states: dict[str, dict] = field(default_factory=dict, repr=False)
+    
+    # Lobby summaries by shape, with their JSON, keyed by
+    # (turn_number, state_version, host_player_id)
+    _summaries_key: tuple[int, int, str] | None = field(default=None, repr=False)
+    _summaries: dict[str, tuple[dict, str]] = field(default_factory=dict, repr=False)
+    
     @property
     def game_id(self) -> str:
         return self.game.id
@@ -58,6 +71,95 @@ class ManagedGame:
     def needs_save(self) -> bool:
         """Check if game has unsaved changes."""
         return self.game.turn_number > self.last_saved_turn
+    
+    def player_name(self, player_id: str) -> str:
+        """Get a player's display name, or "Unknown" if they aren't in the game."""
+        player = self.game.players.get(player_id)
+        return player.name if player else "Unknown"
+    
+    def get_state_for_player(self, player_id: str) -> dict:
+        """
+        Get the game state as seen by one player.
+        
+        Built once per player and reused until the game state changes,
+        so repeated state queries between actions are a dict lookup.
+        The returned dict is shared and must not be modified.
+        """
+        key = (self.game.turn_number, self.game.state_version)
+        if key != self._player_states_key:
+            self._player_states.clear()
+            self._player_states_key = key
+        
+        state = self._player_states.get(player_id)
+        if state is None:
+            state = self._player_states[player_id] = self.game.get_state_for_player(player_id)
+        return state
+    
+    def get_public_state_json(self) -> str:
+        """
+        Get the shared part of the game state as JSON.
+        
+        Encoded once and reused until the game state changes, so repeat
+        broadcasts within a turn skip re-serializing the board.
+        """
+        key = (self.game.turn_number, self.game.state_version)
+        if key != self._public_state_key:
+            self._public_state_json = encode_json(self.game.get_public_state())
+            self._public_state_key = key
+        return self._public_state_json
+    
+    def get_summary(self, joinable: bool = False) -> tuple[dict[str, Any], str]:
+        """
+        Get the game's lobby summary and its JSON.
+        
+        Args:
+            joinable: If True, get the shorter summary used for the
+                joinable games listing
+        
+        Both are built once and reused until the game state or host
+        changes. The returned dict is shared and must not be modified.
+        """
+        key = (self.game.turn_number, self.game.state_version, self.host_player_id)
+        if key != self._summaries_key:
+            self._summaries.clear()
+            self._summaries_key = key
+        
+        shape = "joinable" if joinable else "full"
+        cached = self._summaries.get(shape)
+        if cached is None:
+            summary = self._build_summary(joinable)
+            cached = self._summaries[shape] = (summary, encode_json(summary))
+        return cached
+    
+    def cached_summary_json(self, summary: dict[str, Any]) -> str | None:
+        """Get the JSON for a summary from get_summary, if it's still cached."""
+        for cached, encoded in self._summaries.values():
+            if cached is summary:
+                return encoded
+        return None
+    
+    def _build_summary(self, joinable: bool) -> dict[str, Any]:
+        if joinable:
+            return {
+                "id": self.game_id,
+                "name": self.game.name,
+                "player_count": self.player_count,
+                "max_players": self.settings.max_players,
+                "host_id": self.host_player_id,
+                "allow_spectators": self.settings.allow_spectators,
+            }
+        return {
+            "id": self.game_id,
+            "name": self.game.name,
+            "status": self.game.phase.value,
+            "player_count": self.player_count,
+            "max_players": self.settings.max_players,
+            "host_id": self.host_player_id,
+            "is_started": self.is_started,
+            "is_finished": self.is_finished,
+            "allow_spectators": self.settings.allow_spectators,
+            "in_memory": True,
+        }
 
 
 class GameManager:
@@ -325,91 +427,9 @@ class GameManager:
             return False, "Game not found"
         
         try:
-            game = managed.game
-            
-            # Create game record
-            game_record = GameRecord(
-                id=game.id,
-                name=game.name,
-                status=game.phase.value,
-                current_player_index=game.current_player_index,
-                winner_id=game.winner_id,
-                settings_json=json.dumps(managed.settings.to_dict()),
-            )
-            
-            # Create player records
-            player_records = []
-            for idx, player_id in enumerate(game.player_order):
-                player = game.players.get(player_id)
-                if player:
-                    player_records.append(PlayerRecord(
-                        id=player.id,
-                        game_id=game.id,
-                        name=player.name,
-                        token="default",  # TODO: Add token selection
-                        turn_order=idx,
-                        position=player.position,
-                        money=player.money,
-                        is_bankrupt=player.state == PlayerState.BANKRUPT,
-                        is_in_jail=player.state == PlayerState.IN_JAIL,
-                        jail_turns=player.jail_turns,
-                        get_out_of_jail_cards=player.jail_cards,
-                        connected=True,  # Will be updated by ConnectionManager
-                    ))
-            
-            # Create property records
-            property_records = []
-            for pos, prop in game.board.properties.items():
-                if prop.owner_id:  # Only save owned properties
-                    property_records.append(PropertyRecord(
-                        game_id=game.id,
-                        position=pos,
-                        owner_id=prop.owner_id,
-                        houses=5 if prop.has_hotel else prop.houses,
-                        is_mortgaged=prop.is_mortgaged,
-                    ))
-            
-            # Create card deck records
-            # The CardManager uses draw/discard piles, so we save the counts
-            # The full state is captured in the snapshot anyway
-            card_decks = [
-                CardDeckRecord(
-                    game_id=game.id,
-                    deck_type="chance",
-                    card_order_json=json.dumps({
-                        "cards_remaining": len(game.cards.chance.cards),
-                        "discard_count": len(game.cards.chance.discard),
-                    }),
-                    current_index=len(game.cards.chance.discard),
-                ),
-                CardDeckRecord(
-                    game_id=game.id,
-                    deck_type="community_chest",
-                    card_order_json=json.dumps({
-                        "cards_remaining": len(game.cards.community_chest.cards),
-                        "discard_count": len(game.cards.community_chest.discard),
-                    }),
-                    current_index=len(game.cards.community_chest.discard),
-                ),
-            ]
-            
-            # Full game state snapshot
-            state_snapshot = game.to_dict()
-            
-            # Save everything
-            self._repository.save_full_game(
-                game=game_record,
-                players=player_records,
-                properties=property_records,
-                card_decks=card_decks,
-                state_snapshot=state_snapshot,
-                turn_number=game.turn_number,
-            )
-            
-            managed.last_saved_at = datetime.utcnow()
-            managed.last_saved_turn = game.turn_number
-            
-            logger.info(f"Game {game_id} saved at turn {game.turn_number}")
+            records = self._build_save_records(managed)
+            self._repository.save_full_game(**records)
+            self._mark_saved(managed, records["turn_number"])
             
             return True, "Game saved"
             
@@ -417,6 +437,145 @@ class GameManager:
             logger.error(f"Failed to save game {game_id}: {e}")
             return False, f"Failed to save game: {e}"
     
+    async def save_games_in_background(self, game_ids: list[str]) -> list[str]:
+        """
+        Save several games in one transaction, written from a worker thread.
+        
+        If the batch fails, each game is retried in a transaction of its
+        own, so one bad game doesn't hold back the rest. Games that still
+        fail keep their unsaved changes for the next save to pick up.
+        
+        Returns:
+            IDs of the games that were saved
+        """
+        saves = []
+        for managed in map(self._games.get, game_ids):
+            if not managed:
+                continue
+            try:
+                saves.append((managed, self._build_save_records(managed)))
+            except Exception as e:
+                logger.error(f"Failed to build save for game {managed.game_id}: {e}")
+        if not saves:
+            return []
+        
+        try:
+            await asyncio.to_thread(
+                self._repository.save_full_games, [records for _, records in saves]
+            )
+        except Exception as e:
+            logger.error(f"Failed to save games {game_ids} together, saving one by one: {e}")
+            return await self._save_each_in_background(saves)
+        
+        for managed, records in saves:
+            self._mark_saved(managed, records["turn_number"])
+        return [managed.game_id for managed, _ in saves]
+    
+    async def _save_each_in_background(
+        self,
+        saves: list[tuple[ManagedGame, dict[str, Any]]]
+    ) -> list[str]:
+        """Save games one transaction each; returns the IDs that were saved."""
+        saved = []
+        for managed, records in saves:
+            try:
+                await asyncio.to_thread(self._repository.save_full_game, **records)
+            except Exception as e:
+                logger.error(f"Failed to save game {managed.game_id}: {e}")
+                continue
+            self._mark_saved(managed, records["turn_number"])
+            saved.append(managed.game_id)
+        return saved
+    
+    def _build_save_records(self, managed: ManagedGame) -> dict[str, Any]:
+        """Build the keyword arguments for GameRepository.save_full_game."""
+        game = managed.game
+        
+        # Create game record
+        game_record = GameRecord(
+            id=game.id,
+            name=game.name,
+            status=game.phase.value,
+            current_player_index=game.current_player_index,
+            winner_id=game.winner_id,
+            settings_json=encode_json(managed.settings.to_dict()),
+        )
+        
+        # Create player records
+        player_records = []
+        for idx, player_id in enumerate(game.player_order):
+            player = game.players.get(player_id)
+            if player:
+                player_records.append(PlayerRecord(
+                    id=player.id,
+                    game_id=game.id,
+                    name=player.name,
+                    token="default",  # TODO: Add token selection
+                    turn_order=idx,
+                    position=player.position,
+                    money=player.money,
+                    is_bankrupt=player.state == PlayerState.BANKRUPT,
+                    is_in_jail=player.state == PlayerState.IN_JAIL,
+                    jail_turns=player.jail_turns,
+                    get_out_of_jail_cards=player.jail_cards,
+                    connected=True,  # Will be updated by ConnectionManager
+                ))
+        
+        # Create property records
+        property_records = []
+        for pos, prop in game.board.properties.items():
+            if prop.owner_id:  # Only save owned properties
+                property_records.append(PropertyRecord(
+                    game_id=game.id,
+                    position=pos,
+                    owner_id=prop.owner_id,
+                    houses=5 if prop.has_hotel else prop.houses,
+                    is_mortgaged=prop.is_mortgaged,
+                ))
+        
+        # Create card deck records
+        # The CardManager uses draw/discard piles, so we save the counts
+        # The full state is captured in the snapshot anyway
+        card_decks = [
+            CardDeckRecord(
+                game_id=game.id,
+                deck_type="chance",
+                card_order_json=encode_json({
+                    "cards_remaining": len(game.cards.chance.cards),
+                    "discard_count": len(game.cards.chance.discard),
+                }),
+                current_index=len(game.cards.chance.discard),
+            ),
+            CardDeckRecord(
+                game_id=game.id,
+                deck_type="community_chest",
+                card_order_json=encode_json({
+                    "cards_remaining": len(game.cards.community_chest.cards),
+                    "discard_count": len(game.cards.community_chest.discard),
+                }),
+                current_index=len(game.cards.community_chest.discard),
+            ),
+        ]
+        
+        # Full game state snapshot
+        state_snapshot = game.to_dict()
+        
+        return {
+            "game": game_record,
+            "players": player_records,
+            "properties": property_records,
+            "card_decks": card_decks,
+            "state_snapshot": state_snapshot,
+            "turn_number": game.turn_number,
+        }
+    
+    def _mark_saved(self, managed: ManagedGame, turn_number: int) -> None:
+        """Record that a game was persisted at the given turn."""
+        managed.last_saved_at = datetime.utcnow()
+        managed.last_saved_turn = turn_number
+        
+        logger.info(f"Game {managed.game_id} saved at turn {turn_number}")
+    
     def auto_save_if_needed(self, game_id: str) -> bool:
         """
         Auto-save game if there are unsaved changes.
@@ -429,6 +588,13 @@ class GameManager:
             return success
         return False
     
+    async def auto_save_games_in_background(self, game_ids: list[str]) -> list[str]:
+        """Auto-save whichever of the games need it, in one background write."""
+        return await self.save_games_in_background([
+            game_id for game_id in game_ids
+            if (managed := self._games.get(game_id)) and managed.needs_save
+        ])
+    
     def load_game(self, game_id: str) -> tuple[bool, str, ManagedGame | None]:
         """
         Load a game from the database.
@@ -450,7 +616,7 @@ class GameManager:
                 return False, "Game not found or no saved state", None
             
             # Load game from snapshot
-            state = json.loads(snapshot.state_json)
+            state = decode_json(snapshot.state_json)
             game = Game.from_dict(state)
             
             # Get game record for settings and host info
@@ -458,7 +624,7 @@ class GameManager:
             if not game_record:
                 return False, "Game record not found", None
             
-            settings = GameSettings.from_dict(json.loads(game_record.settings_json))
+            settings = GameSettings.from_dict(decode_json(game_record.settings_json))
             
             # Determine host (first player in order, or from saved data)
             host_id = game.player_order[0] if game.player_order else None
@@ -541,21 +707,10 @@ class GameManager:
         
         # In-memory games
         for managed in self._games.values():
-            if status and managed.game.phase.value != status:
+            if status and managed.game.phase != status:
                 continue
             
-            games.append({
-                "id": managed.game_id,
-                "name": managed.game.name,
-                "status": managed.game.phase.value,
-                "player_count": managed.player_count,
-                "max_players": managed.settings.max_players,
-                "host_id": managed.host_player_id,
-                "is_started": managed.is_started,
-                "is_finished": managed.is_finished,
-                "allow_spectators": managed.settings.allow_spectators,
-                "in_memory": True,
-            })
+            games.append(managed.get_summary()[0])
         
         # Database games (not already loaded)
         if include_db:
@@ -589,17 +744,25 @@ class GameManager:
             if managed.player_count >= managed.settings.max_players:
                 continue
             
-            games.append({
-                "id": managed.game_id,
-                "name": managed.game.name,
-                "player_count": managed.player_count,
-                "max_players": managed.settings.max_players,
-                "host_id": managed.host_player_id,
-                "allow_spectators": managed.settings.allow_spectators,
-            })
+            games.append(managed.get_summary(joinable=True)[0])
         
         return games
     
+    def encode_game_list(self, games: list[dict[str, Any]]) -> str:
+        """
+        Encode a game listing as a JSON array.
+        
+        Summaries that came from ManagedGame.get_summary reuse the JSON
+        cached alongside them; anything else (saved games that aren't
+        loaded) is encoded here.
+        """
+        fragments = []
+        for game in games:
+            managed = self._games.get(game["id"])
+            encoded = managed.cached_summary_json(game) if managed else None
+            fragments.append(encoded or encode_json(game))
+        return f"[{','.join(fragments)}]"
+    
     # =========================================================================
     # Bank Assignment (Host Privilege)
     # =========================================================================
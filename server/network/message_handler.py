@@ -5,9 +5,10 @@ Parses incoming messages, validates them, executes the appropriate
 game actions, and formats responses and broadcasts.
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 from server.game_engine import Game
 from server.network.game_manager import GameManager, ManagedGame
@@ -34,11 +35,14 @@ from shared.protocol import (
     GameSettings,
     parse_message,
 )
-from shared.enums import MessageType, GamePhase
+from shared.enums import MessageType, GamePhase, PlayerState
 
 
 logger = logging.getLogger(__name__)
 
+# Frames longer than this (in characters) are parsed on a worker thread
+LARGE_MESSAGE_THRESHOLD = 4096
+
 
 @dataclass
 class HandleResult:
@@ -49,10 +53,17 @@ class HandleResult:
     broadcasts: list[Message] | None = None
     # Whether to broadcast the full game state after this action
     broadcast_state: bool = False
+    # Messages for the other players that travel with the state broadcast,
+    # in a single BATCH frame where supported (implies broadcast_state)
+    envelope: list[Message] | None = None
     # Whether to trigger auto-save after this action
     should_save: bool = False
 
 
+# Signature of the _handle_* methods: (player_id, message) -> result
+_Handler = Callable[[str, Message], Awaitable[HandleResult]]
+
+
 class MessageHandler:
     """
     Routes incoming messages to appropriate game actions.
@@ -60,32 +71,40 @@ class MessageHandler:
     Each handler method returns a HandleResult containing:
     - A response to send to the requesting player
     - Broadcasts to send to all players in the game
+    - An envelope of messages delivered together with the state broadcast
     - Flags for state broadcast and auto-save
     """
     
     def __init__(self, game_manager: GameManager, connection_manager: ConnectionManager):
         self._games = game_manager
         self._connections = connection_manager
+        
+        # Built once; bound methods are looked up per message
+        self._handlers = self._build_handlers()
     
     async def handle_message(
         self,
         player_id: str,
-        message: Message | str | dict
+        message: Message | str | bytes | dict
     ) -> HandleResult:
         """
         Handle an incoming message from a player.
         
         Args:
             player_id: ID of the player sending the message
-            message: The message (Message object, JSON string, or dict)
+            message: The message (Message object, JSON text or bytes, or dict)
             
         Returns:
             HandleResult with response and broadcasts
         """
         # Parse message if needed
-        if isinstance(message, str):
+        if isinstance(message, (str, bytes)):
             try:
-                message = parse_message(message)
+                if len(message) > LARGE_MESSAGE_THRESHOLD:
+                    # Keep big payloads from stalling every other client
+                    message = await asyncio.to_thread(parse_message, message)
+                else:
+                    message = parse_message(message)
             except Exception as e:
                 logger.error(f"Failed to parse message: {e}")
                 return HandleResult(
@@ -100,8 +119,21 @@ class MessageHandler:
                     response=ErrorMessage.create(f"Invalid message format: {e}", "PARSE_ERROR")
                 )
         
+        return await self.handle_parsed(player_id, message)
+    
+    async def handle_parsed(self, player_id: str, message: Message) -> HandleResult:
+        """
+        Handle a message that has already been parsed.
+        
+        Args:
+            player_id: ID of the player sending the message
+            message: The parsed message
+            
+        Returns:
+            HandleResult with response and broadcasts
+        """
         # Route to appropriate handler
-        handler = self._get_handler(message.type)
+        handler = self._handlers.get(message.type)
         if not handler:
             return HandleResult(
                 response=ErrorMessage.create(
@@ -130,9 +162,9 @@ class MessageHandler:
                 )
             )
     
-    def _get_handler(self, message_type: MessageType):
-        """Get the handler method for a message type."""
-        handlers = {
+    def _build_handlers(self) -> dict[MessageType, _Handler]:
+        """Map each message type to its handler method."""
+        return {
             # Lobby
             MessageType.LIST_GAMES: self._handle_list_games,
             MessageType.CREATE_GAME: self._handle_create_game,
@@ -161,7 +193,6 @@ class MessageHandler:
             # State query
             MessageType.GAME_STATE: self._handle_get_state,
         }
-        return handlers.get(message_type)
     
     # =========================================================================
     # Helper Methods
@@ -178,11 +209,6 @@ class MessageHandler:
         """Create a game state message for a player."""
         return GameStateMessage.create(game.get_state_for_player(player_id))
     
-    def _get_player_name(self, game: Game, player_id: str) -> str:
-        """Get a player's name from the game."""
-        player = game.players.get(player_id)
-        return player.name if player else "Unknown"
-    
     # =========================================================================
     # Lobby Handlers
     # =========================================================================
@@ -193,7 +219,9 @@ class MessageHandler:
         games = self._games.list_joinable_games() if not status else self._games.list_games(status)
         
         return HandleResult(
-            response=GameListResponse.create(games)
+            response=GameListResponse.create(
+                games, games_json=self._games.encode_game_list(games)
+            )
         )
     
     async def _handle_create_game(self, player_id: str, message: Message) -> HandleResult:
@@ -278,7 +306,7 @@ class MessageHandler:
                 response=ErrorMessage.create(error, "NOT_IN_GAME")
             )
         
-        player_name = self._get_player_name(managed.game, player_id)
+        player_name = managed.player_name(player_id)  # Spectators aren't players
         game_id = managed.game_id
         
         success, msg, _ = self._games.leave_game(player_id)
@@ -348,7 +376,11 @@ class MessageHandler:
                 response=ErrorMessage.create("player_id is required", "MISSING_PLAYER_ID")
             )
         
-        target_name = self._get_player_name(managed.game, target_id)
+        # Resolve names before the target is removed from the game
+        target = managed.game.players.get(target_id)
+        target_name = target.name if target else "Unknown"
+        host = managed.game.players.get(player_id)
+        host_name = host.name if host else "Unknown"
         
         success, msg = self._games.remove_player(managed.game_id, target_id, player_id)
         
@@ -357,20 +389,21 @@ class MessageHandler:
                 response=ErrorMessage.create(msg, "KICK_PLAYER_FAILED")
             )
         
-        # Update connection manager
-        await self._connections.leave_game(target_id)
-        
-        # Notify kicked player if connected
-        await self._connections.send_to_player(
-            target_id,
-            ErrorMessage.create("You have been kicked from the game", "KICKED")
+        # Update connection manager and notify kicked player (if connected).
+        # Both only touch the target's own connection state, so run them together.
+        await asyncio.gather(
+            self._connections.leave_game(target_id),
+            self._connections.send_to_player(
+                target_id,
+                ErrorMessage.create("You have been kicked from the game", "KICKED")
+            ),
         )
         
         broadcasts = [
             PlayerKickedMessage.create(
                 player_id=target_id,
                 player_name=target_name,
-                kicked_by=self._get_player_name(managed.game, player_id)
+                kicked_by=host_name
             )
         ]
         
@@ -405,7 +438,7 @@ class MessageHandler:
             )
         
         old_host_id = managed.host_player_id
-        new_host_name = self._get_player_name(managed.game, new_host_id)
+        new_host_name = managed.game.players[new_host_id].name
         
         # Update game manager
         managed.host_player_id = new_host_id
@@ -447,12 +480,12 @@ class MessageHandler:
                 response=ErrorMessage.create(msg, "ROLL_DICE_FAILED")
             )
         
-        player_name = self._get_player_name(game, player_id)
+        player = game.players[player_id]
         
         broadcasts = [
             DiceRolledMessage.create(
                 player_id=player_id,
-                player_name=player_name,
+                player_name=player.name,
                 die1=dice_result.die1,
                 die2=dice_result.die2,
                 total=dice_result.total,
@@ -462,13 +495,12 @@ class MessageHandler:
         ]
         
         # Check for jail status change
-        player = game.players.get(player_id)
-        if player and msg and "jail" in msg.lower():
+        if msg and "jail" in msg.lower():
             broadcasts.append(
                 JailStatusMessage.create(
                     player_id=player_id,
-                    player_name=player_name,
-                    in_jail=player.state.value == "IN_JAIL",
+                    player_name=player.name,
+                    in_jail=player.state is PlayerState.IN_JAIL,
                     reason="rolled_doubles" if dice_result.is_double else "sent_to_jail"
                 )
             )
@@ -499,12 +531,10 @@ class MessageHandler:
                 response=ErrorMessage.create(msg, "BUY_PROPERTY_FAILED")
             )
         
-        player_name = self._get_player_name(game, player_id)
-        
         broadcasts = [
             PropertyBoughtMessage.create(
                 player_id=player_id,
-                player_name=player_name,
+                player_name=player.name,
                 property_name=prop.name if prop else "Unknown",
                 position=position,
                 price=prop.cost if prop else 0
@@ -564,7 +594,7 @@ class MessageHandler:
                 response=ErrorMessage.create(msg, "BUILD_HOUSE_FAILED")
             )
         
-        player_name = self._get_player_name(game, player_id)
+        player_name = game.players[player_id].name
         
         broadcasts = [
             BuildingChangedMessage.create(
@@ -608,7 +638,7 @@ class MessageHandler:
                 response=ErrorMessage.create(msg, "BUILD_HOTEL_FAILED")
             )
         
-        player_name = self._get_player_name(game, player_id)
+        player_name = game.players[player_id].name
         
         broadcasts = [
             BuildingChangedMessage.create(
@@ -653,7 +683,7 @@ class MessageHandler:
                 response=ErrorMessage.create(msg, "SELL_BUILDING_FAILED")
             )
         
-        player_name = self._get_player_name(game, player_id)
+        player_name = game.players[player_id].name
         
         broadcasts = [
             BuildingChangedMessage.create(
@@ -697,7 +727,7 @@ class MessageHandler:
                 response=ErrorMessage.create(msg, "MORTGAGE_PROPERTY_FAILED")
             )
         
-        player_name = self._get_player_name(game, player_id)
+        player_name = game.players[player_id].name
         
         broadcasts = [
             PropertyMortgagedMessage.create(
@@ -740,7 +770,7 @@ class MessageHandler:
                 response=ErrorMessage.create(msg, "UNMORTGAGE_PROPERTY_FAILED")
             )
         
-        player_name = self._get_player_name(game, player_id)
+        player_name = game.players[player_id].name
         
         broadcasts = [
             PropertyMortgagedMessage.create(
@@ -775,7 +805,7 @@ class MessageHandler:
                 response=ErrorMessage.create(msg, "PAY_BAIL_FAILED")
             )
         
-        player_name = self._get_player_name(game, player_id)
+        player_name = game.players[player_id].name
         
         broadcasts = [
             JailStatusMessage.create(
@@ -808,7 +838,7 @@ class MessageHandler:
                 response=ErrorMessage.create(msg, "USE_JAIL_CARD_FAILED")
             )
         
-        player_name = self._get_player_name(game, player_id)
+        player_name = game.players[player_id].name
         
         broadcasts = [
             JailStatusMessage.create(
@@ -845,20 +875,19 @@ class MessageHandler:
                 response=ErrorMessage.create(msg, "END_TURN_FAILED")
             )
         
-        broadcasts = []
+        envelope = []
         
         # Check if game is over
         if game.phase == GamePhase.GAME_OVER:
-            winner = game.players.get(game.winner_id) if game.winner_id else None
-            broadcasts.append(
+            envelope.append(
                 GameWonMessage.create(
                     winner_id=game.winner_id or "",
-                    winner_name=winner.name if winner else "Unknown"
+                    winner_name=managed.player_name(game.winner_id or "")
                 )
             )
         else:
             current_player = game.current_player
-            broadcasts.append(
+            envelope.append(
                 TurnEndedMessage.create(
                     previous_player_id=previous_id or "",
                     previous_player_name=previous_name,
@@ -870,8 +899,7 @@ class MessageHandler:
         
         return HandleResult(
             response=self._create_state_message(game, player_id),
-            broadcasts=broadcasts,
-            broadcast_state=True,
+            envelope=envelope,
             should_save=True  # Auto-save after each turn
         )
     
@@ -884,9 +912,9 @@ class MessageHandler:
             )
         
         game = managed.game
-        player_name = self._get_player_name(game, player_id)
+        player_name = managed.player_name(player_id)
         creditor_id = message.data.get("creditor_id")
-        creditor_name = self._get_player_name(game, creditor_id) if creditor_id else None
+        creditor_name = managed.player_name(creditor_id) if creditor_id else None
         
         success, msg = game.declare_bankruptcy(player_id, creditor_id)
         
@@ -895,7 +923,7 @@ class MessageHandler:
                 response=ErrorMessage.create(msg, "BANKRUPTCY_FAILED")
             )
         
-        broadcasts = [
+        envelope = [
             PlayerBankruptMessage.create(
                 player_id=player_id,
                 player_name=player_name,
@@ -906,18 +934,16 @@ class MessageHandler:
         
         # Check if game is over
         if game.phase == GamePhase.GAME_OVER:
-            winner = game.players.get(game.winner_id) if game.winner_id else None
-            broadcasts.append(
+            envelope.append(
                 GameWonMessage.create(
                     winner_id=game.winner_id or "",
-                    winner_name=winner.name if winner else "Unknown"
+                    winner_name=managed.player_name(game.winner_id or "")
                 )
             )
         
         return HandleResult(
             response=self._create_state_message(game, player_id),
-            broadcasts=broadcasts,
-            broadcast_state=True,
+            envelope=envelope,
             should_save=True
         )
     
@@ -934,5 +960,5 @@ class MessageHandler:
             )
         
         return HandleResult(
-            response=self._create_state_message(managed.game, player_id)
+            response=GameStateMessage.create(managed.get_state_for_player(player_id))
         )
@@ -12,9 +12,15 @@ import signal
 from typing import Any
 
 import websockets
+from websockets.extensions.permessage_deflate import ServerPerMessageDeflateFactory
 from websockets.server import WebSocketServerProtocol, serve
 
-from server.network.connection_manager import ConnectionManager
+try:
+    import uvloop
+except ImportError:  # Not available on Windows
+    uvloop = None
+
+from server.network.connection_manager import BatchedSender, ConnectionManager
 from server.network.game_manager import GameManager
 from server.network.message_handler import MessageHandler
 from server.persistence import init_database, GameRepository
@@ -25,12 +31,45 @@ from shared.protocol import (
     GameStateMessage,
     PlayerDisconnectedMessage,
     PlayerReconnectedMessage,
+    decode_json,
+    encode_json,
 )
 from shared.enums import MessageType
 
 
 logger = logging.getLogger(__name__)
 
+# CONNECT acknowledgment with slots for the JSON-encoded player_id,
+# player_name and reconnected_to_game values
+_CONNECT_ACK_TEMPLATE = (
+    '{"type":"%s","data":{"success":true,"player_id":%%s,"player_name":%%s,'
+    '"reconnected_to_game":%%s}}' % MessageType.CONNECT.value
+)
+
+
+def _compression_options() -> dict[str, Any]:
+    """
+    Get the serve() keyword arguments for settings.WS_COMPRESSION.
+    
+    "deflate" keeps permessage-deflate but with fast, low-memory settings:
+    most frames are small enough that zlib's default level costs more CPU
+    than it saves bandwidth. "none" disables compression entirely.
+    """
+    mode = settings.WS_COMPRESSION
+    if mode == "none":
+        return {"compression": None}
+    if mode == "deflate":
+        return {
+            "compression": None,
+            "extensions": [
+                ServerPerMessageDeflateFactory(
+                    server_max_window_bits=12,
+                    compress_settings={"level": 1, "memLevel": 5},
+                )
+            ],
+        }
+    raise ValueError(f"Unsupported WS_COMPRESSION: {mode}")
+
 
 class MonopolyServer:
     """
@@ -49,6 +88,10 @@ class MonopolyServer:
         self.host = host or settings.HOST
         self.port = port or settings.PORT
         
+        # Keepalive: turn-based games sit idle for long stretches, so ping rarely
+        self.ping_interval = settings.PING_INTERVAL or 120
+        self.ping_timeout = settings.PING_TIMEOUT or 30
+        
         # Initialize database
         db = init_database(db_path)
         self._repository = GameRepository(db)
@@ -62,6 +105,15 @@ class MonopolyServer:
         self._server = None
         self._running = False
         self._shutdown_event = asyncio.Event()
+        
+        # Debounced auto-saves: game_id -> timer. Games whose timer fired
+        # are written together by a single save writer task.
+        self._pending_saves: dict[str, asyncio.TimerHandle] = {}
+        self._due_saves: set[str] = set()
+        self._save_writer: asyncio.Task | None = None
+        
+        # Periodic WAL checkpoints (automatic ones are disabled)
+        self._checkpoint_task: asyncio.Task | None = None
     
     async def start(self) -> None:
         """Start the WebSocket server."""
@@ -72,10 +124,14 @@ class MonopolyServer:
             self._handle_client,
             self.host,
             self.port,
-            ping_interval=30,
-            ping_timeout=10,
+            ping_interval=self.ping_interval,
+            ping_timeout=self.ping_timeout,
+            max_size=settings.MAX_MESSAGE_SIZE,
+            **_compression_options(),
         )
         
+        self._checkpoint_task = asyncio.create_task(self._checkpoint_loop())
+        
         logger.info(f"Monopoly server started on ws://{self.host}:{self.port}")
         
         # Wait for shutdown signal
@@ -90,6 +146,13 @@ class MonopolyServer:
             self._server.close()
             await self._server.wait_closed()
         
+        await self._flush_pending_saves()
+        
+        if self._checkpoint_task:
+            self._checkpoint_task.cancel()
+            self._checkpoint_task = None
+        await self._checkpoint()
+        
         self._shutdown_event.set()
         logger.info("Server stopped")
     
@@ -138,7 +201,7 @@ class MonopolyServer:
         try:
             # Wait for connect message with timeout
             raw = await asyncio.wait_for(websocket.recv(), timeout=30.0)
-            data = json.loads(raw)
+            data = decode_json(raw)
             
             if data.get("type") != MessageType.CONNECT.value:
                 await self._send_error(
@@ -150,6 +213,7 @@ class MonopolyServer:
             
             player_id = data.get("data", {}).get("player_id")
             player_name = data.get("data", {}).get("player_name", "Player")
+            supports_batch = bool(data.get("data", {}).get("supports_batch", False))
             
             if not player_id:
                 await self._send_error(
@@ -160,38 +224,38 @@ class MonopolyServer:
                 return None
             
             # Register connection
-            connection = await self._connections.connect(websocket, player_id, player_name)
+            connection = await self._connections.connect(
+                websocket, player_id, player_name, supports_batch
+            )
             
             # Check if reconnecting to a game
             game_id = connection.game_id
             if game_id:
                 managed = self._games.get_game(game_id)
                 if managed:
-                    # Notify other players of reconnection
-                    await self._connections.broadcast_to_game(
-                        game_id,
-                        PlayerReconnectedMessage.create(player_id, player_name),
-                        exclude_player_id=player_id
-                    )
-                    
-                    # Send current game state to reconnected player
                     state_msg = GameStateMessage.create(
                         managed.game.get_state_for_player(player_id)
                     )
-                    await websocket.send(state_msg.to_json())
+                    
+                    # Notify other players of reconnection while sending
+                    # current game state to the reconnected player
+                    await asyncio.gather(
+                        self._connections.broadcast_to_game(
+                            game_id,
+                            PlayerReconnectedMessage.create(player_id, player_name),
+                            exclude_player_id=player_id
+                        ),
+                        websocket.send(state_msg.to_json()),
+                    )
                     
                     logger.info(f"Player {player_name} ({player_id}) reconnected to game {game_id}")
             
             # Send connect acknowledgment
-            await websocket.send(json.dumps({
-                "type": MessageType.CONNECT.value,
-                "data": {
-                    "success": True,
-                    "player_id": player_id,
-                    "player_name": player_name,
-                    "reconnected_to_game": game_id,
-                }
-            }))
+            await websocket.send(_CONNECT_ACK_TEMPLATE % (
+                encode_json(player_id),
+                encode_json(player_name),
+                encode_json(game_id),
+            ))
             
             logger.info(f"Player {player_name} ({player_id}) connected")
             
@@ -212,16 +276,27 @@ class MonopolyServer:
         self,
         websocket: WebSocketServerProtocol,
         player_id: str,
-        raw_message: str
+        raw_message: str | bytes
     ) -> None:
-        """Handle an incoming message from a connected player."""
+        """
+        Handle an incoming message from a connected player.
+        
+        Everything addressed to the requester during one call is coalesced
+        and written in a single flush at the end.
+        """
+        connection = self._connections.get_connection(websocket)
+        sender = BatchedSender(
+            websocket,
+            batching=bool(connection and connection.supports_batch)
+        )
+        
         try:
             # Process message through handler
             result = await self._handler.handle_message(player_id, raw_message)
             
-            # Send response to requester
+            # Queue response for requester
             if result.response:
-                await websocket.send(result.response.to_json())
+                sender.feed(result.response.to_json())
             
             # Get game for broadcasts
             game_id = self._connections.get_game_id(player_id)
@@ -236,19 +311,36 @@ class MonopolyServer:
                             exclude_player_id=player_id  # Requester already got response
                         )
                 
-                # Broadcast full state if requested
-                if result.broadcast_state:
+                # Broadcast full state if requested, skipping the requester
+                # when their response already carries it
+                if result.broadcast_state or result.envelope:
                     managed = self._games.get_game(game_id)
                     if managed:
-                        await self._broadcast_state_to_game(game_id, managed)
+                        has_state = (
+                            result.response is not None
+                            and result.response.type == MessageType.GAME_STATE
+                        )
+                        await self._broadcast_state_to_game(
+                            game_id,
+                            managed,
+                            sender,
+                            exclude_player_id=player_id if has_state else None,
+                            envelope=result.envelope
+                        )
                 
                 # Auto-save if needed
                 if result.should_save:
-                    self._games.auto_save_if_needed(game_id)
+                    self._schedule_save(game_id)
                     
         except Exception as e:
             logger.exception(f"Error handling message from {player_id}: {e}")
-            await self._send_error(websocket, f"Internal error: {e}", "INTERNAL_ERROR")
+            sender.feed(ErrorMessage.json_for(f"Internal error: {e}", "INTERNAL_ERROR"))
+        
+        finally:
+            try:
+                await sender.flush()
+            except Exception as e:
+                logger.debug(f"Failed to send replies to {player_id}: {e}")
     
     async def _handle_disconnect(
         self,
@@ -266,25 +358,136 @@ class MonopolyServer:
             )
             
             # Save game state
-            self._games.auto_save_if_needed(connection.game_id)
+            self._schedule_save(connection.game_id)
             
             logger.info(
                 f"Player {connection.player_name} ({player_id}) disconnected "
                 f"from game {connection.game_id}"
             )
     
-    async def _broadcast_state_to_game(self, game_id: str, managed) -> None:
-        """Broadcast game state to all players in a game."""
-        connections = self._connections.get_connected_players_in_game(game_id)
+    def _schedule_save(self, game_id: str) -> None:
+        """
+        Schedule a background auto-save for a game.
         
-        for conn in connections:
+        Requests for the same game within AUTO_SAVE_DEBOUNCE seconds are
+        coalesced into a single write.
+        """
+        handle = self._pending_saves.pop(game_id, None)
+        if handle:
+            handle.cancel()
+        
+        loop = asyncio.get_running_loop()
+        self._pending_saves[game_id] = loop.call_later(
+            settings.AUTO_SAVE_DEBOUNCE, self._start_save, game_id
+        )
+    
+    def _start_save(self, game_id: str) -> None:
+        """Timer callback: queue a game for the save writer."""
+        self._pending_saves.pop(game_id, None)
+        self._due_saves.add(game_id)
+        
+        if self._save_writer is None or self._save_writer.done():
+            self._save_writer = asyncio.create_task(self._save_writer_loop())
+    
+    async def _save_writer_loop(self) -> None:
+        """
+        Write queued auto-saves until none are left.
+        
+        Everything queued while a write is in flight goes out together in
+        the next one, so there is never more than one save transaction
+        running and bursts cost one commit.
+        """
+        while self._due_saves:
+            game_ids = list(self._due_saves)
+            self._due_saves.clear()
             try:
-                state_msg = GameStateMessage.create(
-                    managed.game.get_state_for_player(conn.player_id)
-                )
-                await conn.websocket.send(state_msg.to_json())
+                await self._games.auto_save_games_in_background(game_ids)
             except Exception as e:
-                logger.error(f"Failed to send state to {conn.player_id}: {e}")
+                # Unsaved games still need saving, so the next debounced
+                # save of each one picks it up again
+                logger.error(f"Auto-save failed for games {game_ids}: {e}")
+    
+    async def _flush_pending_saves(self) -> None:
+        """Run all debounced saves now and wait for saves in flight."""
+        for game_id, handle in list(self._pending_saves.items()):
+            handle.cancel()
+            self._start_save(game_id)
+        
+        if self._save_writer:
+            await asyncio.gather(self._save_writer, return_exceptions=True)
+    
+    async def _checkpoint_loop(self) -> None:
+        """Checkpoint the database every WAL_CHECKPOINT_INTERVAL seconds."""
+        while True:
+            await asyncio.sleep(settings.WAL_CHECKPOINT_INTERVAL)
+            await self._checkpoint()
+    
+    async def _checkpoint(self) -> None:
+        """Run a WAL checkpoint on a worker thread."""
+        try:
+            await asyncio.to_thread(self._repository.checkpoint)
+        except Exception as e:
+            logger.error(f"WAL checkpoint failed: {e}")
+    
+    async def _broadcast_state_to_game(
+        self,
+        game_id: str,
+        managed,
+        sender: BatchedSender | None = None,
+        exclude_player_id: str | None = None,
+        envelope: list[Message] | None = None
+    ) -> None:
+        """
+        Broadcast game state to all players in a game.
+        
+        Payloads are built up front and sent concurrently, so one slow
+        client doesn't hold up delivery to the rest of the game. The shared
+        part of the state is serialized once for all recipients, and each
+        distinct per-player overlay is spliced in only once. If a
+        sender is given, the state for its websocket is queued on it
+        instead of being sent directly; everyone else gets it through the
+        ConnectionManager, like any other message.
+        
+        Envelope messages go to every recipient except the sender's
+        websocket, ahead of the state and in the same flush, so batching
+        clients get the whole turn in one frame.
+        """
+        connections = [
+            conn for conn in self._connections.get_connected_players_in_game(game_id)
+            if conn.player_id != exclude_player_id
+        ]
+        
+        envelope_frames = [message.to_json() for message in envelope or ()]
+        public_json = managed.get_public_state_json()
+        frames: dict[tuple, str] = {}
+        recipients = []
+        sends = []
+        for conn in connections:
+            # Players with the same overlay share one encoded frame
+            overlay = managed.game.get_private_overlay(conn.player_id)
+            key = tuple(overlay.items())
+            payload = frames.get(key)
+            if payload is None:
+                payload = frames[key] = GameStateMessage.json_from_parts(public_json, overlay)
+            
+            if sender and conn.websocket is sender.websocket:
+                sender.feed(payload)
+            elif envelope_frames:
+                out = BatchedSender(conn.websocket, batching=conn.supports_batch)
+                for frame in envelope_frames:
+                    out.feed(frame)
+                out.feed(payload)
+                recipients.append(conn)
+                sends.append(out.flush())
+            else:
+                recipients.append(conn)
+                sends.append(self._connections.send_to_connection(conn.websocket, payload))
+        
+        results = await asyncio.gather(*sends, return_exceptions=True)
+        
+        for conn, result in zip(recipients, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to send state to {conn.player_id}: {result}")
     
     async def _send_error(
         self,
@@ -294,8 +497,7 @@ class MonopolyServer:
     ) -> None:
         """Send an error message to a websocket."""
         try:
-            error = ErrorMessage.create(message, code)
-            await websocket.send(error.to_json())
+            await websocket.send(ErrorMessage.json_for(message, code))
         except Exception:
             pass  # Connection might already be closed
     
@@ -342,7 +544,10 @@ def main():
     print("Press Ctrl+C to stop")
     
     try:
-        asyncio.run(run_server())
+        if uvloop is not None:
+            uvloop.run(run_server())
+        else:
+            asyncio.run(run_server())
     except KeyboardInterrupt:
         print("\nServer stopped")
 
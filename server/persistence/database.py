@@ -2,11 +2,12 @@
 Database connection management and initialization.
 """
 
+import queue
 import sqlite3
 import threading
 from pathlib import Path
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Generator, Iterable, Sequence
 
 from server.config import settings
 
@@ -15,15 +16,26 @@ class Database:
     """
     Thread-safe SQLite database manager.
     
-    Handles connection pooling and schema initialization.
+    Writes go through a single connection, serialized by a lock and run
+    in BEGIN IMMEDIATE transactions so they never fail with SQLITE_BUSY
+    half way through. Reads are served from a small pool of reader
+    connections, which WAL mode lets run alongside the writer.
     """
     
-    _local = threading.local()
     _initialized = False
     _init_lock = threading.Lock()
     
-    def __init__(self, db_path: str | None = None):
+    def __init__(self, db_path: str | None = None, reader_pool_size: int | None = None):
         self.db_path = db_path or settings.DATABASE_PATH
+        self._reader_pool_size = reader_pool_size or settings.DB_READER_POOL
+        
+        self._writer: sqlite3.Connection | None = None
+        self._writer_lock = threading.Lock()
+        
+        self._readers: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+        
         self._ensure_directory()
         self._ensure_schema()
     
@@ -38,34 +50,92 @@ class Database:
             if not Database._initialized:
                 with self.get_connection() as conn:
                     self._create_tables(conn)
+                    # Refresh planner statistics for existing data
+                    conn.execute("ANALYZE")
                 Database._initialized = True
     
     @contextmanager
-    def get_connection(self) -> Generator[sqlite3.Connection, None, None]:
+    def get_connection(self, readonly: bool = False) -> Generator[sqlite3.Connection, None, None]:
         """
-        Get a thread-local database connection.
+        Get a database connection.
+        
+        Pass readonly=True for queries that only SELECT; they get a pooled
+        reader connection and don't wait on writes in progress. Otherwise
+        the writer connection is returned inside a transaction that is
+        committed on exit.
         
         Usage:
-            with db.get_connection() as conn:
+            with db.get_connection(readonly=True) as conn:
                 cursor = conn.execute("SELECT ...")
         """
-        if not hasattr(Database._local, 'connection') or Database._local.connection is None:
-            Database._local.connection = self._create_connection()
+        if readonly:
+            conn = self._acquire_reader()
+            try:
+                yield conn
+            finally:
+                self._readers.put(conn)
+            return
+        
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = self._create_connection()
+            
+            conn = self._writer
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    
+    def execute_many(self, sql: str, rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Run one statement for every row of parameters in a single transaction.
+        
+        The statement is prepared once and rebound per row.
         
-        conn = Database._local.connection
+        Returns:
+            Total number of rows affected
+        """
+        with self.get_connection() as conn:
+            cursor = conn.executemany(sql, rows)
+            return cursor.rowcount
+    
+    def checkpoint(self) -> None:
+        """Copy the write-ahead log into the database file and truncate it."""
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = self._create_connection()
+            self._writer.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    
+    def _acquire_reader(self) -> sqlite3.Connection:
+        """Take a reader from the pool, opening one if the pool isn't full."""
         try:
-            yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._reader_lock:
+            if self._reader_count < self._reader_pool_size:
+                self._reader_count += 1
+                conn = self._create_connection()
+                conn.execute("PRAGMA query_only = ON")
+                return conn
+        
+        return self._readers.get()
     
     def _create_connection(self) -> sqlite3.Connection:
         """Create a new database connection with optimal settings."""
         conn = sqlite3.connect(
             self.db_path,
             check_same_thread=False,
-            timeout=30.0
+            timeout=30.0,
+            # Room for every repository statement plus ad-hoc queries
+            cached_statements=256,
+            # Never begin transactions implicitly: get_connection() opens
+            # them explicitly (BEGIN IMMEDIATE for writes)
+            isolation_level=None
         )
         
         # Enable foreign keys
@@ -74,29 +144,69 @@ class Database:
         # Use WAL mode for better concurrent access
         conn.execute("PRAGMA journal_mode = WAL")
         
-        # Return rows as dictionaries
-        conn.row_factory = sqlite3.Row
+        # WAL is safe from corruption with NORMAL; only fsync at checkpoints
+        conn.execute("PRAGMA synchronous = NORMAL")
+        
+        # Keep temp tables in memory, map the file for reads, 64 MB page cache
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA mmap_size = 268435456")
+        conn.execute("PRAGMA cache_size = -64000")
+        
+        # Never checkpoint as a side effect of a commit; checkpoint() is
+        # run periodically instead so saves don't stall behind one
+        conn.execute("PRAGMA wal_autocheckpoint = 0")
         
         return conn
     
     def _create_tables(self, conn: sqlite3.Connection) -> None:
         """Create all database tables."""
+        self._migrate(conn)
         conn.executescript(SCHEMA_SQL)
     
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Add columns introduced after a database was first created."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(game_states)")}
+        if columns and "base_snapshot_id" not in columns:
+            conn.execute(
+                "ALTER TABLE game_states ADD COLUMN base_snapshot_id INTEGER "
+                "REFERENCES game_states(id) ON DELETE CASCADE"
+            )
+        
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(games)")}
+        if columns and "player_count" not in columns:
+            conn.execute(
+                "ALTER TABLE games ADD COLUMN player_count INTEGER NOT NULL DEFAULT 0"
+            )
+            conn.execute(
+                "UPDATE games SET player_count = "
+                "(SELECT COUNT(*) FROM players WHERE players.game_id = games.id)"
+            )
+    
     def close_connection(self) -> None:
-        """Close the current thread's connection."""
-        if hasattr(Database._local, 'connection') and Database._local.connection:
-            Database._local.connection.close()
-            Database._local.connection = None
+        """Close the writer and all idle reader connections."""
+        with self._writer_lock:
+            if self._writer:
+                self._writer.close()
+                self._writer = None
+        
+        with self._reader_lock:
+            while True:
+                try:
+                    self._readers.get_nowait().close()
+                except queue.Empty:
+                    break
+                self._reader_count -= 1
     
     def reset_database(self) -> None:
         """Drop and recreate all tables. USE WITH CAUTION."""
         with self.get_connection() as conn:
-            # Get all table names
+            # Get all table names, newest first so child tables are dropped
+            # before the tables they reference
             cursor = conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+                "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' "
+                "ORDER BY rowid DESC"
             )
-            tables = [row['name'] for row in cursor.fetchall()]
+            tables = [row[0] for row in cursor.fetchall()]
             
             # Drop all tables
             for table in tables:
@@ -119,7 +229,8 @@ CREATE TABLE IF NOT EXISTS games (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     finished_at TIMESTAMP,
     winner_id TEXT,
-    settings_json TEXT NOT NULL DEFAULT '{}'
+    settings_json TEXT NOT NULL DEFAULT '{}',
+    player_count INTEGER NOT NULL DEFAULT 0
 );
 
 -- Players table: stores player data per game
@@ -154,13 +265,18 @@ CREATE TABLE IF NOT EXISTS properties (
     FOREIGN KEY (owner_id) REFERENCES players(id) ON DELETE SET NULL
 );
 
--- Game states table: stores serialized snapshots for recovery
+-- Game states table: stores serialized snapshots for recovery.
+-- Rows with a base_snapshot_id are deltas: state_json then holds the
+-- diff against that (full) base snapshot rather than the whole state.
+-- state_json holds UTF-8 JSON bytes; databases created with a TEXT column
+-- keep the BLOBs as-is, since TEXT affinity never converts BLOBs.
 CREATE TABLE IF NOT EXISTS game_states (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     game_id TEXT NOT NULL,
-    state_json TEXT NOT NULL,
+    state_json BLOB NOT NULL,
     turn_number INTEGER NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    base_snapshot_id INTEGER REFERENCES game_states(id) ON DELETE CASCADE,
     
     FOREIGN KEY (game_id) REFERENCES games(id) ON DELETE CASCADE
 );
@@ -176,12 +292,43 @@ CREATE TABLE IF NOT EXISTS card_decks (
     FOREIGN KEY (game_id) REFERENCES games(id) ON DELETE CASCADE
 );
 
+-- Keep games.player_count in step with the players table so the lobby
+-- listing reads a column instead of aggregating players per game
+CREATE TRIGGER IF NOT EXISTS trg_players_insert AFTER INSERT ON players
+BEGIN
+    UPDATE games SET player_count = player_count + 1 WHERE id = NEW.game_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_players_delete AFTER DELETE ON players
+BEGIN
+    UPDATE games SET player_count = player_count - 1 WHERE id = OLD.game_id;
+END;
+
 -- Indexes for common queries
-CREATE INDEX IF NOT EXISTS idx_players_game_id ON players(game_id);
-CREATE INDEX IF NOT EXISTS idx_properties_game_id ON properties(game_id);
 CREATE INDEX IF NOT EXISTS idx_properties_owner_id ON properties(owner_id);
-CREATE INDEX IF NOT EXISTS idx_game_states_game_id ON game_states(game_id);
-CREATE INDEX IF NOT EXISTS idx_games_status ON games(status);
+CREATE INDEX IF NOT EXISTS idx_game_states_base ON game_states(base_snapshot_id);
+
+-- Match the ORDER BY of per-game reads so rows come back pre-sorted
+-- (properties need none: their primary key is (game_id, position))
+CREATE INDEX IF NOT EXISTS idx_players_game_turn
+    ON players(game_id, turn_order);
+CREATE INDEX IF NOT EXISTS idx_game_states_game_turn
+    ON game_states(game_id, turn_number DESC, id DESC);
+
+-- Covering index for the lobby listing (filter by status, newest first);
+-- holds every column list_games selects
+CREATE INDEX IF NOT EXISTS idx_games_lobby
+    ON games(status, updated_at DESC, id, name, created_at, player_count);
+
+-- Superseded: the properties primary key already leads with game_id,
+-- idx_games_lobby covers status lookups (and replaces
+-- idx_games_status_updated, which lacked player_count), and the
+-- game_turn indexes above lead with game_id
+DROP INDEX IF EXISTS idx_properties_game_id;
+DROP INDEX IF EXISTS idx_games_status_updated;
+DROP INDEX IF EXISTS idx_games_status;
+DROP INDEX IF EXISTS idx_players_game_id;
+DROP INDEX IF EXISTS idx_game_states_game_id;
 """
 
 
@@ -204,3 +351,22 @@ def init_database(db_path: str | None = None) -> Database:
     Database._initialized = False
     _db = Database(db_path)
     return _db
+
+
+@contextmanager
+def conn_row_factory(
+    conn: sqlite3.Connection,
+    factory: Any = sqlite3.Row
+) -> Generator[sqlite3.Connection, None, None]:
+    """
+    Temporarily set a row factory on a connection.
+    
+    Connections return plain tuples; use this for the few places that
+    want rows addressable by column name.
+    """
+    previous = conn.row_factory
+    conn.row_factory = factory
+    try:
+        yield conn
+    finally:
+        conn.row_factory = previous
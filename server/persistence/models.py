@@ -7,10 +7,10 @@ separate from the game engine models.
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import ClassVar
 
 
-@dataclass
+@dataclass(slots=True)
 class GameRecord:
     """Database representation of a game."""
     id: str
@@ -23,23 +23,31 @@ class GameRecord:
     winner_id: str | None = None
     settings_json: str = "{}"
     
+    # Column order expected by from_row
+    COLUMNS: ClassVar[str] = (
+        "id, name, status, current_player_index, created_at, updated_at, "
+        "finished_at, winner_id, settings_json"
+    )
+    
     @classmethod
-    def from_row(cls, row: dict[str, Any]) -> "GameRecord":
-        """Create from database row."""
+    def from_row(cls, row: tuple) -> "GameRecord":
+        """Create from a database row selected with COLUMNS."""
+        (id, name, status, current_player_index, created_at, updated_at,
+         finished_at, winner_id, settings_json) = row
         return cls(
-            id=row["id"],
-            name=row["name"],
-            status=row["status"],
-            current_player_index=row["current_player_index"],
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
-            finished_at=row["finished_at"],
-            winner_id=row["winner_id"],
-            settings_json=row["settings_json"]
+            id=id,
+            name=name,
+            status=status,
+            current_player_index=current_player_index,
+            created_at=created_at,
+            updated_at=updated_at,
+            finished_at=finished_at,
+            winner_id=winner_id,
+            settings_json=settings_json
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerRecord:
     """Database representation of a player."""
     id: str
@@ -56,27 +64,35 @@ class PlayerRecord:
     connected: bool = False
     created_at: datetime | None = None
     
+    # Column order expected by from_row
+    COLUMNS: ClassVar[str] = (
+        "id, game_id, name, token, turn_order, position, money, is_bankrupt, "
+        "is_in_jail, jail_turns, get_out_of_jail_cards, connected, created_at"
+    )
+    
     @classmethod
-    def from_row(cls, row: dict[str, Any]) -> "PlayerRecord":
-        """Create from database row."""
+    def from_row(cls, row: tuple) -> "PlayerRecord":
+        """Create from a database row selected with COLUMNS."""
+        (id, game_id, name, token, turn_order, position, money, is_bankrupt,
+         is_in_jail, jail_turns, get_out_of_jail_cards, connected, created_at) = row
         return cls(
-            id=row["id"],
-            game_id=row["game_id"],
-            name=row["name"],
-            token=row["token"],
-            turn_order=row["turn_order"],
-            position=row["position"],
-            money=row["money"],
-            is_bankrupt=bool(row["is_bankrupt"]),
-            is_in_jail=bool(row["is_in_jail"]),
-            jail_turns=row["jail_turns"],
-            get_out_of_jail_cards=row["get_out_of_jail_cards"],
-            connected=bool(row["connected"]),
-            created_at=row["created_at"]
+            id=id,
+            game_id=game_id,
+            name=name,
+            token=token,
+            turn_order=turn_order,
+            position=position,
+            money=money,
+            is_bankrupt=bool(is_bankrupt),
+            is_in_jail=bool(is_in_jail),
+            jail_turns=jail_turns,
+            get_out_of_jail_cards=get_out_of_jail_cards,
+            connected=bool(connected),
+            created_at=created_at
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PropertyRecord:
     """Database representation of property ownership."""
     game_id: str
@@ -85,45 +101,54 @@ class PropertyRecord:
     houses: int = 0
     is_mortgaged: bool = False
     
+    # Column order expected by from_row
+    COLUMNS: ClassVar[str] = "game_id, position, owner_id, houses, is_mortgaged"
+    
     @classmethod
-    def from_row(cls, row: dict[str, Any]) -> "PropertyRecord":
-        """Create from database row."""
+    def from_row(cls, row: tuple) -> "PropertyRecord":
+        """Create from a database row selected with COLUMNS."""
+        (game_id, position, owner_id, houses, is_mortgaged) = row
         return cls(
-            game_id=row["game_id"],
-            position=row["position"],
-            owner_id=row["owner_id"],
-            houses=row["houses"],
-            is_mortgaged=bool(row["is_mortgaged"])
+            game_id=game_id,
+            position=position,
+            owner_id=owner_id,
+            houses=houses,
+            is_mortgaged=bool(is_mortgaged)
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class GameStateSnapshot:
     """
     Complete serialized game state for recovery.
     
     This stores the full JSON from game.to_dict() for 
-    point-in-time recovery.
+    point-in-time recovery. New snapshots are written as UTF-8 JSON
+    bytes (BLOBs); older rows may still hold text.
     """
     id: int | None
     game_id: str
-    state_json: str
+    state_json: str | bytes
     turn_number: int
     created_at: datetime | None = None
     
+    # Column order expected by from_row
+    COLUMNS: ClassVar[str] = "id, game_id, state_json, turn_number, created_at"
+    
     @classmethod
-    def from_row(cls, row: dict[str, Any]) -> "GameStateSnapshot":
-        """Create from database row."""
+    def from_row(cls, row: tuple) -> "GameStateSnapshot":
+        """Create from a database row selected with COLUMNS."""
+        (id, game_id, state_json, turn_number, created_at) = row
         return cls(
-            id=row["id"],
-            game_id=row["game_id"],
-            state_json=row["state_json"],
-            turn_number=row["turn_number"],
-            created_at=row["created_at"]
+            id=id,
+            game_id=game_id,
+            state_json=state_json,
+            turn_number=turn_number,
+            created_at=created_at
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CardDeckRecord:
     """Database representation of a card deck state."""
     game_id: str
@@ -131,18 +156,22 @@ class CardDeckRecord:
     card_order_json: str
     current_index: int = 0
     
+    # Column order expected by from_row
+    COLUMNS: ClassVar[str] = "game_id, deck_type, card_order_json, current_index"
+    
     @classmethod
-    def from_row(cls, row: dict[str, Any]) -> "CardDeckRecord":
-        """Create from database row."""
+    def from_row(cls, row: tuple) -> "CardDeckRecord":
+        """Create from a database row selected with COLUMNS."""
+        (game_id, deck_type, card_order_json, current_index) = row
         return cls(
-            game_id=row["game_id"],
-            deck_type=row["deck_type"],
-            card_order_json=row["card_order_json"],
-            current_index=row["current_index"]
+            game_id=game_id,
+            deck_type=deck_type,
+            card_order_json=card_order_json,
+            current_index=current_index
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class GameSummary:
     """Lightweight game info for listings."""
     id: str
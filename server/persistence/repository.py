@@ -4,7 +4,8 @@ Repository layer for game persistence operations.
 Handles all database CRUD operations and game state serialization.
 """
 
-import json
+import sqlite3
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
@@ -17,6 +18,189 @@ from server.persistence.models import (
     CardDeckRecord,
     GameSummary
 )
+from server.persistence.state_diff import diff_states, apply_state_diff
+from shared.protocol import decode_json, encode_json_bytes
+
+
+# Every Nth snapshot written by save_full_game stores the full state;
+# the ones in between store a diff against it.
+FULL_SNAPSHOT_INTERVAL = 10
+
+# Statements used on every save or load, defined once so each call passes
+# the same string and hits the connection's prepared statement cache
+
+_SQL_INSERT_GAME = """
+INSERT INTO games (id, name, status, current_player_index, settings_json)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+_SQL_UPDATE_GAME = """
+UPDATE games
+SET name = ?,
+    status = ?,
+    current_player_index = ?,
+    updated_at = CURRENT_TIMESTAMP,
+    finished_at = ?,
+    winner_id = ?,
+    settings_json = ?
+WHERE id = ?
+"""
+
+_SQL_UPSERT_GAME = """
+INSERT INTO games (id, name, status, current_player_index,
+                   finished_at, winner_id, settings_json)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    name = excluded.name,
+    status = excluded.status,
+    current_player_index = excluded.current_player_index,
+    updated_at = CURRENT_TIMESTAMP,
+    finished_at = excluded.finished_at,
+    winner_id = excluded.winner_id,
+    settings_json = excluded.settings_json
+"""
+
+_SQL_SELECT_GAME = f"SELECT {GameRecord.COLUMNS} FROM games WHERE id = ?"
+
+_SQL_INSERT_PLAYER = """
+INSERT INTO players (
+    id, game_id, name, token, position, money,
+    is_bankrupt, is_in_jail, jail_turns,
+    get_out_of_jail_cards, turn_order, connected
+)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_UPDATE_PLAYER = """
+UPDATE players
+SET position = ?,
+    money = ?,
+    is_bankrupt = ?,
+    is_in_jail = ?,
+    jail_turns = ?,
+    get_out_of_jail_cards = ?,
+    connected = ?
+WHERE id = ?
+"""
+
+_SQL_UPSERT_PLAYER = """
+INSERT INTO players (
+    id, game_id, name, token, position, money,
+    is_bankrupt, is_in_jail, jail_turns,
+    get_out_of_jail_cards, turn_order, connected
+)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    position = excluded.position,
+    money = excluded.money,
+    is_bankrupt = excluded.is_bankrupt,
+    is_in_jail = excluded.is_in_jail,
+    jail_turns = excluded.jail_turns,
+    get_out_of_jail_cards = excluded.get_out_of_jail_cards,
+    connected = excluded.connected
+"""
+
+_SQL_SELECT_PLAYER = f"SELECT {PlayerRecord.COLUMNS} FROM players WHERE id = ?"
+
+_SQL_SELECT_PLAYERS_FOR_GAME = (
+    f"SELECT {PlayerRecord.COLUMNS} FROM players "
+    "WHERE game_id = ? ORDER BY turn_order"
+)
+
+_SQL_INSERT_PROPERTY = """
+INSERT INTO properties (game_id, position, owner_id, houses, is_mortgaged)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+_SQL_UPSERT_PROPERTY = """
+INSERT INTO properties (game_id, position, owner_id, houses, is_mortgaged)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(game_id, position) DO UPDATE SET
+    owner_id = excluded.owner_id,
+    houses = excluded.houses,
+    is_mortgaged = excluded.is_mortgaged
+"""
+
+_SQL_SELECT_PROPERTIES_FOR_GAME = (
+    f"SELECT {PropertyRecord.COLUMNS} FROM properties "
+    "WHERE game_id = ? ORDER BY position"
+)
+
+_SQL_SELECT_PROPERTIES_FOR_PLAYER = (
+    f"SELECT {PropertyRecord.COLUMNS} FROM properties "
+    "WHERE owner_id = ? ORDER BY position"
+)
+
+# Snapshot columns, then the delta base and its state (see _snapshot_from_row)
+_SQL_SELECT_LATEST_SNAPSHOT = """
+SELECT s.id, s.game_id, s.state_json, s.turn_number, s.created_at,
+       s.base_snapshot_id, b.state_json
+FROM game_states s
+LEFT JOIN game_states b ON b.id = s.base_snapshot_id
+WHERE s.game_id = ?
+ORDER BY s.turn_number DESC, s.id DESC
+LIMIT 1
+"""
+
+_SQL_INSERT_SNAPSHOT = """
+INSERT INTO game_states (game_id, state_json, turn_number)
+VALUES (?, ?, ?)
+"""
+
+_SQL_INSERT_DELTA_SNAPSHOT = """
+INSERT INTO game_states (game_id, state_json, turn_number, base_snapshot_id)
+VALUES (?, ?, ?, ?)
+"""
+
+# A cached base is only usable if it is still a full snapshot of the same game
+_SQL_SELECT_SNAPSHOT_BASE = (
+    "SELECT 1 FROM game_states WHERE id = ? AND game_id = ? AND base_snapshot_id IS NULL"
+)
+
+_SQL_INSERT_CARD_DECK = """
+INSERT INTO card_decks (game_id, deck_type, card_order_json, current_index)
+VALUES (?, ?, ?, ?)
+"""
+
+_SQL_UPSERT_CARD_DECK = """
+INSERT INTO card_decks (game_id, deck_type, card_order_json, current_index)
+VALUES (?, ?, ?, ?)
+ON CONFLICT(game_id, deck_type) DO UPDATE SET
+    card_order_json = excluded.card_order_json,
+    current_index = excluded.current_index
+"""
+
+_SQL_SELECT_CARD_DECKS = f"SELECT {CardDeckRecord.COLUMNS} FROM card_decks WHERE game_id = ?"
+
+
+_SQL_LIST_GAMES = """
+SELECT id, name, status, created_at, updated_at, player_count
+FROM games
+ORDER BY updated_at DESC
+LIMIT ? OFFSET ?
+"""
+
+# Answered from idx_games_lobby alone
+_SQL_LIST_GAMES_BY_STATUS = """
+SELECT id, name, status, created_at, updated_at, player_count
+FROM games
+WHERE status = ?
+ORDER BY updated_at DESC
+LIMIT ? OFFSET ?
+"""
+
+
+@dataclass(slots=True)
+class _SnapshotBase:
+    """The latest full snapshot of a game, kept for diffing new snapshots."""
+    id: int
+    state: dict[str, Any]
+    deltas: int = 0
+
+
+def _unsaved(saved: dict[tuple, tuple], rows: dict[tuple, tuple]) -> dict[tuple, tuple]:
+    """Return the rows whose values differ from what was last saved."""
+    return {key: row for key, row in rows.items() if saved.get(key) != row}
 
 
 class GameRepository:
@@ -27,8 +211,17 @@ class GameRepository:
     abstracting away the database details.
     """
     
+    __slots__ = ("db", "_snapshot_bases", "_saved_rows")
+    
     def __init__(self, database: Database | None = None):
         self.db = database or get_database()
+        
+        # game_id -> latest full snapshot (only touched under the write lock)
+        self._snapshot_bases: dict[str, _SnapshotBase] = {}
+        
+        # game_id -> row key -> values last committed by save_full_game.
+        # Other writers drop the entries they touch.
+        self._saved_rows: dict[str, dict[tuple, tuple]] = {}
     
     # =========================================================================
     # Game CRUD Operations
@@ -38,10 +231,7 @@ class GameRepository:
         """Create a new game record."""
         with self.db.get_connection() as conn:
             conn.execute(
-                """
-                INSERT INTO games (id, name, status, current_player_index, settings_json)
-                VALUES (?, ?, ?, ?, ?)
-                """,
+                _SQL_INSERT_GAME,
                 (
                     game_record.id,
                     game_record.name,
@@ -54,32 +244,22 @@ class GameRepository:
     
     def get_game(self, game_id: str) -> GameRecord | None:
         """Get a game by ID."""
-        with self.db.get_connection() as conn:
+        with self.db.get_connection(readonly=True) as conn:
             cursor = conn.execute(
-                "SELECT * FROM games WHERE id = ?",
+                _SQL_SELECT_GAME,
                 (game_id,)
             )
             row = cursor.fetchone()
             
             if row:
-                return GameRecord.from_row(dict(row))
+                return GameRecord.from_row(row)
             return None
     
     def update_game(self, game_record: GameRecord) -> None:
         """Update an existing game record."""
         with self.db.get_connection() as conn:
             conn.execute(
-                """
-                UPDATE games 
-                SET name = ?,
-                    status = ?,
-                    current_player_index = ?,
-                    updated_at = CURRENT_TIMESTAMP,
-                    finished_at = ?,
-                    winner_id = ?,
-                    settings_json = ?
-                WHERE id = ?
-                """,
+                _SQL_UPDATE_GAME,
                 (
                     game_record.name,
                     game_record.status,
@@ -94,6 +274,8 @@ class GameRepository:
     def delete_game(self, game_id: str) -> bool:
         """Delete a game and all related data (cascades)."""
         with self.db.get_connection() as conn:
+            self._snapshot_bases.pop(game_id, None)
+            self._saved_rows.pop(game_id, None)
             cursor = conn.execute(
                 "DELETE FROM games WHERE id = ?",
                 (game_id,)
@@ -107,45 +289,23 @@ class GameRepository:
         offset: int = 0
     ) -> list[GameSummary]:
         """List games with optional status filter."""
-        with self.db.get_connection() as conn:
+        with self.db.get_connection(readonly=True) as conn:
             if status:
-                cursor = conn.execute(
-                    """
-                    SELECT g.id, g.name, g.status, g.created_at, g.updated_at,
-                           COUNT(p.id) as player_count
-                    FROM games g
-                    LEFT JOIN players p ON g.id = p.game_id
-                    WHERE g.status = ?
-                    GROUP BY g.id
-                    ORDER BY g.updated_at DESC
-                    LIMIT ? OFFSET ?
-                    """,
-                    (status, limit, offset)
-                )
+                cursor = conn.execute(_SQL_LIST_GAMES_BY_STATUS, (status, limit, offset))
             else:
-                cursor = conn.execute(
-                    """
-                    SELECT g.id, g.name, g.status, g.created_at, g.updated_at,
-                           COUNT(p.id) as player_count
-                    FROM games g
-                    LEFT JOIN players p ON g.id = p.game_id
-                    GROUP BY g.id
-                    ORDER BY g.updated_at DESC
-                    LIMIT ? OFFSET ?
-                    """,
-                    (limit, offset)
-                )
+                cursor = conn.execute(_SQL_LIST_GAMES, (limit, offset))
             
             return [
                 GameSummary(
-                    id=row["id"],
-                    name=row["name"],
-                    status=row["status"],
-                    player_count=row["player_count"],
-                    created_at=row["created_at"],
-                    updated_at=row["updated_at"]
+                    id=id,
+                    name=name,
+                    status=status,
+                    player_count=player_count,
+                    created_at=created_at,
+                    updated_at=updated_at
                 )
-                for row in cursor.fetchall()
+                for id, name, status, created_at, updated_at, player_count
+                in cursor
             ]
     
     # =========================================================================
@@ -155,15 +315,9 @@ class GameRepository:
     def add_player(self, player: PlayerRecord) -> PlayerRecord:
         """Add a player to a game."""
         with self.db.get_connection() as conn:
+            self._saved_rows.pop(player.game_id, None)
             conn.execute(
-                """
-                INSERT INTO players (
-                    id, game_id, name, token, position, money,
-                    is_bankrupt, is_in_jail, jail_turns,
-                    get_out_of_jail_cards, turn_order, connected
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                _SQL_INSERT_PLAYER,
                 (
                     player.id,
                     player.game_id,
@@ -171,61 +325,52 @@ class GameRepository:
                     player.token,
                     player.position,
                     player.money,
-                    int(player.is_bankrupt),
-                    int(player.is_in_jail),
+                    player.is_bankrupt,
+                    player.is_in_jail,
                     player.jail_turns,
                     player.get_out_of_jail_cards,
                     player.turn_order,
-                    int(player.connected)
+                    player.connected
                 )
             )
         return player
     
     def get_player(self, player_id: str) -> PlayerRecord | None:
         """Get a player by ID."""
-        with self.db.get_connection() as conn:
+        with self.db.get_connection(readonly=True) as conn:
             cursor = conn.execute(
-                "SELECT * FROM players WHERE id = ?",
+                _SQL_SELECT_PLAYER,
                 (player_id,)
             )
             row = cursor.fetchone()
             
             if row:
-                return PlayerRecord.from_row(dict(row))
+                return PlayerRecord.from_row(row)
             return None
     
     def get_players_for_game(self, game_id: str) -> list[PlayerRecord]:
         """Get all players in a game, ordered by turn order."""
-        with self.db.get_connection() as conn:
+        with self.db.get_connection(readonly=True) as conn:
             cursor = conn.execute(
-                "SELECT * FROM players WHERE game_id = ? ORDER BY turn_order",
+                _SQL_SELECT_PLAYERS_FOR_GAME,
                 (game_id,)
             )
-            return [PlayerRecord.from_row(dict(row)) for row in cursor.fetchall()]
+            return [PlayerRecord.from_row(row) for row in cursor]
     
     def update_player(self, player: PlayerRecord) -> None:
         """Update a player record."""
         with self.db.get_connection() as conn:
+            self._saved_rows.pop(player.game_id, None)
             conn.execute(
-                """
-                UPDATE players
-                SET position = ?,
-                    money = ?,
-                    is_bankrupt = ?,
-                    is_in_jail = ?,
-                    jail_turns = ?,
-                    get_out_of_jail_cards = ?,
-                    connected = ?
-                WHERE id = ?
-                """,
+                _SQL_UPDATE_PLAYER,
                 (
                     player.position,
                     player.money,
-                    int(player.is_bankrupt),
-                    int(player.is_in_jail),
+                    player.is_bankrupt,
+                    player.is_in_jail,
                     player.jail_turns,
                     player.get_out_of_jail_cards,
-                    int(player.connected),
+                    player.connected,
                     player.id
                 )
             )
@@ -233,9 +378,11 @@ class GameRepository:
     def update_player_connection(self, player_id: str, connected: bool) -> None:
         """Update only the connection status of a player."""
         with self.db.get_connection() as conn:
+            for saved in self._saved_rows.values():
+                saved.pop(("player", player_id), None)
             conn.execute(
                 "UPDATE players SET connected = ? WHERE id = ?",
-                (int(connected), player_id)
+                (connected, player_id)
             )
     
     # =========================================================================
@@ -245,41 +392,53 @@ class GameRepository:
     def save_property(self, prop: PropertyRecord) -> None:
         """Save or update a property record."""
         with self.db.get_connection() as conn:
+            self._saved_rows.pop(prop.game_id, None)
             conn.execute(
-                """
-                INSERT INTO properties (game_id, position, owner_id, houses, is_mortgaged)
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(game_id, position) DO UPDATE SET
-                    owner_id = excluded.owner_id,
-                    houses = excluded.houses,
-                    is_mortgaged = excluded.is_mortgaged
-                """,
+                _SQL_UPSERT_PROPERTY,
                 (
                     prop.game_id,
                     prop.position,
                     prop.owner_id,
                     prop.houses,
-                    int(prop.is_mortgaged)
+                    prop.is_mortgaged
                 )
             )
     
+    def save_properties(self, props: list[PropertyRecord]) -> None:
+        """Save or update several property records in one transaction."""
+        for prop in props:
+            self._saved_rows.pop(prop.game_id, None)
+        self.db.execute_many(
+            _SQL_UPSERT_PROPERTY,
+            [
+                (
+                    prop.game_id,
+                    prop.position,
+                    prop.owner_id,
+                    prop.houses,
+                    prop.is_mortgaged
+                )
+                for prop in props
+            ]
+        )
+    
     def get_properties_for_game(self, game_id: str) -> list[PropertyRecord]:
         """Get all properties with ownership info for a game."""
-        with self.db.get_connection() as conn:
+        with self.db.get_connection(readonly=True) as conn:
             cursor = conn.execute(
-                "SELECT * FROM properties WHERE game_id = ? ORDER BY position",
+                _SQL_SELECT_PROPERTIES_FOR_GAME,
                 (game_id,)
             )
-            return [PropertyRecord.from_row(dict(row)) for row in cursor.fetchall()]
+            return [PropertyRecord.from_row(row) for row in cursor]
     
     def get_properties_for_player(self, player_id: str) -> list[PropertyRecord]:
         """Get all properties owned by a player."""
-        with self.db.get_connection() as conn:
+        with self.db.get_connection(readonly=True) as conn:
             cursor = conn.execute(
-                "SELECT * FROM properties WHERE owner_id = ? ORDER BY position",
+                _SQL_SELECT_PROPERTIES_FOR_PLAYER,
                 (player_id,)
             )
-            return [PropertyRecord.from_row(dict(row)) for row in cursor.fetchall()]
+            return [PropertyRecord.from_row(row) for row in cursor]
     
     # =========================================================================
     # Game State Snapshots
@@ -291,44 +450,36 @@ class GameRepository:
         
         Returns the snapshot ID.
         """
-        state_json = json.dumps(state)
+        state_json = encode_json_bytes(state)
         
         with self.db.get_connection() as conn:
             cursor = conn.execute(
-                """
-                INSERT INTO game_states (game_id, state_json, turn_number)
-                VALUES (?, ?, ?)
-                """,
+                _SQL_INSERT_SNAPSHOT,
                 (game_id, state_json, turn_number)
             )
             return cursor.lastrowid
     
     def get_latest_game_state(self, game_id: str) -> GameStateSnapshot | None:
         """Get the most recent game state snapshot."""
-        with self.db.get_connection() as conn:
-            cursor = conn.execute(
-                """
-                SELECT * FROM game_states 
-                WHERE game_id = ? 
-                ORDER BY turn_number DESC, id DESC
-                LIMIT 1
-                """,
-                (game_id,)
-            )
+        with self.db.get_connection(readonly=True) as conn:
+            cursor = conn.execute(_SQL_SELECT_LATEST_SNAPSHOT, (game_id,))
             row = cursor.fetchone()
             
             if row:
-                return GameStateSnapshot.from_row(dict(row))
+                return self._snapshot_from_row(row)
             return None
     
     def get_game_state_at_turn(self, game_id: str, turn_number: int) -> GameStateSnapshot | None:
         """Get game state at a specific turn (for replay/undo)."""
-        with self.db.get_connection() as conn:
+        with self.db.get_connection(readonly=True) as conn:
             cursor = conn.execute(
                 """
-                SELECT * FROM game_states 
-                WHERE game_id = ? AND turn_number <= ?
-                ORDER BY turn_number DESC 
+                SELECT s.id, s.game_id, s.state_json, s.turn_number, s.created_at,
+                       s.base_snapshot_id, b.state_json
+                FROM game_states s
+                LEFT JOIN game_states b ON b.id = s.base_snapshot_id
+                WHERE s.game_id = ? AND s.turn_number <= ?
+                ORDER BY s.turn_number DESC 
                 LIMIT 1
                 """,
                 (game_id, turn_number)
@@ -336,7 +487,7 @@ class GameRepository:
             row = cursor.fetchone()
             
             if row:
-                return GameStateSnapshot.from_row(dict(row))
+                return self._snapshot_from_row(row)
             return None
     
     def cleanup_old_snapshots(self, game_id: str, keep_count: int = 10) -> int:
@@ -346,20 +497,80 @@ class GameRepository:
         Returns the number of deleted snapshots.
         """
         with self.db.get_connection() as conn:
+            # Full snapshots that kept deltas are based on must survive too
             cursor = conn.execute(
                 """
-                DELETE FROM game_states 
-                WHERE game_id = ? AND id NOT IN (
-                    SELECT id FROM game_states 
-                    WHERE game_id = ? 
-                    ORDER BY created_at DESC 
-                    LIMIT ?
+                DELETE FROM game_states
+                WHERE id IN (
+                    SELECT id FROM game_states
+                    WHERE game_id = ?
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT -1 OFFSET ?
+                ) AND id NOT IN (
+                    SELECT base_snapshot_id FROM game_states
+                    WHERE base_snapshot_id IS NOT NULL AND id IN (
+                        SELECT id FROM game_states
+                        WHERE game_id = ?
+                        ORDER BY created_at DESC, id DESC
+                        LIMIT ?
+                    )
                 )
                 """,
-                (game_id, game_id, keep_count)
+                (game_id, keep_count, game_id, keep_count)
             )
             return cursor.rowcount
     
+    def _insert_snapshot(
+        self,
+        conn: sqlite3.Connection,
+        game_id: str,
+        state: dict[str, Any],
+        turn_number: int
+    ) -> _SnapshotBase:
+        """
+        Insert a snapshot as a diff against the game's latest full snapshot.
+        
+        A full snapshot is written every FULL_SNAPSHOT_INTERVAL saves, and
+        whenever no usable base is known (e.g. after a restart).
+        Must be called inside a write transaction.
+        
+        Returns:
+            The game's base after this insert. It is only valid once the
+            transaction commits, so callers hand it to _remember_saved then.
+        """
+        state_json = encode_json_bytes(state)
+        base = self._snapshot_bases.get(game_id)
+        
+        if base and base.deltas < FULL_SNAPSHOT_INTERVAL - 1 and conn.execute(
+            _SQL_SELECT_SNAPSHOT_BASE, (base.id, game_id)
+        ).fetchone():
+            ops = diff_states(base.state, decode_json(state_json))
+            conn.execute(
+                _SQL_INSERT_DELTA_SNAPSHOT,
+                (game_id, encode_json_bytes(ops), turn_number, base.id)
+            )
+            return _SnapshotBase(id=base.id, state=base.state, deltas=base.deltas + 1)
+        
+        cursor = conn.execute(
+            _SQL_INSERT_SNAPSHOT,
+            (game_id, state_json, turn_number)
+        )
+        return _SnapshotBase(id=cursor.lastrowid, state=decode_json(state_json))
+    
+    @staticmethod
+    def _snapshot_from_row(row: tuple) -> GameStateSnapshot:
+        """
+        Build a snapshot from a row, rebuilding the full state of deltas.
+        
+        Expects GameStateSnapshot.COLUMNS followed by base_snapshot_id
+        and the base snapshot's state_json.
+        """
+        *columns, base_snapshot_id, base_state_json = row
+        if base_snapshot_id is not None:
+            state = apply_state_diff(decode_json(base_state_json), decode_json(columns[2]))
+            columns[2] = encode_json_bytes(state)
+        return GameStateSnapshot.from_row(columns)
+    
     # =========================================================================
     # Card Deck Operations
     # =========================================================================
@@ -367,14 +578,9 @@ class GameRepository:
     def save_card_deck(self, deck: CardDeckRecord) -> None:
         """Save or update a card deck state."""
         with self.db.get_connection() as conn:
+            self._saved_rows.pop(deck.game_id, None)
             conn.execute(
-                """
-                INSERT INTO card_decks (game_id, deck_type, card_order_json, current_index)
-                VALUES (?, ?, ?, ?)
-                ON CONFLICT(game_id, deck_type) DO UPDATE SET
-                    card_order_json = excluded.card_order_json,
-                    current_index = excluded.current_index
-                """,
+                _SQL_UPSERT_CARD_DECK,
                 (
                     deck.game_id,
                     deck.deck_type,
@@ -385,12 +591,12 @@ class GameRepository:
     
     def get_card_decks(self, game_id: str) -> list[CardDeckRecord]:
         """Get all card deck states for a game."""
-        with self.db.get_connection() as conn:
+        with self.db.get_connection(readonly=True) as conn:
             cursor = conn.execute(
-                "SELECT * FROM card_decks WHERE game_id = ?",
+                _SQL_SELECT_CARD_DECKS,
                 (game_id,)
             )
-            return [CardDeckRecord.from_row(dict(row)) for row in cursor.fetchall()]
+            return [CardDeckRecord.from_row(row) for row in cursor]
     
     # =========================================================================
     # High-Level Save/Load Operations
@@ -411,129 +617,170 @@ class GameRepository:
         This is the primary method for persisting game state.
         """
         with self.db.get_connection() as conn:
-            # Update game record
-            conn.execute(
-                """
-                INSERT INTO games (id, name, status, current_player_index, 
-                                   finished_at, winner_id, settings_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(id) DO UPDATE SET
-                    name = excluded.name,
-                    status = excluded.status,
-                    current_player_index = excluded.current_player_index,
-                    updated_at = CURRENT_TIMESTAMP,
-                    finished_at = excluded.finished_at,
-                    winner_id = excluded.winner_id,
-                    settings_json = excluded.settings_json
-                """,
-                (
-                    game.id,
-                    game.name,
-                    game.status,
-                    game.current_player_index,
-                    game.finished_at,
-                    game.winner_id,
-                    game.settings_json
-                )
+            written = self._write_full_game(
+                conn.cursor(), game, players, properties, card_decks,
+                state_snapshot, turn_number
             )
-            
-            # Update players
-            for player in players:
-                conn.execute(
-                    """
-                    INSERT INTO players (
-                        id, game_id, name, token, position, money,
-                        is_bankrupt, is_in_jail, jail_turns,
-                        get_out_of_jail_cards, turn_order, connected
-                    )
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(id) DO UPDATE SET
-                        position = excluded.position,
-                        money = excluded.money,
-                        is_bankrupt = excluded.is_bankrupt,
-                        is_in_jail = excluded.is_in_jail,
-                        jail_turns = excluded.jail_turns,
-                        get_out_of_jail_cards = excluded.get_out_of_jail_cards,
-                        connected = excluded.connected
-                    """,
-                    (
-                        player.id,
-                        player.game_id,
-                        player.name,
-                        player.token,
-                        player.position,
-                        player.money,
-                        int(player.is_bankrupt),
-                        int(player.is_in_jail),
-                        player.jail_turns,
-                        player.get_out_of_jail_cards,
-                        player.turn_order,
-                        int(player.connected)
-                    )
-                )
-            
-            # Update properties
-            for prop in properties:
-                conn.execute(
-                    """
-                    INSERT INTO properties (game_id, position, owner_id, houses, is_mortgaged)
-                    VALUES (?, ?, ?, ?, ?)
-                    ON CONFLICT(game_id, position) DO UPDATE SET
-                        owner_id = excluded.owner_id,
-                        houses = excluded.houses,
-                        is_mortgaged = excluded.is_mortgaged
-                    """,
-                    (
-                        prop.game_id,
-                        prop.position,
-                        prop.owner_id,
-                        prop.houses,
-                        int(prop.is_mortgaged)
-                    )
-                )
-            
-            # Update card decks
-            for deck in card_decks:
-                conn.execute(
-                    """
-                    INSERT INTO card_decks (game_id, deck_type, card_order_json, current_index)
-                    VALUES (?, ?, ?, ?)
-                    ON CONFLICT(game_id, deck_type) DO UPDATE SET
-                        card_order_json = excluded.card_order_json,
-                        current_index = excluded.current_index
-                    """,
-                    (
-                        deck.game_id,
-                        deck.deck_type,
-                        deck.card_order_json,
-                        deck.current_index
-                    )
-                )
-            
-            # Save state snapshot if provided
-            if state_snapshot:
-                conn.execute(
-                    """
-                    INSERT INTO game_states (game_id, state_json, turn_number)
-                    VALUES (?, ?, ?)
-                    """,
-                    (game.id, json.dumps(state_snapshot), turn_number)
-                )
+        self._remember_saved(game.id, *written)
+    
+    def save_full_games(self, saves: list[dict[str, Any]]) -> None:
+        """
+        Save several complete games in a single transaction.
+        
+        Args:
+            saves: Keyword arguments for save_full_game, one dict per game
+        """
+        with self.db.get_connection() as conn:
+            # One cursor for every statement of the batch
+            cursor = conn.cursor()
+            written = [
+                (save["game"].id, self._write_full_game(cursor, **save))
+                for save in saves
+            ]
+        for game_id, (rows, base) in written:
+            self._remember_saved(game_id, rows, base)
+    
+    def _write_full_game(
+        self,
+        cursor: sqlite3.Cursor,
+        game: GameRecord,
+        players: list[PlayerRecord],
+        properties: list[PropertyRecord],
+        card_decks: list[CardDeckRecord],
+        state_snapshot: dict[str, Any] | None = None,
+        turn_number: int = 0
+    ) -> tuple[dict[tuple, tuple], _SnapshotBase | None]:
+        """
+        Write one game's rows inside the cursor's write transaction.
+        
+        Returns the player, property and deck rows that were written and
+        the game's new snapshot base (None without a snapshot), to hand to
+        _remember_saved once the transaction has committed.
+        """
+        # Update game record
+        cursor.execute(
+            _SQL_UPSERT_GAME,
+            (
+                game.id,
+                game.name,
+                game.status,
+                game.current_player_index,
+                game.finished_at,
+                game.winner_id,
+                game.settings_json
+            )
+        )
+        
+        # Only write player, property and deck rows that changed
+        # since they were last saved
+        saved = self._saved_rows.get(game.id)
+        if saved is None:
+            # Nothing known about this game's rows: rewrite its
+            # properties and decks wholesale, which skips the per-row
+            # conflict checks and drops rows no longer in the game
+            cursor.execute("DELETE FROM properties WHERE game_id = ?", (game.id,))
+            cursor.execute("DELETE FROM card_decks WHERE game_id = ?", (game.id,))
+            insert_property, insert_deck = _SQL_INSERT_PROPERTY, _SQL_INSERT_CARD_DECK
+            saved = {}
+        else:
+            insert_property, insert_deck = _SQL_UPSERT_PROPERTY, _SQL_UPSERT_CARD_DECK
+        
+        players_changed = _unsaved(saved, {
+            ("player", player.id): (
+                player.id,
+                player.game_id,
+                player.name,
+                player.token,
+                player.position,
+                player.money,
+                player.is_bankrupt,
+                player.is_in_jail,
+                player.jail_turns,
+                player.get_out_of_jail_cards,
+                player.turn_order,
+                player.connected
+            )
+            for player in players
+        })
+        cursor.executemany(_SQL_UPSERT_PLAYER, players_changed.values())
+        
+        properties_changed = _unsaved(saved, {
+            ("property", prop.position): (
+                prop.game_id,
+                prop.position,
+                prop.owner_id,
+                prop.houses,
+                prop.is_mortgaged
+            )
+            for prop in properties
+        })
+        cursor.executemany(insert_property, properties_changed.values())
+        
+        decks_changed = _unsaved(saved, {
+            ("deck", deck.deck_type): (
+                deck.game_id,
+                deck.deck_type,
+                deck.card_order_json,
+                deck.current_index
+            )
+            for deck in card_decks
+        })
+        cursor.executemany(insert_deck, decks_changed.values())
+        
+        # Save state snapshot if provided
+        base = None
+        if state_snapshot:
+            base = self._insert_snapshot(cursor.connection, game.id, state_snapshot, turn_number)
+        
+        return {**players_changed, **properties_changed, **decks_changed}, base
+    
+    def _remember_saved(
+        self,
+        game_id: str,
+        rows: dict[tuple, tuple],
+        base: _SnapshotBase | None = None
+    ) -> None:
+        """
+        Record what a committed save wrote, so unchanged rows are skipped
+        and new snapshots are diffed against the right base next time.
+        """
+        self._saved_rows.setdefault(game_id, {}).update(rows)
+        if base is not None:
+            self._snapshot_bases[game_id] = base
     
     def load_full_game(self, game_id: str) -> dict[str, Any] | None:
         """
         Load a complete game state.
         
+        Everything is read on one connection inside a single read
+        transaction, so the parts can't come from different saves.
+        
         Returns a dictionary with all game data, or None if not found.
         """
-        game = self.get_game(game_id)
-        if not game:
-            return None
-        
-        players = self.get_players_for_game(game_id)
-        properties = self.get_properties_for_game(game_id)
-        card_decks = self.get_card_decks(game_id)
-        latest_state = self.get_latest_game_state(game_id)
+        with self.db.get_connection(readonly=True) as conn:
+            conn.execute("BEGIN")
+            try:
+                row = conn.execute(_SQL_SELECT_GAME, (game_id,)).fetchone()
+                if not row:
+                    return None
+                
+                game = GameRecord.from_row(row)
+                players = [
+                    PlayerRecord.from_row(row)
+                    for row in conn.execute(_SQL_SELECT_PLAYERS_FOR_GAME, (game_id,))
+                ]
+                properties = [
+                    PropertyRecord.from_row(row)
+                    for row in conn.execute(_SQL_SELECT_PROPERTIES_FOR_GAME, (game_id,))
+                ]
+                card_decks = [
+                    CardDeckRecord.from_row(row)
+                    for row in conn.execute(_SQL_SELECT_CARD_DECKS, (game_id,))
+                ]
+                row = conn.execute(_SQL_SELECT_LATEST_SNAPSHOT, (game_id,)).fetchone()
+                latest_state = self._snapshot_from_row(row) if row else None
+            finally:
+                conn.rollback()
         
         return {
             "game": game,
@@ -542,3 +789,11 @@ class GameRepository:
             "card_decks": card_decks,
             "latest_snapshot": latest_state
         }
+    
+    # =========================================================================
+    # Maintenance
+    # =========================================================================
+    
+    def checkpoint(self) -> None:
+        """Checkpoint the database's write-ahead log (blocking)."""
+        self.db.checkpoint()
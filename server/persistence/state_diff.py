@@ -0,0 +1,63 @@
+"""
+Structural diffs between JSON game states.
+
+Used to store game state snapshots as small deltas against a full base
+snapshot instead of re-writing the whole state every turn.
+"""
+
+from typing import Any
+
+
+def diff_states(old: dict[str, Any], new: dict[str, Any]) -> list[list]:
+    """
+    Compute the operations that turn one JSON object into another.
+
+    Both states must already be JSON-normalized (string keys, lists
+    rather than tuples). Nested objects are diffed recursively; any other
+    changed value, lists included, is replaced whole.
+
+    Returns:
+        A list of ["set", path, value] and ["del", path] operations,
+        where path is the list of keys leading to the value.
+    """
+    ops: list[list] = []
+    _diff_into(old, new, [], ops)
+    return ops
+
+
+def _diff_into(old: dict, new: dict, path: list[str], ops: list[list]) -> None:
+    for key, value in new.items():
+        if key not in old:
+            ops.append(["set", path + [key], value])
+            continue
+
+        previous = old[key]
+        if isinstance(previous, dict) and isinstance(value, dict):
+            _diff_into(previous, value, path + [key], ops)
+        elif previous != value or type(previous) is not type(value):
+            ops.append(["set", path + [key], value])
+
+    for key in old:
+        if key not in new:
+            ops.append(["del", path + [key]])
+
+
+def apply_state_diff(state: dict[str, Any], ops: list[list]) -> dict[str, Any]:
+    """
+    Apply operations from diff_states to a state, in place.
+
+    Returns:
+        The updated state
+    """
+    for op in ops:
+        *parents, key = op[1]
+        target = state
+        for part in parents:
+            target = target[part]
+
+        if op[0] == "set":
+            target[key] = op[2]
+        else:
+            target.pop(key, None)
+
+    return state
@@ -3,6 +3,8 @@ Game constants for Monopoly.
 All monetary values are in Monopoly dollars.
 """
 
+from dataclasses import dataclass
+
 # Board spaces
 BOARD_SIZE = 40
 STARTING_MONEY = 1500
@@ -40,86 +42,70 @@ NUM_UTILITIES = 2
 CHANCE_CARDS = 16
 COMMUNITY_CHEST_CARDS = 16
 
-# Property data structure
-# Format: (position, name, type, cost, group, rents, house_cost)
-# Rents are: [base, 1house, 2houses, 3houses, 4houses, hotel]
-PROPERTIES = [
-    # Special spaces
-    (0, "GO", "GO", None, None, None, None),
-    (10, "Jail/Just Visiting", "JAIL", None, None, None, None),
-    (20, "Free Parking", "FREE_PARKING", None, None, None, None),
-    (30, "Go To Jail", "GO_TO_JAIL", None, None, None, None),
-    
-    # Brown properties
-    (1, "Mediterranean Avenue", "PROPERTY", 60, "BROWN", [2, 10, 30, 90, 160, 250], 50),
-    (3, "Baltic Avenue", "PROPERTY", 60, "BROWN", [4, 20, 60, 180, 320, 450], 50),
-    
-    # Light Blue properties
-    (6, "Oriental Avenue", "PROPERTY", 100, "LIGHT_BLUE", [6, 30, 90, 270, 400, 550], 50),
-    (8, "Vermont Avenue", "PROPERTY", 100, "LIGHT_BLUE", [6, 30, 90, 270, 400, 550], 50),
-    (9, "Connecticut Avenue", "PROPERTY", 120, "LIGHT_BLUE", [8, 40, 100, 300, 450, 600], 50),
-    
-    # Pink properties
-    (11, "St. Charles Place", "PROPERTY", 140, "PINK", [10, 50, 150, 450, 625, 750], 100),
-    (13, "States Avenue", "PROPERTY", 140, "PINK", [10, 50, 150, 450, 625, 750], 100),
-    (14, "Virginia Avenue", "PROPERTY", 160, "PINK", [12, 60, 180, 500, 700, 900], 100),
-    
-    # Orange properties
-    (16, "St. James Place", "PROPERTY", 180, "ORANGE", [14, 70, 200, 550, 750, 950], 100),
-    (18, "Tennessee Avenue", "PROPERTY", 180, "ORANGE", [14, 70, 200, 550, 750, 950], 100),
-    (19, "New York Avenue", "PROPERTY", 200, "ORANGE", [16, 80, 220, 600, 800, 1000], 100),
-    
-    # Red properties
-    (21, "Kentucky Avenue", "PROPERTY", 220, "RED", [18, 90, 250, 700, 875, 1050], 150),
-    (23, "Indiana Avenue", "PROPERTY", 220, "RED", [18, 90, 250, 700, 875, 1050], 150),
-    (24, "Illinois Avenue", "PROPERTY", 240, "RED", [20, 100, 300, 750, 925, 1100], 150),
-    
-    # Yellow properties
-    (26, "Atlantic Avenue", "PROPERTY", 260, "YELLOW", [22, 110, 330, 800, 975, 1150], 150),
-    (27, "Ventnor Avenue", "PROPERTY", 260, "YELLOW", [22, 110, 330, 800, 975, 1150], 150),
-    (29, "Marvin Gardens", "PROPERTY", 280, "YELLOW", [24, 120, 360, 850, 1025, 1200], 150),
-    
-    # Green properties
-    (31, "Pacific Avenue", "PROPERTY", 300, "GREEN", [26, 130, 390, 900, 1100, 1275], 200),
-    (32, "North Carolina Avenue", "PROPERTY", 300, "GREEN", [26, 130, 390, 900, 1100, 1275], 200),
-    (34, "Pennsylvania Avenue", "PROPERTY", 320, "GREEN", [28, 150, 450, 1000, 1200, 1400], 200),
-    
-    # Dark Blue properties
-    (37, "Park Place", "PROPERTY", 350, "DARK_BLUE", [35, 175, 500, 1100, 1300, 1500], 200),
-    (39, "Boardwalk", "PROPERTY", 400, "DARK_BLUE", [50, 200, 600, 1400, 1700, 2000], 200),
-    
-    # Railroads
-    (5, "Reading Railroad", "RAILROAD", 200, "RAILROAD", [25, 50, 100, 200], None),
-    (15, "Pennsylvania Railroad", "RAILROAD", 200, "RAILROAD", [25, 50, 100, 200], None),
-    (25, "B & O Railroad", "RAILROAD", 200, "RAILROAD", [25, 50, 100, 200], None),
-    (35, "Short Line", "RAILROAD", 200, "RAILROAD", [25, 50, 100, 200], None),
-    
-    # Utilities
-    (12, "Electric Company", "UTILITY", 150, "UTILITY", None, None),
-    (28, "Water Works", "UTILITY", 150, "UTILITY", None, None),
-    
-    # Tax spaces
-    (4, "Income Tax", "TAX", 200, None, None, None),
-    (38, "Luxury Tax", "TAX", 100, None, None, None),
-    
-    # Card spaces
-    (2, "Community Chest", "COMMUNITY_CHEST", None, None, None, None),
-    (17, "Community Chest", "COMMUNITY_CHEST", None, None, None, None),
-    (33, "Community Chest", "COMMUNITY_CHEST", None, None, None, None),
-    (7, "Chance", "CHANCE", None, None, None, None),
-    (22, "Chance", "CHANCE", None, None, None, None),
-    (36, "Chance", "CHANCE", None, None, None, None),
-]
+@dataclass(frozen=True, slots=True)
+class BoardSpace:
+    """Static data for one board space."""
+    name: str
+    type: str
+    cost: int | None = None
+    group: str | None = None
+    rents: tuple[int, ...] | None = None
+    house_cost: int | None = None
+
+
+# Board data, one entry per position 0..BOARD_SIZE-1 so spaces are
+# indexed directly by position.
+# Rents are: (base, 1house, 2houses, 3houses, 4houses, hotel)
+BOARD_SPACES = (
+    BoardSpace("GO", "GO"),  # 0
+    BoardSpace("Mediterranean Avenue", "PROPERTY", 60, "BROWN", (2, 10, 30, 90, 160, 250), 50),  # 1
+    BoardSpace("Community Chest", "COMMUNITY_CHEST"),  # 2
+    BoardSpace("Baltic Avenue", "PROPERTY", 60, "BROWN", (4, 20, 60, 180, 320, 450), 50),  # 3
+    BoardSpace("Income Tax", "TAX", 200),  # 4
+    BoardSpace("Reading Railroad", "RAILROAD", 200, "RAILROAD", (25, 50, 100, 200)),  # 5
+    BoardSpace("Oriental Avenue", "PROPERTY", 100, "LIGHT_BLUE", (6, 30, 90, 270, 400, 550), 50),  # 6
+    BoardSpace("Chance", "CHANCE"),  # 7
+    BoardSpace("Vermont Avenue", "PROPERTY", 100, "LIGHT_BLUE", (6, 30, 90, 270, 400, 550), 50),  # 8
+    BoardSpace("Connecticut Avenue", "PROPERTY", 120, "LIGHT_BLUE", (8, 40, 100, 300, 450, 600), 50),  # 9
+    BoardSpace("Jail/Just Visiting", "JAIL"),  # 10
+    BoardSpace("St. Charles Place", "PROPERTY", 140, "PINK", (10, 50, 150, 450, 625, 750), 100),  # 11
+    BoardSpace("Electric Company", "UTILITY", 150, "UTILITY"),  # 12
+    BoardSpace("States Avenue", "PROPERTY", 140, "PINK", (10, 50, 150, 450, 625, 750), 100),  # 13
+    BoardSpace("Virginia Avenue", "PROPERTY", 160, "PINK", (12, 60, 180, 500, 700, 900), 100),  # 14
+    BoardSpace("Pennsylvania Railroad", "RAILROAD", 200, "RAILROAD", (25, 50, 100, 200)),  # 15
+    BoardSpace("St. James Place", "PROPERTY", 180, "ORANGE", (14, 70, 200, 550, 750, 950), 100),  # 16
+    BoardSpace("Community Chest", "COMMUNITY_CHEST"),  # 17
+    BoardSpace("Tennessee Avenue", "PROPERTY", 180, "ORANGE", (14, 70, 200, 550, 750, 950), 100),  # 18
+    BoardSpace("New York Avenue", "PROPERTY", 200, "ORANGE", (16, 80, 220, 600, 800, 1000), 100),  # 19
+    BoardSpace("Free Parking", "FREE_PARKING"),  # 20
+    BoardSpace("Kentucky Avenue", "PROPERTY", 220, "RED", (18, 90, 250, 700, 875, 1050), 150),  # 21
+    BoardSpace("Chance", "CHANCE"),  # 22
+    BoardSpace("Indiana Avenue", "PROPERTY", 220, "RED", (18, 90, 250, 700, 875, 1050), 150),  # 23
+    BoardSpace("Illinois Avenue", "PROPERTY", 240, "RED", (20, 100, 300, 750, 925, 1100), 150),  # 24
+    BoardSpace("B & O Railroad", "RAILROAD", 200, "RAILROAD", (25, 50, 100, 200)),  # 25
+    BoardSpace("Atlantic Avenue", "PROPERTY", 260, "YELLOW", (22, 110, 330, 800, 975, 1150), 150),  # 26
+    BoardSpace("Ventnor Avenue", "PROPERTY", 260, "YELLOW", (22, 110, 330, 800, 975, 1150), 150),  # 27
+    BoardSpace("Water Works", "UTILITY", 150, "UTILITY"),  # 28
+    BoardSpace("Marvin Gardens", "PROPERTY", 280, "YELLOW", (24, 120, 360, 850, 1025, 1200), 150),  # 29
+    BoardSpace("Go To Jail", "GO_TO_JAIL"),  # 30
+    BoardSpace("Pacific Avenue", "PROPERTY", 300, "GREEN", (26, 130, 390, 900, 1100, 1275), 200),  # 31
+    BoardSpace("North Carolina Avenue", "PROPERTY", 300, "GREEN", (26, 130, 390, 900, 1100, 1275), 200),  # 32
+    BoardSpace("Community Chest", "COMMUNITY_CHEST"),  # 33
+    BoardSpace("Pennsylvania Avenue", "PROPERTY", 320, "GREEN", (28, 150, 450, 1000, 1200, 1400), 200),  # 34
+    BoardSpace("Short Line", "RAILROAD", 200, "RAILROAD", (25, 50, 100, 200)),  # 35
+    BoardSpace("Chance", "CHANCE"),  # 36
+    BoardSpace("Park Place", "PROPERTY", 350, "DARK_BLUE", (35, 175, 500, 1100, 1300, 1500), 200),  # 37
+    BoardSpace("Luxury Tax", "TAX", 100),  # 38
+    BoardSpace("Boardwalk", "PROPERTY", 400, "DARK_BLUE", (50, 200, 600, 1400, 1700, 2000), 200),  # 39
+)
+
+
+def space_at(position: int | None) -> BoardSpace | None:
+    """Get the board space at a position, or None for an invalid position."""
+    if isinstance(position, int) and 0 <= position < BOARD_SIZE:
+        return BOARD_SPACES[position]
+    return None
 
-# Create lookup dictionaries for easy access
-BOARD_SPACES = {pos: {
-    "name": name,
-    "type": space_type,
-    "cost": cost,
-    "group": group,
-    "rents": rents,
-    "house_cost": house_cost
-} for pos, name, space_type, cost, group, rents, house_cost in PROPERTIES}
 
 # Utility rent multipliers
 UTILITY_MULTIPLIERS = {
@@ -72,6 +72,7 @@ class MessageType(str, Enum):
     CONNECT = "CONNECT"
     DISCONNECT = "DISCONNECT"
     RECONNECT = "RECONNECT"
+    BATCH = "BATCH"
     
     # Lobby
     CREATE_GAME = "CREATE_GAME"
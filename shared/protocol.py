@@ -4,24 +4,64 @@ Message protocol for client-server communication.
 All messages are JSON objects with a "type" field and optional "data" field.
 """
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from shared.enums import MessageType
 
 
-@dataclass
+# Wire value -> member, looked up directly for every incoming message
+# instead of going through the Enum constructor
+_MESSAGE_TYPES: dict[str, MessageType] = {member.value: member for member in MessageType}
+
+
+def encode_json(obj: Any) -> str:
+    """
+    Encode an object as compact JSON.
+    
+    Uses orjson when it is installed; the stdlib fallback is configured
+    to produce the same output.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def encode_json_bytes(obj: Any) -> bytes:
+    """Encode an object as compact JSON in UTF-8, skipping the str step."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def decode_json(raw: str | bytes) -> Any:
+    """Decode a JSON document, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+@dataclass(slots=True)
 class Message:
     """Base message structure for all client-server communication."""
     type: MessageType
     data: dict[str, Any] = field(default_factory=dict)
     request_id: str | None = None  # Optional, for matching requests to responses
     
+    # Serializers read type._value_ directly: Enum.value goes through a
+    # descriptor that costs several times as much as the plain attribute
+    
     def to_json(self) -> str:
         """Serialize message to JSON string."""
-        return json.dumps({
-            "type": self.type.value,
+        return encode_json({
+            "type": self.type._value_,
             "data": self.data,
             "request_id": self.request_id,
         })
@@ -29,28 +69,38 @@ class Message:
     def to_dict(self) -> dict:
         """Convert to dictionary."""
         return {
-            "type": self.type.value,
+            "type": self.type._value_,
             "data": self.data,
             "request_id": self.request_id,
         }
     
     @classmethod
-    def from_json(cls, json_str: str) -> "Message":
-        """Deserialize message from JSON string."""
-        raw = json.loads(json_str)
+    def from_json(cls, json_str: str | bytes) -> "Message":
+        """Deserialize message from a JSON string or UTF-8 bytes."""
+        raw = decode_json(json_str)
         return cls.from_dict(raw)
     
     @classmethod
     def from_dict(cls, raw: dict) -> "Message":
-        """Create message from dictionary."""
+        """
+        Create message from dictionary.
+        
+        Called on Message itself, this builds the subclass registered for
+        the message type (see _MESSAGE_CLASSES), or Message if there's none.
+        """
+        message_type = _MESSAGE_TYPES.get(raw["type"])
+        if message_type is None:
+            raise ValueError(f"{raw['type']!r} is not a valid MessageType")
+        if cls is Message:
+            cls = _MESSAGE_CLASSES.get(message_type, Message)
         return cls(
-            type=MessageType(raw["type"]),
+            type=message_type,
             data=raw.get("data", {}),
             request_id=raw.get("request_id"),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ErrorMessage(Message):
     """Error response message."""
     type: MessageType = MessageType.ERROR
@@ -62,13 +112,43 @@ class ErrorMessage(Message):
             data={"message": message, "code": code},
             request_id=request_id,
         )
+    
+    def to_json(self) -> str:
+        """Serialize message to JSON string, reusing the encoded error when possible."""
+        data = self.data
+        if tuple(data) != ("message", "code"):
+            return Message.to_json(self)
+        return (
+            f'{{"type":"{MessageType.ERROR._value_}","data":'
+            f'{_error_data_json(data["message"], data["code"])},'
+            f'"request_id":{encode_json(self.request_id)}}}'
+        )
+    
+    @classmethod
+    def json_for(cls, message: str, code: str = "ERROR") -> str:
+        """
+        Serialize an error straight into its wire format.
+        
+        Produces the same JSON as create(message, code).to_json() without
+        building the message object and its data dict.
+        """
+        return (
+            f'{{"type":"{MessageType.ERROR._value_}","data":{_error_data_json(message, code)},'
+            f'"request_id":null}}'
+        )
+
+
+@lru_cache(maxsize=64)
+def _error_data_json(message: str, code: str) -> str:
+    """Encode an error's data object; the common errors repeat constantly."""
+    return encode_json({"message": message, "code": code})
 
 
 # =============================================================================
 # Lobby Messages (Client -> Server)
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class ListGamesRequest(Message):
     """Request list of available games."""
     type: MessageType = MessageType.LIST_GAMES
@@ -81,7 +161,7 @@ class ListGamesRequest(Message):
         return cls(data=data, request_id=request_id)
 
 
-@dataclass
+@dataclass(slots=True)
 class CreateGameRequest(Message):
     """Request to create a new game."""
     type: MessageType = MessageType.CREATE_GAME
@@ -104,7 +184,7 @@ class CreateGameRequest(Message):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class JoinGameRequest(Message):
     """Request to join an existing game."""
     type: MessageType = MessageType.JOIN_GAME
@@ -125,7 +205,7 @@ class JoinGameRequest(Message):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class LeaveGameRequest(Message):
     """Request to leave current game."""
     type: MessageType = MessageType.LEAVE_GAME
@@ -135,7 +215,7 @@ class LeaveGameRequest(Message):
         return cls(request_id=request_id)
 
 
-@dataclass
+@dataclass(slots=True)
 class StartGameRequest(Message):
     """Request to start the game (host only)."""
     type: MessageType = MessageType.START_GAME
@@ -149,7 +229,7 @@ class StartGameRequest(Message):
 # Game Action Messages (Client -> Server)
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class RollDiceRequest(Message):
     """Request to roll dice."""
     type: MessageType = MessageType.ROLL_DICE
@@ -159,7 +239,7 @@ class RollDiceRequest(Message):
         return cls(request_id=request_id)
 
 
-@dataclass
+@dataclass(slots=True)
 class BuyPropertyRequest(Message):
     """Request to buy the property player is standing on."""
     type: MessageType = MessageType.BUY_PROPERTY
@@ -169,7 +249,7 @@ class BuyPropertyRequest(Message):
         return cls(request_id=request_id)
 
 
-@dataclass
+@dataclass(slots=True)
 class DeclinePropertyRequest(Message):
     """Request to decline buying property."""
     type: MessageType = MessageType.DECLINE_PROPERTY
@@ -179,7 +259,7 @@ class DeclinePropertyRequest(Message):
         return cls(request_id=request_id)
 
 
-@dataclass
+@dataclass(slots=True)
 class BuildHouseRequest(Message):
     """Request to build a house on a property."""
     type: MessageType = MessageType.BUILD_HOUSE
@@ -189,7 +269,7 @@ class BuildHouseRequest(Message):
         return cls(data={"position": position}, request_id=request_id)
 
 
-@dataclass
+@dataclass(slots=True)
 class BuildHotelRequest(Message):
     """Request to build a hotel on a property."""
     type: MessageType = MessageType.BUILD_HOTEL
@@ -199,7 +279,7 @@ class BuildHotelRequest(Message):
         return cls(data={"position": position}, request_id=request_id)
 
 
-@dataclass
+@dataclass(slots=True)
 class SellBuildingRequest(Message):
     """Request to sell a building from a property."""
     type: MessageType = MessageType.SELL_BUILDING
@@ -209,7 +289,7 @@ class SellBuildingRequest(Message):
         return cls(data={"position": position}, request_id=request_id)
 
 
-@dataclass
+@dataclass(slots=True)
 class MortgagePropertyRequest(Message):
     """Request to mortgage a property."""
     type: MessageType = MessageType.MORTGAGE_PROPERTY
@@ -219,7 +299,7 @@ class MortgagePropertyRequest(Message):
         return cls(data={"position": position}, request_id=request_id)
 
 
-@dataclass
+@dataclass(slots=True)
 class UnmortgagePropertyRequest(Message):
     """Request to unmortgage a property."""
     type: MessageType = MessageType.UNMORTGAGE_PROPERTY
@@ -229,7 +309,7 @@ class UnmortgagePropertyRequest(Message):
         return cls(data={"position": position}, request_id=request_id)
 
 
-@dataclass
+@dataclass(slots=True)
 class PayBailRequest(Message):
     """Request to pay bail to get out of jail."""
     type: MessageType = MessageType.PAY_BAIL
@@ -239,7 +319,7 @@ class PayBailRequest(Message):
         return cls(request_id=request_id)
 
 
-@dataclass
+@dataclass(slots=True)
 class UseJailCardRequest(Message):
     """Request to use Get Out of Jail Free card."""
     type: MessageType = MessageType.USE_JAIL_CARD
@@ -249,7 +329,7 @@ class UseJailCardRequest(Message):
         return cls(request_id=request_id)
 
 
-@dataclass
+@dataclass(slots=True)
 class EndTurnRequest(Message):
     """Request to end current turn."""
     type: MessageType = MessageType.END_TURN
@@ -259,7 +339,7 @@ class EndTurnRequest(Message):
         return cls(request_id=request_id)
 
 
-@dataclass
+@dataclass(slots=True)
 class DeclareBankruptcyRequest(Message):
     """Request to declare bankruptcy."""
     type: MessageType = MessageType.PLAYER_BANKRUPT
@@ -276,17 +356,35 @@ class DeclareBankruptcyRequest(Message):
 # Server Response/Broadcast Messages (Server -> Client)
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class GameListResponse(Message):
     """Response containing list of available games."""
     type: MessageType = MessageType.GAME_LIST
     
+    # The games list already encoded as a JSON array; to_json splices it
+    # in rather than encoding data["games"] again
+    games_json: str | None = field(default=None, repr=False, compare=False)
+    
     @classmethod
-    def create(cls, games: list[dict], request_id: str | None = None) -> "GameListResponse":
-        return cls(data={"games": games}, request_id=request_id)
+    def create(
+        cls,
+        games: list[dict],
+        request_id: str | None = None,
+        games_json: str | None = None
+    ) -> "GameListResponse":
+        return cls(data={"games": games}, request_id=request_id, games_json=games_json)
+    
+    def to_json(self) -> str:
+        """Serialize message to JSON string, reusing games_json when set."""
+        if self.games_json is None:
+            return Message.to_json(self)
+        return (
+            f'{{"type":"{MessageType.GAME_LIST._value_}","data":{{"games":{self.games_json}}},'
+            f'"request_id":{encode_json(self.request_id)}}}'
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class GameStateMessage(Message):
     """Full game state broadcast to all players."""
     type: MessageType = MessageType.GAME_STATE
@@ -294,9 +392,35 @@ class GameStateMessage(Message):
     @classmethod
     def create(cls, game_state: dict, request_id: str | None = None) -> "GameStateMessage":
         return cls(data=game_state, request_id=request_id)
+    
+    @classmethod
+    def json_from_parts(
+        cls,
+        public_json: str,
+        overlay: dict,
+        request_id: str | None = None
+    ) -> str:
+        """
+        Build the serialized message from pre-encoded shared state.
+        
+        public_json must be a JSON object and overlay must not repeat any
+        of its keys. Produces the same JSON as
+        create({**public, **overlay}, request_id).to_json(), but only the
+        small per-player overlay is encoded on each call.
+        """
+        if not overlay:
+            data_json = public_json
+        elif public_json == "{}":
+            data_json = encode_json(overlay)
+        else:
+            data_json = f"{public_json[:-1]},{encode_json(overlay)[1:]}"
+        return (
+            f'{{"type":"{MessageType.GAME_STATE._value_}","data":{data_json},'
+            f'"request_id":{encode_json(request_id)}}}'
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class GameStartedMessage(Message):
     """Broadcast when game starts."""
     type: MessageType = MessageType.GAME_STARTED
@@ -306,7 +430,7 @@ class GameStartedMessage(Message):
         return cls(data=game_state)
 
 
-@dataclass
+@dataclass(slots=True)
 class DiceRolledMessage(Message):
     """Broadcast when dice are rolled."""
     type: MessageType = MessageType.DICE_ROLLED
@@ -333,7 +457,7 @@ class DiceRolledMessage(Message):
         })
 
 
-@dataclass
+@dataclass(slots=True)
 class PropertyBoughtMessage(Message):
     """Broadcast when property is purchased."""
     type: MessageType = MessageType.PROPERTY_BOUGHT
@@ -356,7 +480,7 @@ class PropertyBoughtMessage(Message):
         })
 
 
-@dataclass
+@dataclass(slots=True)
 class BuildingChangedMessage(Message):
     """Broadcast when buildings are built or sold."""
     type: MessageType = MessageType.BUILDING_CHANGED
@@ -383,7 +507,7 @@ class BuildingChangedMessage(Message):
         })
 
 
-@dataclass
+@dataclass(slots=True)
 class PropertyMortgagedMessage(Message):
     """Broadcast when property is mortgaged or unmortgaged."""
     type: MessageType = MessageType.PROPERTY_MORTGAGED
@@ -408,7 +532,7 @@ class PropertyMortgagedMessage(Message):
         })
 
 
-@dataclass
+@dataclass(slots=True)
 class RentPaidMessage(Message):
     """Broadcast when rent is paid."""
     type: MessageType = MessageType.RENT_PAID
@@ -433,7 +557,7 @@ class RentPaidMessage(Message):
         })
 
 
-@dataclass
+@dataclass(slots=True)
 class TurnEndedMessage(Message):
     """Broadcast when a turn ends."""
     type: MessageType = MessageType.TURN_ENDED
@@ -456,7 +580,7 @@ class TurnEndedMessage(Message):
         })
 
 
-@dataclass
+@dataclass(slots=True)
 class JailStatusMessage(Message):
     """Broadcast when player's jail status changes."""
     type: MessageType = MessageType.JAIL_STATUS
@@ -477,7 +601,7 @@ class JailStatusMessage(Message):
         })
 
 
-@dataclass
+@dataclass(slots=True)
 class CardDrawnMessage(Message):
     """Broadcast when a card is drawn."""
     type: MessageType = MessageType.CARD_DRAWN
@@ -500,7 +624,7 @@ class CardDrawnMessage(Message):
         })
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerBankruptMessage(Message):
     """Broadcast when a player goes bankrupt."""
     type: MessageType = MessageType.PLAYER_BANKRUPT
@@ -521,7 +645,7 @@ class PlayerBankruptMessage(Message):
         })
 
 
-@dataclass
+@dataclass(slots=True)
 class GameWonMessage(Message):
     """Broadcast when the game is won."""
     type: MessageType = MessageType.GAME_WON
@@ -557,7 +681,7 @@ class PlayerJoinedMessage(Message):
         })
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerLeftMessage(Message):
     """Broadcast when a player leaves the game."""
     type: MessageType = MessageType.LEAVE_GAME
@@ -574,7 +698,7 @@ class PlayerLeftMessage(Message):
         })
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerKickedMessage(Message):
     """Broadcast when a player is kicked from the game."""
     type: MessageType = MessageType.KICK_PLAYER
@@ -593,7 +717,7 @@ class PlayerKickedMessage(Message):
         })
 
 
-@dataclass
+@dataclass(slots=True)
 class HostTransferredMessage(Message):
     """Broadcast when host privileges are transferred."""
     type: MessageType = MessageType.TRANSFER_HOST
@@ -612,7 +736,7 @@ class HostTransferredMessage(Message):
         })
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerDisconnectedMessage(Message):
     """Broadcast when a player disconnects."""
     type: MessageType = MessageType.DISCONNECT
@@ -629,7 +753,7 @@ class PlayerDisconnectedMessage(Message):
         })
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerReconnectedMessage(Message):
     """Broadcast when a player reconnects."""
     type: MessageType = MessageType.RECONNECT
@@ -646,11 +770,29 @@ class PlayerReconnectedMessage(Message):
         })
 
 
+@dataclass(slots=True)
+class BatchMessage(Message):
+    """Several server messages delivered in a single frame."""
+    type: MessageType = MessageType.BATCH
+    
+    @classmethod
+    def json_from_frames(cls, frames: list[str]) -> str:
+        """
+        Wrap already-serialized messages into one BATCH message.
+        
+        data["messages"] holds the original messages in send order.
+        """
+        return (
+            f'{{"type":"{MessageType.BATCH._value_}","data":{{"messages":[{",".join(frames)}]}},'
+            f'"request_id":null}}'
+        )
+
+
 # =============================================================================
 # Game Settings
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GameSettings:
     """Settings for a game, configured by the host."""
     allow_spectators: bool = False
@@ -659,7 +801,12 @@ class GameSettings:
     max_players: int = 4
     
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "allow_spectators": self.allow_spectators,
+            "starting_money": self.starting_money,
+            "salary_amount": self.salary_amount,
+            "max_players": self.max_players,
+        }
     
     @classmethod
     def from_dict(cls, data: dict) -> "GameSettings":
@@ -675,11 +822,34 @@ class GameSettings:
 # Helper function for parsing incoming messages
 # =============================================================================
 
-def parse_message(json_str: str) -> Message:
+def _message_classes() -> dict[MessageType, type[Message]]:
+    """
+    Map each message type to the one Message subclass declared for it.
+    
+    Types shared by a request and its broadcast (e.g. JOIN_GAME) are left
+    out, since the wire format doesn't say which of the two was meant.
+    """
+    classes: dict[MessageType, list[type[Message]]] = {}
+    pending = list(Message.__subclasses__())
+    while pending:
+        subclass = pending.pop()
+        pending.extend(subclass.__subclasses__())
+        classes.setdefault(subclass.__dataclass_fields__["type"].default, []).append(subclass)
+    return {
+        message_type: candidates[0]
+        for message_type, candidates in classes.items()
+        if len(candidates) == 1
+    }
+
+
+_MESSAGE_CLASSES = _message_classes()
+
+
+def parse_message(json_str: str | bytes) -> Message:
     """
-    Parse a JSON string into the appropriate Message subclass.
+    Parse a JSON string (or UTF-8 bytes) into the appropriate Message subclass.
     
-    For now, returns base Message class. The message handler will
-    use the type field to determine how to process it.
+    Types without a subclass of their own come back as a plain Message;
+    the message handler routes on the type field either way.
     """
     return Message.from_json(json_str)
@@ -17,13 +17,52 @@ import argparse
 from typing import Optional
 
 import websockets
-from websockets.client import WebSocketClientProtocol
+from websockets.asyncio.client import ClientConnection, connect
+
+try:
+    import uvloop
+except ImportError:  # Not available on Windows
+    uvloop = None
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from shared.enums import MessageType
-from shared.constants import BOARD_SPACES
+from shared.enums import MessageType, PlayerState
+from shared.protocol import Message, decode_json, encode_json
+from shared.constants import space_at
+
+# Message type values, bound once rather than looked up on every use
+_BUY_PROPERTY = MessageType.BUY_PROPERTY.value
+_CONNECT = MessageType.CONNECT.value
+_CREATE_GAME = MessageType.CREATE_GAME.value
+_DECLINE_PROPERTY = MessageType.DECLINE_PROPERTY.value
+_DISCONNECT = MessageType.DISCONNECT.value
+_END_TURN = MessageType.END_TURN.value
+_ERROR = MessageType.ERROR.value
+_GAME_STATE = MessageType.GAME_STATE.value
+_JOIN_GAME = MessageType.JOIN_GAME.value
+_LEAVE_GAME = MessageType.LEAVE_GAME.value
+_LIST_GAMES = MessageType.LIST_GAMES.value
+_PAY_BAIL = MessageType.PAY_BAIL.value
+_RECONNECT = MessageType.RECONNECT.value
+_ROLL_DICE = MessageType.ROLL_DICE.value
+_START_GAME = MessageType.START_GAME.value
+
+_BANKRUPT = PlayerState.BANKRUPT.value
+_IN_JAIL = PlayerState.IN_JAIL.value
+
+# Hosts where permessage-deflate costs more CPU than the bandwidth it saves
+_LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+# Commands that send a bare request and show the new state:
+# command -> (message type, success text, failure text)
+_ACTION_COMMANDS = {
+    "start": (_START_GAME, "✓ Game started!", "✗ Failed to start"),
+    "buy": (_BUY_PROPERTY, "✓ Property purchased!", "✗ Failed to buy"),
+    "decline": (_DECLINE_PROPERTY, "✓ Declined property", "✗ Failed"),
+    "end": (_END_TURN, "✓ Turn ended", "✗ Failed to end turn"),
+    "bail": (_PAY_BAIL, "✓ Paid bail", "✗ Failed"),
+}
 
 
 class TerminalClient:
@@ -34,10 +73,20 @@ class TerminalClient:
         self.port = port
         self.player_name = player_name
         self.player_id = str(uuid.uuid4())
-        self.websocket: Optional[WebSocketClientProtocol] = None
+        self.websocket: Optional[ClientConnection] = None
         self.game_id: Optional[str] = None
         self.game_state: Optional[dict] = None
         self.running = True
+        # Request ids only need to be unique on this connection
+        self._next_request_id = 1
+        # request_id -> future resolved by the broadcast listener
+        self._pending: dict[str, asyncio.Future] = {}
+        # Broadcast output is dropped when stdout isn't a terminal, and
+        # otherwise collected and written out together (see _notify)
+        self._quiet = not sys.stdout.isatty()
+        self._notices: list[str] = []
+        # Bytes read from stdin that don't yet make up a full line
+        self._stdin_buffer = b""
     
     @property
     def server_url(self) -> str:
@@ -47,27 +96,28 @@ class TerminalClient:
         """Connect to the server."""
         try:
             print(f"Connecting to {self.server_url}...")
-            self.websocket = await websockets.connect(
+            self.websocket = await connect(
                 self.server_url,
                 ping_interval=30,
                 ping_timeout=10,
+                compression=None if self.host in _LOCAL_HOSTS else "deflate",
             )
             
             # Send CONNECT message
             connect_msg = {
-                "type": MessageType.CONNECT.value,
+                "type": _CONNECT,
                 "data": {
                     "player_id": self.player_id,
                     "player_name": self.player_name,
                 }
             }
-            await self.websocket.send(json.dumps(connect_msg))
+            await self.websocket.send(encode_json(connect_msg))
             
             # Wait for response
             response = await asyncio.wait_for(self.websocket.recv(), timeout=10.0)
-            data = json.loads(response)
+            data = decode_json(response)
             
-            if data.get("type") == MessageType.CONNECT.value and data.get("data", {}).get("success"):
+            if data.get("type") == _CONNECT and data.get("data", {}).get("success"):
                 print(f"✓ Connected as {self.player_name} (ID: {self.player_id[:8]}...)")
                 reconnected = data.get("data", {}).get("reconnected_to_game")
                 if reconnected:
@@ -84,50 +134,59 @@ class TerminalClient:
     
     async def send_and_receive(self, msg_type: str, data: dict = None) -> dict:
         """Send a message and wait for response."""
-        request_id = str(uuid.uuid4())
-        message = {
-            "type": msg_type,
-            "request_id": request_id,
-            "data": data or {}
-        }
+        request_id = str(self._next_request_id)
+        self._next_request_id += 1
         
-        await self.websocket.send(json.dumps(message))
+        # The broadcast listener is the only reader of the socket; it hands
+        # our response over through this future
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            request = Message(MessageType(msg_type), data or {}, request_id)
+            await self.websocket.send(request.to_json())
+            return await asyncio.wait_for(future, timeout=30.0)
+        finally:
+            self._pending.pop(request_id, None)
+    
+    def _notify(self, text: str) -> None:
+        """
+        Queue a line of broadcast output.
         
-        # Wait for response with matching request_id or relevant message
-        while True:
-            response = await asyncio.wait_for(self.websocket.recv(), timeout=30.0)
-            resp_data = json.loads(response)
-            
-            # Check if it's our response
-            if resp_data.get("request_id") == request_id:
-                return resp_data
-            
-            # Handle broadcasts/state updates
-            if resp_data.get("type") == MessageType.GAME_STATE.value:
-                self.game_state = resp_data.get("data")
-                self.game_id = self.game_state.get("game_id")
-                return resp_data
-            
-            # Print other messages
-            self._print_message(resp_data)
+        Lines are written in one go 100ms after the first one arrives, so
+        a burst of broadcasts costs one terminal write instead of one each.
+        """
+        if self._quiet:
+            return
+        if not self._notices:
+            asyncio.get_running_loop().call_later(0.1, self._flush_notices)
+        self._notices.append(text)
+    
+    def _flush_notices(self) -> None:
+        """Write out the lines queued by _notify."""
+        sys.stdout.write("\n".join(self._notices) + "\n")
+        sys.stdout.flush()
+        self._notices.clear()
     
     def _print_message(self, data: dict) -> None:
         """Print a received message nicely."""
+        if self._quiet:
+            return
+        
         msg_type = data.get("type", "unknown")
         msg_data = data.get("data", {})
         
-        if msg_type == MessageType.PLAYER_JOINED.value:
-            print(f"  → Player joined: {msg_data.get('player_name')}")
-        elif msg_type == MessageType.PLAYER_LEFT.value:
-            print(f"  → Player left: {msg_data.get('player_name')}")
-        elif msg_type == MessageType.PLAYER_DISCONNECTED.value:
-            print(f"  → Player disconnected: {msg_data.get('player_name')}")
-        elif msg_type == MessageType.PLAYER_RECONNECTED.value:
-            print(f"  → Player reconnected: {msg_data.get('player_name')}")
-        elif msg_type == MessageType.ERROR.value:
-            print(f"  ✗ Error: {msg_data.get('message')} ({msg_data.get('code')})")
+        if msg_type == _JOIN_GAME:
+            self._notify(f"  → Player joined: {msg_data.get('player_name')}")
+        elif msg_type == _LEAVE_GAME:
+            self._notify(f"  → Player left: {msg_data.get('player_name')}")
+        elif msg_type == _DISCONNECT:
+            self._notify(f"  → Player disconnected: {msg_data.get('player_name')}")
+        elif msg_type == _RECONNECT:
+            self._notify(f"  → Player reconnected: {msg_data.get('player_name')}")
+        elif msg_type == _ERROR:
+            self._notify(f"  ✗ Error: {msg_data.get('message')} ({msg_data.get('code')})")
         else:
-            print(f"  → {msg_type}: {json.dumps(msg_data, indent=2)[:200]}")
+            self._notify(f"  → {msg_type}: {json.dumps(msg_data, indent=2)[:200]}")
     
     def _print_game_state(self) -> None:
         """Print current game state nicely."""
@@ -139,27 +198,33 @@ class TerminalClient:
         print(f"Game: {self.game_state.get('game_name', 'Unknown')} ({self.game_id})")
         print(f"Status: {self.game_state.get('status', 'unknown')}")
         
-        players = self.game_state.get('players', [])
-        current_idx = self.game_state.get('current_player_index', 0)
+        # players and current_player_id, and each player's id/name/money/
+        # position/state/properties, are always in the state
+        players = self.game_state['players']
+        current_id = self.game_state['current_player_id']
         
         print(f"\nPlayers ({len(players)}):")
-        for i, p in enumerate(players):
-            marker = "→ " if i == current_idx else "  "
-            pos = p.get('position', 0)
-            space_name = BOARD_SPACES.get(pos, {}).get('name', f'Space {pos}')
-            jail_str = " [IN JAIL]" if p.get('is_in_jail') else ""
-            bankrupt_str = " [BANKRUPT]" if p.get('is_bankrupt') else ""
-            print(f"{marker}{p.get('name', '?')}: ${p.get('money', 0)} at {space_name} (pos {pos}){jail_str}{bankrupt_str}")
+        for p in players:
+            marker = "→ " if p['id'] == current_id else "  "
+            pos = p['position']
+            space = space_at(pos)
+            space_name = space.name if space else f'Space {pos}'
+            jail_str = " [IN JAIL]" if p['state'] == _IN_JAIL else ""
+            bankrupt_str = " [BANKRUPT]" if p['state'] == _BANKRUPT else ""
+            print(f"{marker}{p['name']}: ${p['money']} at {space_name} (pos {pos}){jail_str}{bankrupt_str}")
         
         # Show properties owned by current player
-        my_player = next((p for p in players if p.get('id') == self.player_id), None)
+        my_player = next((p for p in players if p['id'] == self.player_id), None)
         if my_player:
-            props = my_player.get('properties', [])
+            props = my_player['properties']
             if props:
                 print(f"\nYour properties:")
                 for pos in props:
-                    space = BOARD_SPACES.get(pos, {})
-                    print(f"  - {space.get('name', f'Position {pos}')} ({space.get('group', 'N/A')})")
+                    space = space_at(pos)
+                    if space:
+                        print(f"  - {space.name} ({space.group or 'N/A'})")
+                    else:
+                        print(f"  - Position {pos} (N/A)")
         
         turn_state = self.game_state.get('turn_state', {})
         if turn_state:
@@ -197,9 +262,7 @@ class TerminalClient:
         try:
             while self.running:
                 try:
-                    cmd = await asyncio.get_event_loop().run_in_executor(
-                        None, lambda: input(f"[{self.player_name}]> ").strip()
-                    )
+                    cmd = await self._read_command(f"[{self.player_name}]> ")
                 except EOFError:
                     break
                 
@@ -219,40 +282,98 @@ class TerminalClient:
             except asyncio.CancelledError:
                 pass
     
+    async def _read_command(self, prompt: str) -> str:
+        """
+        Read one line from stdin, waiting on the event loop rather than
+        an executor thread.
+        
+        Falls back to input() on a worker thread where stdin can't be
+        watched by the loop (Windows, or stdin redirected from a file).
+        
+        Raises:
+            EOFError: At end of input
+        """
+        loop = asyncio.get_running_loop()
+        fd = sys.stdin.fileno()
+        print(prompt, end="", flush=True)
+        
+        while b"\n" not in self._stdin_buffer:
+            ready = loop.create_future()
+            try:
+                loop.add_reader(fd, lambda: ready.done() or ready.set_result(None))
+            except (NotImplementedError, OSError):
+                line = await loop.run_in_executor(None, input)
+                return line.strip()
+            try:
+                await ready
+            finally:
+                loop.remove_reader(fd)
+            
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                if not self._stdin_buffer:
+                    raise EOFError
+                break
+            self._stdin_buffer += chunk
+        
+        line, _, self._stdin_buffer = self._stdin_buffer.partition(b"\n")
+        return line.decode(errors="replace").strip()
+    
     async def _listen_for_broadcasts(self) -> None:
-        """Background task to listen for server broadcasts."""
+        """
+        Background task that reads every server message.
+        
+        Blocks on the socket with no polling timeout; responses are passed
+        to the waiting send_and_receive call, everything else is printed.
+        """
+        pending = self._pending
         try:
-            while self.running:
-                try:
-                    message = await asyncio.wait_for(self.websocket.recv(), timeout=0.5)
-                    data = json.loads(message)
-                    
-                    if data.get("type") == MessageType.GAME_STATE.value:
-                        self.game_state = data.get("data")
-                        self.game_id = self.game_state.get("game_id")
-                        print("\n  [Game state updated]")
-                    else:
-                        self._print_message(data)
-                        
-                except asyncio.TimeoutError:
-                    continue
-                except websockets.ConnectionClosed:
-                    print("\n  [Connection closed by server]")
-                    self.running = False
-                    break
-        except asyncio.CancelledError:
+            async for message in self.websocket:
+                data = decode_json(message)
+                is_state = data.get("type") == _GAME_STATE
+                if is_state:
+                    self.game_state = data.get("data")
+                    self.game_id = self.game_state.get("game_id")
+                
+                future = pending.get(data.get("request_id"))
+                if future is not None and not future.done():
+                    future.set_result(data)
+                elif is_state:
+                    self._notify("\n  [Game state updated]")
+                else:
+                    self._print_message(data)
+        except websockets.ConnectionClosed:
             pass
+        except asyncio.CancelledError:
+            return
+        
+        if self.running:
+            print("\n  [Connection closed by server]")
+            self.running = False
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Connection closed"))
     
     async def _handle_command(self, command: str, arg: Optional[str]) -> None:
         """Handle a user command."""
         try:
-            if command == "quit":
+            action = _ACTION_COMMANDS.get(command)
+            if action is not None:
+                msg_type, done, failed = action
+                response = await self.send_and_receive(msg_type)
+                if response.get("type") == _GAME_STATE:
+                    print(done)
+                    self._print_game_state()
+                else:
+                    print(f"{failed}: {response}")
+                    
+            elif command == "quit":
                 self.running = False
                 await self.websocket.close()
                 print("Disconnected.")
                 
             elif command == "list":
-                response = await self.send_and_receive(MessageType.LIST_GAMES.value)
+                response = await self.send_and_receive(_LIST_GAMES)
                 games = response.get("data", {}).get("games", [])
                 if games:
                     print("\nAvailable games:")
@@ -264,10 +385,10 @@ class TerminalClient:
             elif command == "create":
                 name = arg or f"{self.player_name}'s Game"
                 response = await self.send_and_receive(
-                    MessageType.CREATE_GAME.value,
+                    _CREATE_GAME,
                     {"game_name": name, "player_name": self.player_name}
                 )
-                if response.get("type") == MessageType.GAME_STATE.value:
+                if response.get("type") == _GAME_STATE:
                     print(f"✓ Created game: {name}")
                     self._print_game_state()
                 else:
@@ -278,17 +399,17 @@ class TerminalClient:
                     print("Usage: join <game_id>")
                     return
                 response = await self.send_and_receive(
-                    MessageType.JOIN_GAME.value,
+                    _JOIN_GAME,
                     {"game_id": arg, "player_name": self.player_name}
                 )
-                if response.get("type") == MessageType.GAME_STATE.value:
+                if response.get("type") == _GAME_STATE:
                     print(f"✓ Joined game")
                     self._print_game_state()
                 else:
                     print(f"✗ Failed to join game: {response}")
                     
             elif command == "leave":
-                response = await self.send_and_receive(MessageType.LEAVE_GAME.value)
+                response = await self.send_and_receive(_LEAVE_GAME)
                 if response.get("data", {}).get("success"):
                     print("✓ Left game")
                     self.game_id = None
@@ -296,58 +417,18 @@ class TerminalClient:
                 else:
                     print(f"✗ Failed to leave: {response}")
                     
-            elif command == "start":
-                response = await self.send_and_receive(MessageType.START_GAME.value)
-                if response.get("type") == MessageType.GAME_STATE.value:
-                    print("✓ Game started!")
-                    self._print_game_state()
-                else:
-                    print(f"✗ Failed to start: {response}")
-                    
             elif command == "roll":
-                response = await self.send_and_receive(MessageType.ROLL_DICE.value)
-                if response.get("type") == MessageType.GAME_STATE.value:
+                response = await self.send_and_receive(_ROLL_DICE)
+                if response.get("type") == _GAME_STATE:
                     dice = response.get("data", {}).get("turn_state", {}).get("dice_roll", [])
                     print(f"✓ Rolled: {dice} (total: {sum(dice) if dice else 0})")
                     self._print_game_state()
                 else:
                     print(f"✗ Failed to roll: {response}")
                     
-            elif command == "buy":
-                response = await self.send_and_receive(MessageType.BUY_PROPERTY.value)
-                if response.get("type") == MessageType.GAME_STATE.value:
-                    print("✓ Property purchased!")
-                    self._print_game_state()
-                else:
-                    print(f"✗ Failed to buy: {response}")
-                    
-            elif command == "decline":
-                response = await self.send_and_receive(MessageType.DECLINE_PROPERTY.value)
-                if response.get("type") == MessageType.GAME_STATE.value:
-                    print("✓ Declined property")
-                    self._print_game_state()
-                else:
-                    print(f"✗ Failed: {response}")
-                    
-            elif command == "end":
-                response = await self.send_and_receive(MessageType.END_TURN.value)
-                if response.get("type") == MessageType.GAME_STATE.value:
-                    print("✓ Turn ended")
-                    self._print_game_state()
-                else:
-                    print(f"✗ Failed to end turn: {response}")
-                    
             elif command == "state":
                 self._print_game_state()
                 
-            elif command == "bail":
-                response = await self.send_and_receive(MessageType.PAY_BAIL.value)
-                if response.get("type") == MessageType.GAME_STATE.value:
-                    print("✓ Paid bail")
-                    self._print_game_state()
-                else:
-                    print(f"✗ Failed: {response}")
-                    
             else:
                 print(f"Unknown command: {command}")
                 
@@ -358,6 +439,10 @@ class TerminalClient:
 
 
 async def main():
+    # Run short-lived tasks inline until they first block (Python 3.12+)
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    
     parser = argparse.ArgumentParser(description="Monopoly Terminal Test Client")
     parser.add_argument("--host", default="localhost", help="Server host (default: localhost)")
     parser.add_argument("--port", type=int, default=8765, help="Server port (default: 8765)")
@@ -380,6 +465,9 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if uvloop is not None:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("\nGoodbye!")
@@ -10,11 +10,35 @@ import os
 import sys
 import uuid
 
-import websockets
+from websockets.asyncio.client import connect
+
+try:
+    import uvloop
+except ImportError:  # Not available on Windows
+    uvloop = None
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from shared.enums import MessageType
-from shared.constants import BOARD_SPACES
+from shared.enums import MessageType, PlayerState
+from shared.protocol import Message, decode_json, encode_json
+from shared.constants import space_at
+
+# Message type values, bound once rather than looked up on every use
+_BUY_PROPERTY = MessageType.BUY_PROPERTY.value
+_CONNECT = MessageType.CONNECT.value
+_CREATE_GAME = MessageType.CREATE_GAME.value
+_DECLINE_PROPERTY = MessageType.DECLINE_PROPERTY.value
+_END_TURN = MessageType.END_TURN.value
+_ERROR = MessageType.ERROR.value
+_GAME_STATE = MessageType.GAME_STATE.value
+_JOIN_GAME = MessageType.JOIN_GAME.value
+_LIST_GAMES = MessageType.LIST_GAMES.value
+_ROLL_DICE = MessageType.ROLL_DICE.value
+_START_GAME = MessageType.START_GAME.value
+
+_IN_JAIL = PlayerState.IN_JAIL.value
+
+# Hosts where permessage-deflate costs more CPU than the bandwidth it saves
+_LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
 
 
 class TestPlayer:
@@ -28,20 +52,49 @@ class TestPlayer:
         self.ws = None
         self.game_id = None
         self.game_state = None
+        # Request ids only need to be unique on this connection
+        self._next_request_id = 1
     
     async def connect(self):
         """Connect to server."""
+        await self._open()
+        return await self._read_connect_reply()
+    
+    async def connect_and_send(self, msg_type: str, data: dict = None) -> dict | None:
+        """
+        Connect and send a first request without waiting for the CONNECT
+        reply in between.
+        
+        The server reads a connection's frames in order (and drops the
+        rest if CONNECT is refused), so this saves a round trip.
+        
+        Returns:
+            The request's response, or None if the connection was refused
+        """
+        await self._open()
+        request_id = await self._send_request(msg_type, data)
+        if not await self._read_connect_reply():
+            return None
+        return await self._receive_response(request_id)
+    
+    async def _open(self):
+        """Open the socket and send the CONNECT message."""
         url = f"ws://{self.host}:{self.port}"
-        self.ws = await websockets.connect(url)
+        self.ws = await connect(
+            url,
+            compression=None if self.host in _LOCAL_HOSTS else "deflate",
+        )
         
         # Send connect message
-        await self.ws.send(json.dumps({
-            "type": MessageType.CONNECT.value,
+        await self.ws.send(encode_json({
+            "type": _CONNECT,
             "data": {"player_id": self.player_id, "player_name": self.name}
         }))
-        
+    
+    async def _read_connect_reply(self) -> bool:
+        """Read the reply to CONNECT, which is always the first frame."""
         response = await self.ws.recv()
-        data = json.loads(response)
+        data = decode_json(response)
         
         if data.get("data", {}).get("success"):
             print(f"[{self.name}] ✓ Connected (ID: {self.player_id[:8]}...)")
@@ -49,43 +102,90 @@ class TestPlayer:
         print(f"[{self.name}] ✗ Connect failed: {data}")
         return False
     
+    async def _send_request(self, msg_type: str, data: dict = None) -> str:
+        """Send a request frame and return its request_id."""
+        request_id = str(self._next_request_id)
+        self._next_request_id += 1
+        await self.ws.send(Message(MessageType(msg_type), data or {}, request_id).to_json())
+        return request_id
+    
     async def send(self, msg_type: str, data: dict = None) -> dict:
         """Send message and get response."""
-        request_id = str(uuid.uuid4())
-        await self.ws.send(json.dumps({
-            "type": msg_type,
-            "request_id": request_id,
-            "data": data or {}
-        }))
+        request_id = await self._send_request(msg_type, data)
+        return await self._receive_response(request_id)
+    
+    async def _receive_response(self, request_id: str) -> dict:
+        """Read frames until the response to request_id or a game state arrives."""
+        # Read responses until we get ours or a game state; one deadline
+        # covers the whole wait rather than a new timer per frame
+        recv = self.ws.recv
+        async with asyncio.timeout(10.0):
+            while True:
+                response = await recv()
+                resp = decode_json(response)
+                
+                if resp.get("type") == _GAME_STATE:
+                    self.game_state = resp.get("data")
+                    self.game_id = self.game_state.get("game_id")
+                    return resp
+                
+                if resp.get("request_id") == request_id:
+                    return resp
+                
+                # Print other messages
+                print(f"[{self.name}] → {resp.get('type')}: {str(resp.get('data', {}))[:100]}")
+    
+    async def send_pipelined(self, requests: list[tuple[str, dict | None]]) -> list[dict]:
+        """
+        Send several requests back to back, then collect their responses.
         
-        # Read responses until we get ours or a game state
-        while True:
-            response = await asyncio.wait_for(self.ws.recv(), timeout=10.0)
-            resp = json.loads(response)
-            
-            if resp.get("type") == MessageType.GAME_STATE.value:
-                self.game_state = resp.get("data")
-                self.game_id = self.game_state.get("game_id")
-                return resp
-            
-            if resp.get("request_id") == request_id:
-                return resp
-            
-            # Print other messages
-            print(f"[{self.name}] → {resp.get('type')}: {str(resp.get('data', {}))[:100]}")
+        The server handles a connection's messages in order, so this saves
+        a round trip per extra request. Responses are returned in request
+        order.
+        """
+        request_ids = [await self._send_request(msg_type, data) for msg_type, data in requests]
+        
+        responses = {}
+        expected = len(request_ids)
+        recv = self.ws.recv
+        async with asyncio.timeout(10.0):
+            while len(responses) < expected:
+                response = await recv()
+                resp = decode_json(response)
+                
+                if resp.get("type") == _GAME_STATE:
+                    self.game_state = resp.get("data")
+                    self.game_id = self.game_state.get("game_id")
+                
+                if resp.get("request_id") in request_ids:
+                    responses[resp["request_id"]] = resp
+                else:
+                    print(f"[{self.name}] → {resp.get('type')}: {str(resp.get('data', {}))[:100]}")
+        
+        return [responses[request_id] for request_id in request_ids]
     
     async def drain_messages(self, timeout: float = 0.5):
         """Read any pending messages."""
+        frames = []
+        recv = self.ws.recv
         try:
             while True:
-                msg = await asyncio.wait_for(self.ws.recv(), timeout=timeout)
-                data = json.loads(msg)
-                if data.get("type") == MessageType.GAME_STATE.value:
-                    self.game_state = data.get("data")
-                    self.game_id = self.game_state.get("game_id")
-                print(f"[{self.name}] → {data.get('type')}")
+                frames.append(await asyncio.wait_for(recv(), timeout=timeout))
         except asyncio.TimeoutError:
             pass
+        
+        # Handle the burst as a group; only its newest state is kept
+        latest_state = None
+        for msg in frames:
+            resp = decode_json(msg)
+            msg_type = resp.get("type")
+            print(f"[{self.name}] → {msg_type}")
+            if msg_type == _GAME_STATE:
+                latest_state = resp.get("data")
+        
+        if latest_state is not None:
+            self.game_state = latest_state
+            self.game_id = self.game_state.get("game_id")
     
     def print_state(self, verbose=False):
         """Print current game state."""
@@ -98,20 +198,23 @@ class TestPlayer:
             return
         
         status = self.game_state.get('status')
-        players = self.game_state.get('players', [])
-        current_idx = self.game_state.get('current_player_index', 0)
+        # players, current_player_id, phase and last_dice_roll, and each
+        # player's id/name/money/position/state, are always in the state
+        players = self.game_state['players']
+        current_id = self.game_state['current_player_id']
         
         print(f"\n[{self.name}] Game State - {status}")
         print("-" * 50)
-        for i, p in enumerate(players):
-            marker = "→ " if i == current_idx else "  "
-            pos = p.get('position', 0)
-            space = BOARD_SPACES.get(pos, {}).get('name', f'Pos {pos}')
-            jail = " [JAIL]" if p.get('is_in_jail') else ""
-            print(f"  {marker}{p.get('name')}: ${p.get('money')} @ {space}{jail}")
+        for p in players:
+            marker = "→ " if p['id'] == current_id else "  "
+            pos = p['position']
+            space = space_at(pos)
+            space_name = space.name if space else f'Pos {pos}'
+            jail = " [JAIL]" if p['state'] == _IN_JAIL else ""
+            print(f"  {marker}{p['name']}: ${p['money']} @ {space_name}{jail}")
         
-        phase = self.game_state.get('phase', 'unknown')
-        dice = self.game_state.get('last_dice_roll', [])
+        phase = self.game_state['phase']
+        dice = self.game_state['last_dice_roll']
         print(f"  Phase: {phase} | Last roll: {dice}")
         print("-" * 50)
     
@@ -123,6 +226,10 @@ class TestPlayer:
 async def run_test():
     """Run a full test with two players."""
     
+    # Run short-lived tasks inline until they first block (Python 3.12+)
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    
     print("=" * 60)
     print("MONOPOLY TWO-PLAYER TEST")
     print("=" * 60)
@@ -132,32 +239,36 @@ async def run_test():
     player2 = TestPlayer("Bob")
     
     try:
-        # Step 1: Both players connect
+        # Step 1: Both players connect at the same time, so the handshakes
+        # overlap; player 1's CREATE_GAME goes out right behind its CONNECT
         print("\n[STEP 1] Connecting players...")
-        assert await player1.connect(), "Player 1 failed to connect"
-        assert await player2.connect(), "Player 2 failed to connect"
+        player2_connected, resp = await asyncio.gather(
+            player2.connect(),
+            player1.connect_and_send(_CREATE_GAME, {
+                "game_name": "Test Game",
+                "player_name": player1.name
+            }),
+        )
+        assert resp is not None, "Player 1 failed to connect"
+        assert player2_connected, "Player 2 failed to connect"
         
-        # Step 2: Player 1 creates a game
+        # Step 2: Player 1's game was created along with its connection
         print("\n[STEP 2] Player 1 creates a game...")
-        resp = await player1.send(MessageType.CREATE_GAME.value, {
-            "game_name": "Test Game",
-            "player_name": player1.name
-        })
-        assert resp.get("type") == MessageType.GAME_STATE.value, f"Failed to create game: {resp}"
+        assert resp.get("type") == _GAME_STATE, f"Failed to create game: {resp}"
         game_id = player1.game_id
         print(f"[Alice] ✓ Created game: {game_id}")
         
         # Step 3: Player 2 lists games and joins
         print("\n[STEP 3] Player 2 lists and joins the game...")
-        resp = await player2.send(MessageType.LIST_GAMES.value)
+        resp = await player2.send(_LIST_GAMES)
         games = resp.get("data", {}).get("games", [])
         print(f"[Bob] Found {len(games)} game(s)")
         
-        resp = await player2.send(MessageType.JOIN_GAME.value, {
+        resp = await player2.send(_JOIN_GAME, {
             "game_id": game_id,
             "player_name": player2.name
         })
-        assert resp.get("type") == MessageType.GAME_STATE.value, f"Failed to join: {resp}"
+        assert resp.get("type") == _GAME_STATE, f"Failed to join: {resp}"
         print(f"[Bob] ✓ Joined game")
         
         # Drain any broadcast messages
@@ -165,8 +276,8 @@ async def run_test():
         
         # Step 4: Player 1 starts the game
         print("\n[STEP 4] Player 1 starts the game...")
-        resp = await player1.send(MessageType.START_GAME.value)
-        assert resp.get("type") == MessageType.GAME_STATE.value, f"Failed to start: {resp}"
+        resp = await player1.send(_START_GAME)
+        assert resp.get("type") == _GAME_STATE, f"Failed to start: {resp}"
         print(f"[Alice] ✓ Game started!")
         
         await player2.drain_messages()
@@ -184,7 +295,7 @@ async def run_test():
             await player2.drain_messages()
             
             # Determine whose turn it is using current_player_id from state
-            current_player_id = player1.game_state.get('current_player_id')
+            current_player_id = player1.game_state['current_player_id']
             
             if current_player_id == player1.player_id:
                 current = player1
@@ -208,50 +319,59 @@ async def run_test():
             print(f"[{current.name}'s turn]")
             
             # Roll dice
-            resp = await current.send(MessageType.ROLL_DICE.value)
-            if resp.get("type") == MessageType.ERROR.value:
+            resp = await current.send(_ROLL_DICE)
+            if resp.get("type") == _ERROR:
                 print(f"[{current.name}] ✗ Roll failed: {resp.get('data', {}).get('message')}")
                 break
             
             # Get updated state after roll
-            dice = current.game_state.get('last_dice_roll', [])
-            phase = current.game_state.get('phase', 'unknown')
+            dice = current.game_state['last_dice_roll']
+            phase = current.game_state['phase']
             
             pos = None
-            for p in current.game_state.get('players', []):
-                if p.get('id') == current.player_id:
-                    pos = p.get('position')
+            for p in current.game_state['players']:
+                if p['id'] == current.player_id:
+                    pos = p['position']
                     break
             
-            space = BOARD_SPACES.get(pos, {})
-            print(f"[{current.name}] Rolled {dice} (sum: {sum(dice) if dice else 0}) → landed on {space.get('name', pos)} (pos {pos})")
+            space = space_at(pos)
+            print(f"[{current.name}] Rolled {dice} (sum: {sum(dice) if dice else 0}) → landed on {space.name if space else pos} (pos {pos})")
             print(f"[{current.name}] Phase: {phase}")
             
+            # The rest of the turn is known now, so send it in one go:
+            # the property decision (if any), then end turn
+            requests = []
+            decision = None
+            
             # Handle PROPERTY_DECISION phase - need to buy or decline
             if phase == "PROPERTY_DECISION":
-                cost = space.get('cost', 0)
+                cost = space.cost if space else 0
                 print(f"[{current.name}] Must decide on property (${cost})...")
                 
                 # Find current player's money
                 player_money = 0
-                for p in current.game_state.get('players', []):
-                    if p.get('id') == current.player_id:
-                        player_money = p.get('money', 0)
+                for p in current.game_state['players']:
+                    if p['id'] == current.player_id:
+                        player_money = p['money']
                         break
                 
-                if player_money >= cost:
-                    resp = await current.send(MessageType.BUY_PROPERTY.value)
-                    if resp.get("type") == MessageType.ERROR.value:
-                        print(f"[{current.name}] ✗ Buy failed: {resp.get('data', {}).get('message')}")
-                    else:
-                        print(f"[{current.name}] ✓ Bought {space.get('name')} for ${cost}!")
+                decision = _BUY_PROPERTY if player_money >= cost else _DECLINE_PROPERTY
+                requests.append((decision, None))
+            
+            requests.append((_END_TURN, None))
+            *decision_resps, resp = await current.send_pipelined(requests)
+            
+            if decision == _BUY_PROPERTY:
+                buy_resp = decision_resps[0]
+                if buy_resp.get("type") == _ERROR:
+                    print(f"[{current.name}] ✗ Buy failed: {buy_resp.get('data', {}).get('message')}")
                 else:
-                    resp = await current.send(MessageType.DECLINE_PROPERTY.value)
-                    print(f"[{current.name}] Declined (only has ${player_money})")
+                    print(f"[{current.name}] ✓ Bought {space.name if space else None} for ${cost}!")
+            elif decision == _DECLINE_PROPERTY:
+                print(f"[{current.name}] Declined (only has ${player_money})")
             
             # End turn
-            resp = await current.send(MessageType.END_TURN.value)
-            if resp.get("type") == MessageType.ERROR.value:
+            if resp.get("type") == _ERROR:
                 error_msg = resp.get('data', {}).get('message', 'Unknown error')
                 print(f"[{current.name}] ✗ End turn failed: {error_msg}")
                 # If we get doubles, we might need to roll again
@@ -289,5 +409,8 @@ async def run_test():
 
 
 if __name__ == "__main__":
-    success = asyncio.run(run_test())
+    if uvloop is not None:
+        success = uvloop.run(run_test())
+    else:
+        success = asyncio.run(run_test())
     sys.exit(0 if success else 1)
@@ -22,15 +22,18 @@ from shared.constants import (
 )
 
 
+_USE_COLOR = sys.stdout.isatty()
+
+
 class Colors:
-    """ANSI color codes for pretty output."""
-    GREEN = "\033[92m"
-    RED = "\033[91m"
-    YELLOW = "\033[93m"
-    BLUE = "\033[94m"
-    CYAN = "\033[96m"
-    RESET = "\033[0m"
-    BOLD = "\033[1m"
+    """ANSI color codes for pretty output (empty when stdout is not a terminal)."""
+    GREEN = "\033[92m" if _USE_COLOR else ""
+    RED = "\033[91m" if _USE_COLOR else ""
+    YELLOW = "\033[93m" if _USE_COLOR else ""
+    BLUE = "\033[94m" if _USE_COLOR else ""
+    CYAN = "\033[96m" if _USE_COLOR else ""
+    RESET = "\033[0m" if _USE_COLOR else ""
+    BOLD = "\033[1m" if _USE_COLOR else ""
 
 
 def print_header(text: str) -> None:
@@ -96,6 +99,14 @@ class TestResults:
             print(f"\n{Colors.RED}{Colors.BOLD}Some tests failed ✗{Colors.RESET}")
 
 
+def started_game(name: str, *player_names: str) -> tuple[Game, list[Player]]:
+    """Create a game, add the named players and start it."""
+    game = Game(name=name)
+    players = [game.add_player(player_name)[2] for player_name in player_names]
+    game.start_game()
+    return game, players
+
+
 def test_dice() -> bool:
     """Test dice rolling mechanics."""
     print_header("DICE TESTS")
@@ -118,22 +129,24 @@ def test_dice() -> bool:
         f"Total incorrect: {roll.total} != {roll.die1 + roll.die2}"
     ))
     
+    # Test batch rolling
+    print_subheader("Batch Rolling")
+    sequential = Dice(seed=7)
+    expected = [sequential.roll().to_list() for _ in range(20)]
+    firsts, seconds = Dice(seed=7).roll_batch(20)
+    results.add(assert_test(
+        [list(pair) for pair in zip(firsts, seconds)] == expected,
+        "Batch rolls match sequential rolls",
+        "Batch rolls differ from sequential rolls"
+    ))
+    
     # Test doubles detection
     print_subheader("Doubles Detection")
     dice = Dice(seed=12345)
     
-    doubles_found = False
-    non_doubles_found = False
-    
-    for _ in range(100):
-        roll = dice.roll()
-        if roll.is_double:
-            doubles_found = True
-        else:
-            non_doubles_found = True
-        
-        if doubles_found and non_doubles_found:
-            break
+    firsts, seconds = dice.roll_batch(100)
+    doubles_found = any(a == b for a, b in zip(firsts, seconds))
+    non_doubles_found = any(a != b for a, b in zip(firsts, seconds))
     
     results.add(assert_test(
         doubles_found,
@@ -581,10 +594,7 @@ def test_full_game() -> bool:
     print_subheader("Property Purchase")
     
     # Reset and manually position player on Mediterranean
-    game2 = Game(name="Property Test")
-    game2.add_player("Alice")
-    game2.add_player("Bob")
-    game2.start_game()
+    game2, _ = started_game("Property Test", "Alice", "Bob")
     
     current = game2.current_player
     old_money = current.money
@@ -614,10 +624,7 @@ def test_full_game() -> bool:
     
     # Test rent payment
     print_subheader("Rent Payment")
-    game3 = Game(name="Rent Test")
-    _, _, alice = game3.add_player("Alice")
-    _, _, bob = game3.add_player("Bob")
-    game3.start_game()
+    game3, (alice, bob) = started_game("Rent Test", "Alice", "Bob")
     
     # Alice buys Mediterranean
     prop = game3.board.get_property(1)
@@ -638,10 +645,7 @@ def test_full_game() -> bool:
     
     # Test building - FIXED: Use current player
     print_subheader("Building Houses")
-    game4 = Game(name="Building Test")
-    _, _, builder = game4.add_player("Builder")
-    _, _, other = game4.add_player("Other")
-    game4.start_game()
+    game4, _ = started_game("Building Test", "Builder", "Other")
     
     # Make sure Builder is current player
     current = game4.current_player
@@ -689,10 +693,7 @@ def test_full_game() -> bool:
     
     # Test jail mechanics - FIXED: Use current player
     print_subheader("Jail Mechanics")
-    game5 = Game(name="Jail Test")
-    _, _, prisoner = game5.add_player("Prisoner")
-    _, _, guard = game5.add_player("Guard")
-    game5.start_game()
+    game5, _ = started_game("Jail Test", "Prisoner", "Guard")
     
     # Get current player and send them to jail
     current = game5.current_player
@@ -736,10 +737,7 @@ def test_full_game() -> bool:
     
     # Test serialization
     print_subheader("Save/Load Game")
-    game6 = Game(name="Save Test")
-    game6.add_player("Saver")
-    game6.add_player("Loader")
-    game6.start_game()
+    game6, _ = started_game("Save Test", "Saver", "Loader")
     
     # Make some changes
     current = game6.current_player
@@ -782,10 +780,7 @@ def test_full_game() -> bool:
     
     # Test bankruptcy
     print_subheader("Bankruptcy")
-    game7 = Game(name="Bankruptcy Test")
-    _, _, broke = game7.add_player("Broke")
-    _, _, rich = game7.add_player("Rich")
-    game7.start_game()
+    game7, (broke, rich) = started_game("Bankruptcy Test", "Broke", "Rich")
     
     broke.money = 0
     success, msg = game7.declare_bankruptcy(broke.id)
@@ -875,10 +870,7 @@ def test_edge_cases() -> bool:
     
     # Test mortgage with buildings - FIXED: Use current player
     print_subheader("Mortgage Restrictions")
-    game2 = Game(name="Mortgage Test")
-    _, _, player1 = game2.add_player("Mortgager")
-    game2.add_player("Other")
-    game2.start_game()
+    game2, _ = started_game("Mortgage Test", "Mortgager", "Other")
     
     current = game2.current_player
     print_info(f"Current player: {current.name}")
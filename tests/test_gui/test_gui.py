@@ -19,7 +19,7 @@ from PyQt6.QtWidgets import (
     QStackedWidget, QPushButton, QLabel, QGroupBox, QMessageBox,
     QComboBox, QFrame
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont
 
 from shared.constants import BOARD_SPACES
@@ -54,6 +54,9 @@ class GUITestWindow(QMainWindow):
         self._controller = LocalGameController(self)
         self._setup_sample_game()
         
+        # Coalesces bursts of state changes into one display update
+        self._update_pending = False
+        
         self._setup_ui()
         self._connect_signals()
         self._update_display()
@@ -298,6 +301,13 @@ class GUITestWindow(QMainWindow):
     
     def _on_state_changed(self, state: dict) -> None:
         """Handle state change from controller."""
+        if not self._update_pending:
+            self._update_pending = True
+            QTimer.singleShot(0, self._flush_update)
+    
+    def _flush_update(self) -> None:
+        """Apply a coalesced state change."""
+        self._update_pending = False
         self._update_display()
     
     def _on_game_event(self, event_type: str, data: dict) -> None:
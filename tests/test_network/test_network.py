@@ -218,6 +218,35 @@ def test_connection_manager() -> bool:
             "Exclusion failed"
         ))
         
+        print_subheader("Batched Sending")
+        
+        from server.network.connection_manager import BatchedSender
+        
+        ws3 = MockWebSocket("ws3")
+        sender = BatchedSender(ws3, batching=True)
+        sender.feed(msg.to_json())
+        sender.feed(Message(type=MessageType.ERROR, data={"n": 2}).to_json())
+        await sender.flush()
+        batched = ws3.get_messages()
+        results.add(assert_test(
+            len(batched) == 1 and batched[0]["type"] == "BATCH"
+            and [m["type"] for m in batched[0]["data"]["messages"]] == ["GAME_STATE", "ERROR"],
+            "Queued frames flushed as one BATCH frame in order",
+            f"Batched flush wrong: {ws3.sent_messages}"
+        ))
+        
+        ws3.clear_messages()
+        sender = BatchedSender(ws3)
+        sender.feed(msg.to_json())
+        sender.feed(msg.to_json())
+        await sender.flush()
+        await sender.flush()
+        results.add(assert_test(
+            len(ws3.sent_messages) == 2,
+            "Frames sent individually when client has not opted in",
+            f"Unbatched flush sent {len(ws3.sent_messages)} frames"
+        ))
+        
         print_subheader("Disconnect/Reconnect")
         
         # Disconnect
@@ -271,7 +300,7 @@ def test_game_manager() -> bool:
     try:
         from server.network.game_manager import GameManager
         from server.persistence import init_database, GameRepository
-        from shared.protocol import GameSettings
+        from shared.protocol import GameSettings, encode_json
         from shared.enums import GamePhase
         
         db = init_database(temp_db.name)
@@ -344,6 +373,23 @@ def test_game_manager() -> bool:
             f"Failed to start: {msg}"
         ))
         
+        print_subheader("Cached Player State")
+        
+        state = managed.get_state_for_player("host-1")
+        results.add(assert_test(
+            managed.get_state_for_player("host-1") is state
+            and managed.get_state_for_player("player-2") is not state,
+            "Player state reused until the game changes",
+            "Player state rebuilt on every call"
+        ))
+        
+        managed.game.roll_dice(managed.game.current_player.id)
+        results.add(assert_test(
+            managed.get_state_for_player("host-1") is not state,
+            "Player state rebuilt after an action",
+            "Stale player state served after an action"
+        ))
+        
         print_subheader("Save/Load")
         
         # Make changes
@@ -352,6 +398,15 @@ def test_game_manager() -> bool:
         if player:
             player.money = 999
         
+        # Background auto-save only writes when there are unsaved turns
+        saved_dirty = asyncio.run(gm.auto_save_games_in_background([game_id]))
+        saved_clean = asyncio.run(gm.auto_save_games_in_background([game_id]))
+        results.add(assert_test(
+            saved_dirty == [game_id] and not saved_clean and managed.last_saved_turn == 10,
+            "Background auto-save saves dirty games and skips clean ones",
+            f"Background auto-save wrong: {saved_dirty}, {saved_clean}"
+        ))
+        
         # Save
         success, msg = gm.save_game(game_id)
         results.add(assert_test(
@@ -380,6 +435,29 @@ def test_game_manager() -> bool:
             f"Turn number wrong: {loaded.game.turn_number}"
         ))
         
+        # Batched background auto-save skips clean and unknown games
+        loaded.game.turn_number = 11
+        saved_ids = asyncio.run(gm.auto_save_games_in_background([game_id, "missing"]))
+        results.add(assert_test(
+            saved_ids == [game_id] and loaded.last_saved_turn == 11,
+            "Batched auto-save writes only the dirty games",
+            f"Batched auto-save wrong: {saved_ids}"
+        ))
+        
+        # A game that can't be written doesn't stop the rest of its batch
+        _, _, broken = gm.create_game("Broken Game", "host-9", "Zoe")
+        broken.game.turn_number = 1
+        broken.game.board.get_property(1).owner_id = "no-such-player"
+        loaded.game.turn_number = 12
+        saved_ids = asyncio.run(gm.auto_save_games_in_background([broken.game_id, game_id]))
+        results.add(assert_test(
+            saved_ids == [game_id] and loaded.last_saved_turn == 12 and broken.needs_save,
+            "Failed game in a batch doesn't block the others",
+            f"Batch with a failing game wrong: {saved_ids}"
+        ))
+        del gm._games[broken.game_id]
+        del gm._player_games["host-9"]
+        
         print_subheader("Listing Games")
         
         # Create another game
@@ -399,6 +477,21 @@ def test_game_manager() -> bool:
             "No joinable games found"
         ))
         
+        # Listing summaries are reused until the game or its host changes
+        second = next(m for m in gm._games.values() if m.game.name == "Second Game")
+        summary = second.get_summary(joinable=True)[0]
+        reused = gm.list_joinable_games()
+        second.host_player_id = "host-3"
+        rebuilt = second.get_summary(joinable=True)[0]
+        results.add(assert_test(
+            any(game is summary for game in reused)
+            and rebuilt is not summary and rebuilt["host_id"] == "host-3"
+            and gm.encode_game_list([rebuilt]) == encode_json([rebuilt]),
+            "Game summaries cached until the host changes",
+            f"Stale or rebuilt summary: {rebuilt}"
+        ))
+        second.host_player_id = "host-2"
+        
         print_subheader("Leave Game")
         
         success, msg, left_id = gm.leave_game("player-2")
@@ -428,7 +521,7 @@ def test_message_handler() -> bool:
         async def run_tests():
             from server.network import ConnectionManager, GameManager, MessageHandler
             from server.persistence import init_database, GameRepository
-            from shared.protocol import Message
+            from shared.protocol import ListGamesRequest, Message
             from shared.enums import MessageType, GamePhase
             
             db = init_database(temp_db.name)
@@ -456,6 +549,31 @@ def test_message_handler() -> bool:
                 f"Wrong response type: {result.response.type}"
             ))
             
+            # Binary frames carry the same UTF-8 JSON
+            result = await handler.handle_message(
+                "player-1",
+                ListGamesRequest.create().to_json().encode()
+            )
+            results.add(assert_test(
+                result.response.type == MessageType.GAME_LIST,
+                "Binary JSON frames are handled",
+                f"Wrong response type for bytes: {result.response.type}"
+            ))
+            
+            # Large frames are parsed off the event loop, with the same results
+            padding = "x" * 8192
+            result = await handler.handle_message(
+                "player-1",
+                json.dumps({"type": "LIST_GAMES", "data": {"padding": padding}})
+            )
+            bad = await handler.handle_message("player-1", '{"type": ' + padding)
+            results.add(assert_test(
+                result.response.type == MessageType.GAME_LIST
+                and bad.response.data["code"] == "PARSE_ERROR",
+                "Large frames parsed on worker thread",
+                f"Large frame handling wrong: {result.response.type}, {bad.response.data}"
+            ))
+            
             # Create game
             result = await handler.handle_message("player-1", {
                 "type": "CREATE_GAME",
@@ -485,7 +603,24 @@ def test_message_handler() -> bool:
                 "JOIN_GAME returns state and broadcasts",
                 "Join response incorrect"
             ))
-            
+
+            # Pre-encoded game lists serialize exactly like a plain encode
+            result = await handler.handle_message("player-1", {
+                "type": "LIST_GAMES",
+                "data": {},
+                "request_id": "req-list"
+            })
+            plain = Message.to_json(result.response)
+            results.add(assert_test(
+                result.response.games_json is not None
+                and result.response.data["games"]
+                and result.response.request_id == "req-list"
+                and '"request_id":"req-list"' in result.response.to_json()
+                and result.response.to_json() == plain,
+                "Game list JSON matches plain encoding",
+                f"Spliced game list differs: {result.response.to_json()} != {plain}"
+            ))
+
             print_subheader("Host Privileges")
             
             # Non-host cannot start
@@ -569,6 +704,20 @@ def test_message_handler() -> bool:
                 "State query failed"
             ))
             
+            print_subheader("Bankruptcy")
+            
+            result = await handler.handle_message(other_id, {
+                "type": "PLAYER_BANKRUPT",
+                "data": {"creditor_id": current_id}
+            })
+            envelope_types = [m.type for m in result.envelope or []]
+            results.add(assert_test(
+                envelope_types == [MessageType.PLAYER_BANKRUPT, MessageType.GAME_WON]
+                and not result.broadcasts,
+                "Bankruptcy and game over sent as one envelope",
+                f"Unexpected envelope: {envelope_types}, broadcasts: {result.broadcasts}"
+            ))
+            
             print_subheader("Error Handling")
             
             # Invalid JSON
@@ -605,7 +754,8 @@ def test_protocol() -> bool:
     
     from shared.protocol import (
         Message, ErrorMessage, CreateGameRequest, JoinGameRequest,
-        DiceRolledMessage, GameSettings, parse_message
+        DiceRolledMessage, GameStateMessage, BatchMessage, GameSettings, parse_message,
+        encode_json, RollDiceRequest
     )
     from shared.enums import MessageType
     
@@ -622,6 +772,14 @@ def test_protocol() -> bool:
         "Message serialization failed"
     ))
     
+    # Parsed messages are built as the subclass declared for their type
+    results.add(assert_test(
+        isinstance(parsed, RollDiceRequest)
+        and type(parse_message(JoinGameRequest.create("g1", "Bob").to_json())) is Message,
+        "Parsed messages use the subclass for their type",
+        f"Wrong parsed class: {type(parsed).__name__}"
+    ))
+    
     print_subheader("Request Messages")
     
     # Create game request
@@ -654,6 +812,23 @@ def test_protocol() -> bool:
         "ErrorMessage incorrect"
     ))
     
+    # Error serialized without building the message object
+    results.add(assert_test(
+        ErrorMessage.json_for('Bad "input"', "TEST_CODE")
+        == Message.to_json(ErrorMessage.create('Bad "input"', "TEST_CODE")),
+        "ErrorMessage.json_for matches full encode",
+        "ErrorMessage.json_for output differs"
+    ))
+    
+    # Errors reuse their encoded data but keep their own request_id
+    results.add(assert_test(
+        err.to_json() == Message.to_json(err)
+        and ErrorMessage.create("Test error", "TEST_CODE").to_json()
+        == Message.to_json(ErrorMessage.create("Test error", "TEST_CODE")),
+        "ErrorMessage.to_json matches full encode",
+        f"ErrorMessage.to_json output differs: {err.to_json()}"
+    ))
+    
     # Dice rolled message
     dice = DiceRolledMessage.create(
         player_id="p1", player_name="Alice",
@@ -666,6 +841,34 @@ def test_protocol() -> bool:
         "DiceRolledMessage incorrect"
     ))
     
+    # Game state assembled from pre-encoded shared state
+    public = {"game_id": "g1", "players": [{"id": "p1"}], "board": {1: {"houses": 0}}}
+    overlay = {"is_your_turn": True}
+    spliced = GameStateMessage.json_from_parts(encode_json(public), overlay)
+    expected = GameStateMessage.create({**public, **overlay}).to_json()
+    results.add(assert_test(
+        spliced == expected,
+        "GameStateMessage assembled from parts matches full encode",
+        f"Spliced state differs: {spliced}"
+    ))
+    
+    results.add(assert_test(
+        GameStateMessage.json_from_parts("{}", overlay, "req-9")
+        == GameStateMessage.create(dict(overlay), "req-9").to_json(),
+        "GameStateMessage parts handle empty shared state and request ids",
+        "Spliced state wrong for empty shared state"
+    ))
+    
+    # Batch frame wrapping pre-encoded messages
+    frames = [err.to_json(), dice.to_json()]
+    batch = BatchMessage.json_from_frames(frames)
+    expected = BatchMessage(data={"messages": [err.to_dict(), dice.to_dict()]}).to_json()
+    results.add(assert_test(
+        batch == expected and parse_message(batch).type == MessageType.BATCH,
+        "BatchMessage wraps frames as a standard message",
+        f"Batch frame differs: {batch}"
+    ))
+    
     print_subheader("Game Settings")
     
     settings = GameSettings(allow_spectators=True, max_players=6)
@@ -767,10 +970,11 @@ def test_integration() -> bool:
                 bob_msgs = await drain(ws2)
                 alice_msgs = await drain(ws1)
                 
+                bob_states = [m for m in bob_msgs if m["type"] == "GAME_STATE"]
                 results.add(assert_test(
-                    any(m["type"] == "GAME_STATE" for m in bob_msgs),
-                    "Bob received game state",
-                    "Bob didn't receive state"
+                    len(bob_states) == 1,
+                    "Bob received game state once",
+                    f"Bob received {len(bob_states)} game states"
                 ))
                 
                 results.add(assert_test(
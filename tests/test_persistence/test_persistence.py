@@ -5,6 +5,7 @@ Run with: python3 tests/test_persistence/test_persistence.py
 """
 
 import json
+import sqlite3
 import sys
 import tempfile
 import unittest
@@ -23,6 +24,9 @@ from server.persistence import (
     PropertyRecord,
     CardDeckRecord,
 )
+from server.persistence.database import conn_row_factory
+from server.persistence.repository import FULL_SNAPSHOT_INTERVAL, _SQL_LIST_GAMES_BY_STATUS
+from server.persistence.state_diff import diff_states, apply_state_diff
 
 
 class PersistenceTestCase(unittest.TestCase):
@@ -152,7 +156,7 @@ class TestDatabase(PersistenceTestCase):
     
     def test_database_creation(self):
         """Test that database and tables are created."""
-        with self.db.get_connection() as conn:
+        with self.db.get_connection() as conn, conn_row_factory(conn):
             cursor = conn.execute(
                 """
                 SELECT name FROM sqlite_master 
@@ -168,6 +172,16 @@ class TestDatabase(PersistenceTestCase):
             self.assertIn('game_states', tables)
             self.assertIn('card_decks', tables)
     
+    def test_checkpoint_truncates_wal(self):
+        """Test that writes stay in the WAL until an explicit checkpoint."""
+        wal_path = Path(f"{self.db_path}-wal")
+        game = self.create_sample_game()
+        self.assertGreater(wal_path.stat().st_size, 0)
+        
+        self.repository.checkpoint()
+        self.assertEqual(wal_path.stat().st_size, 0)
+        self.assertIsNotNone(self.repository.get_game(game.id))
+    
     def test_foreign_keys_enabled(self):
         """Test that foreign keys are enforced."""
         with self.db.get_connection() as conn:
@@ -175,6 +189,87 @@ class TestDatabase(PersistenceTestCase):
             result = cursor.fetchone()
             self.assertEqual(result[0], 1)
     
+    def test_lobby_listing_uses_covering_index(self):
+        """Test that listing games by status is answered from the index."""
+        with self.db.get_connection(readonly=True) as conn:
+            plan = " ".join(
+                detail for _, _, _, detail in conn.execute(
+                    f"EXPLAIN QUERY PLAN {_SQL_LIST_GAMES_BY_STATUS}",
+                    ("waiting", 50, 0)
+                )
+            )
+            self.assertIn("COVERING INDEX idx_games_lobby", plan)
+            self.assertNotIn("TEMP B-TREE", plan)
+    
+    def test_per_game_reads_need_no_sort(self):
+        """Test that per-game ordered reads are served by an index."""
+        queries = [
+            "SELECT id FROM players WHERE game_id = ? ORDER BY turn_order",
+            "SELECT owner_id FROM properties WHERE game_id = ? ORDER BY position",
+            """
+            SELECT id FROM game_states WHERE game_id = ?
+            ORDER BY turn_number DESC, id DESC LIMIT 1
+            """,
+        ]
+        with self.db.get_connection(readonly=True) as conn:
+            for query in queries:
+                plan = " ".join(
+                    detail for _, _, _, detail in conn.execute(
+                        f"EXPLAIN QUERY PLAN {query}", ("game",)
+                    )
+                )
+                self.assertIn("SEARCH", plan)
+                self.assertNotIn("TEMP B-TREE", plan)
+    
+    def test_writes_run_in_explicit_transactions(self):
+        """Test that only get_connection() begins transactions on the writer."""
+        with self.db.get_connection() as conn:
+            self.assertTrue(conn.in_transaction)
+        self.assertFalse(conn.in_transaction)
+        self.assertIsNone(conn.isolation_level)
+    
+    def test_readonly_connections_are_query_only(self):
+        """Test that pooled reader connections reject writes."""
+        with self.db.get_connection(readonly=True) as conn:
+            with self.assertRaises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM games")
+    
+    def test_readers_see_committed_writes(self):
+        """Test that reads run alongside an open write transaction."""
+        game = self.create_sample_game()
+        
+        with self.db.get_connection() as writer:
+            writer.execute("UPDATE games SET name = ? WHERE id = ?", ("Renamed", game.id))
+            
+            # Reader isn't blocked and still sees the last committed value
+            self.assertEqual(self.repository.get_game(game.id).name, "Test Game")
+        
+        self.assertEqual(self.repository.get_game(game.id).name, "Renamed")
+    
+    def test_migrates_snapshot_base_column(self):
+        """Test that databases created before snapshot deltas are upgraded."""
+        self.db.close_connection()
+        Path(self.db_path).unlink()
+        
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            """
+            CREATE TABLE game_states (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                game_id TEXT NOT NULL,
+                state_json TEXT NOT NULL,
+                turn_number INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        conn.close()
+        
+        self.db = init_database(self.db_path)
+        with self.db.get_connection(readonly=True) as conn:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(game_states)")]
+        self.assertIn("base_snapshot_id", columns)
+    
     def test_reset_database(self):
         """Test database reset functionality."""
         game = self.create_sample_game()
@@ -287,6 +382,27 @@ class TestGameOperations(PersistenceTestCase):
         
         third_page = self.repository.list_games(limit=2, offset=4)
         self.assertEqual(len(third_page), 1)
+    
+    def test_list_games_player_count(self):
+        """Test that the listed player count follows player inserts and deletes."""
+        game = self.create_sample_game()
+        for i in range(3):
+            self.repository.add_player(PlayerRecord(
+                id=f"player-{i}",
+                game_id=game.id,
+                name=f"Player {i}",
+                token="car",
+                turn_order=i
+            ))
+        
+        [summary] = self.repository.list_games()
+        self.assertEqual(summary.player_count, 3)
+        
+        with self.db.get_connection() as conn:
+            conn.execute("DELETE FROM players WHERE id = ?", ("player-0",))
+        
+        [summary] = self.repository.list_games()
+        self.assertEqual(summary.player_count, 2)
 
 
 class TestPlayerOperations(PersistenceTestCase):
@@ -314,6 +430,20 @@ class TestPlayerOperations(PersistenceTestCase):
         self.assertEqual(retrieved.money, 1200)
         self.assertEqual(retrieved.position, 5)
     
+    def test_bool_fields_stored_as_integers(self):
+        """Test that bools bound directly are stored as integer 0/1."""
+        game = self.create_sample_game()
+        player = self.create_sample_players(game)[0]
+        player.is_in_jail = True
+        self.repository.update_player(player)
+        
+        with self.db.get_connection(readonly=True) as conn:
+            row = conn.execute(
+                "SELECT is_in_jail, typeof(is_in_jail), is_bankrupt FROM players WHERE id = ?",
+                (player.id,)
+            ).fetchone()
+        self.assertEqual(row, (1, "integer", 0))
+    
     def test_get_nonexistent_player(self):
         """Test getting a player that doesn't exist."""
         retrieved = self.repository.get_player("nonexistent-id")
@@ -422,6 +552,21 @@ class TestPropertyOperations(PersistenceTestCase):
         self.assertEqual(updated.houses, 5)
         self.assertTrue(updated.is_mortgaged)
     
+    def test_save_properties_batch(self):
+        """Test saving several properties at once, including updates."""
+        game = self.create_sample_game()
+        players = self.create_sample_players(game)
+        properties = self.create_sample_properties(game, players)
+        
+        properties[0].houses = 4
+        properties[1].owner_id = players[1].id
+        self.repository.save_properties(properties)
+        
+        retrieved = self.repository.get_properties_for_game(game.id)
+        self.assertEqual(len(retrieved), 4)
+        self.assertEqual(retrieved[0].houses, 4)
+        self.assertEqual(retrieved[1].owner_id, players[1].id)
+    
     def test_property_ownership_change(self):
         """Test changing property ownership."""
         game = self.create_sample_game()
@@ -471,6 +616,27 @@ class TestGameStateSnapshots(PersistenceTestCase):
         self.assertEqual(loaded_state["turn"], 10)
         self.assertEqual(loaded_state["dice"]["last_roll"], [3, 4])
     
+    def test_snapshots_stored_as_blobs(self):
+        """Test that snapshots are written as JSON bytes and text rows still load."""
+        game = self.create_sample_game()
+        self.repository.save_game_state(game.id, {"turn": 1}, 1)
+        
+        with self.db.get_connection() as conn:
+            [stored_type] = conn.execute(
+                "SELECT typeof(state_json) FROM game_states WHERE game_id = ?",
+                (game.id,)
+            ).fetchone()
+            self.assertEqual(stored_type, "blob")
+            
+            # A snapshot written as text by an older version
+            conn.execute(
+                "INSERT INTO game_states (game_id, state_json, turn_number) VALUES (?, ?, ?)",
+                (game.id, '{"turn": 2}', 2)
+            )
+        
+        snapshot = self.repository.get_latest_game_state(game.id)
+        self.assertEqual(json.loads(snapshot.state_json), {"turn": 2})
+    
     def test_get_latest_snapshot_multiple(self):
         """Test getting latest snapshot when multiple exist."""
         game = self.create_sample_game()
@@ -523,10 +689,124 @@ class TestGameStateSnapshots(PersistenceTestCase):
                 "SELECT COUNT(*) as count FROM game_states WHERE game_id = ?",
                 (game.id,)
             )
-            count = cursor.fetchone()["count"]
+            count = cursor.fetchone()[0]
             self.assertEqual(count, 5)
 
 
+    def save_turns(self, game: GameRecord, turns: range) -> None:
+        """Save a full game once per turn with a changing state snapshot."""
+        for turn in turns:
+            self.repository.save_full_game(
+                game=game,
+                players=[],
+                properties=[],
+                card_decks=[],
+                state_snapshot={
+                    "turn_number": turn,
+                    "players": {"p1": {"money": 1500 - turn, "position": turn % 40}},
+                    "winner_id": None,
+                },
+                turn_number=turn
+            )
+    
+    def test_full_game_snapshots_stored_as_deltas(self):
+        """Test that only every Nth snapshot stores the full state."""
+        game = self.create_sample_game()
+        self.save_turns(game, range(1, FULL_SNAPSHOT_INTERVAL + 3))
+        
+        with self.db.get_connection(readonly=True) as conn:
+            bases = [
+                base for (base,) in conn.execute(
+                    "SELECT base_snapshot_id FROM game_states WHERE game_id = ? ORDER BY id",
+                    (game.id,)
+                )
+            ]
+        
+        self.assertIsNone(bases[0])
+        self.assertTrue(all(base is not None for base in bases[1:FULL_SNAPSHOT_INTERVAL]))
+        self.assertIsNone(bases[FULL_SNAPSHOT_INTERVAL])
+        
+        latest = json.loads(self.repository.get_latest_game_state(game.id).state_json)
+        turn = FULL_SNAPSHOT_INTERVAL + 2
+        self.assertEqual(latest, {
+            "turn_number": turn,
+            "players": {"p1": {"money": 1500 - turn, "position": turn % 40}},
+            "winner_id": None,
+        })
+        
+        at_turn = json.loads(self.repository.get_game_state_at_turn(game.id, 5).state_json)
+        self.assertEqual(at_turn["players"]["p1"]["money"], 1495)
+    
+    def test_rolled_back_snapshot_is_not_used_as_base(self):
+        """Test that a snapshot from a rolled-back save never becomes a delta base."""
+        game_a, game_c = self.create_sample_game(), self.create_sample_game()
+        game_b = GameRecord(id=str(uuid.uuid4()), name="Broken", status="waiting")
+        bad_player = PlayerRecord(
+            id="orphan", game_id="missing-game", name="Nobody", token="car", turn_order=0
+        )
+        
+        def save(game, players, state, turn):
+            return {
+                "game": game,
+                "players": players,
+                "properties": [],
+                "card_decks": [],
+                "state_snapshot": state,
+                "turn_number": turn,
+            }
+        
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.repository.save_full_games([
+                save(game_a, [], {"who": "A", "n": 1}, 1),
+                save(game_b, [bad_player], {"who": "B", "n": 1}, 1),
+            ])
+        
+        # C's first snapshot reuses the id A's rolled-back snapshot had
+        self.repository.save_full_game(**save(game_c, [], {"who": "C", "n": 1}, 1))
+        self.repository.save_full_game(**save(game_a, [], {"who": "A", "n": 2}, 2))
+        
+        latest = self.repository.get_latest_game_state(game_a.id)
+        self.assertEqual(json.loads(latest.state_json), {"who": "A", "n": 2})
+    
+    def test_cleanup_keeps_base_of_delta_snapshots(self):
+        """Test that cleanup never removes a snapshot kept deltas depend on."""
+        game = self.create_sample_game()
+        self.save_turns(game, range(1, 6))
+        
+        self.repository.cleanup_old_snapshots(game.id, keep_count=2)
+        
+        snapshot = self.repository.get_latest_game_state(game.id)
+        self.assertEqual(json.loads(snapshot.state_json)["turn_number"], 5)
+
+
+class TestStateDiff(unittest.TestCase):
+    """Test structural diffs between game states."""
+    
+    def test_round_trip(self):
+        """Test that applying a diff reproduces the new state."""
+        old = {
+            "phase": "in_progress",
+            "players": {"p1": {"money": 1500, "cards": [1, 2]}, "p2": {"money": 900}},
+            "winner_id": "p1",
+            "flag": 1,
+        }
+        new = {
+            "phase": "in_progress",
+            "players": {"p1": {"money": 1300, "cards": [1]}},
+            "winner_id": None,
+            "flag": True,
+            "last_dice_roll": [3, 4],
+        }
+        
+        ops = diff_states(old, new)
+        self.assertEqual(apply_state_diff(json.loads(json.dumps(old)), ops), new)
+    
+    def test_unchanged_state_has_empty_diff(self):
+        """Test that identical states produce no operations."""
+        state = {"players": {"p1": {"money": 1500}}, "board": {"1": {"houses": 0}}}
+        self.assertEqual(diff_states(state, json.loads(json.dumps(state))), [])
+
+
 class TestCardDeckOperations(PersistenceTestCase):
     """Test card deck operations."""
     
@@ -740,6 +1020,69 @@ class TestFullGameSaveLoad(PersistenceTestCase):
         self.assertEqual(loaded["game"].status, "in_progress")
         self.assertEqual(loaded["players"][0].money, 1000)
         self.assertEqual(loaded["players"][0].position, 10)
+    
+    def test_unchanged_rows_are_not_rewritten(self):
+        """Test that save_full_game skips rows unchanged since the last save."""
+        game = self.create_sample_game()
+        players = [
+            PlayerRecord(
+                id=f"player-{i}",
+                game_id=game.id,
+                name=f"Player {i}",
+                token="car",
+                turn_order=i
+            )
+            for i in range(2)
+        ]
+        self.repository.save_full_game(game=game, players=players, properties=[], card_decks=[])
+        
+        # Change the stored rows behind the repository's back
+        with self.db.get_connection() as conn:
+            conn.execute("UPDATE players SET money = 0")
+        
+        players[1].money = 1200
+        self.repository.save_full_game(game=game, players=players, properties=[], card_decks=[])
+        
+        money = {p.id: p.money for p in self.repository.get_players_for_game(game.id)}
+        self.assertEqual(money, {"player-0": 0, "player-1": 1200})
+    
+    def test_save_full_games_batch(self):
+        """Test saving several games in one call."""
+        games = [self.create_sample_game() for _ in range(2)]
+        self.repository.save_full_games([
+            {
+                "game": game,
+                "players": [PlayerRecord(
+                    id=f"player-{i}", game_id=game.id, name="Alice", token="car", turn_order=0
+                )],
+                "properties": [],
+                "card_decks": [],
+                "state_snapshot": {"turn": i},
+                "turn_number": i,
+            }
+            for i, game in enumerate(games)
+        ])
+        
+        for i, game in enumerate(games):
+            loaded = self.repository.load_full_game(game.id)
+            self.assertEqual([p.id for p in loaded["players"]], [f"player-{i}"])
+            self.assertEqual(json.loads(loaded["latest_snapshot"].state_json), {"turn": i})
+    
+    def test_first_save_replaces_properties(self):
+        """Test that a repository's first save of a game drops stale property rows."""
+        game = self.create_sample_game()
+        properties = [
+            PropertyRecord(game_id=game.id, position=position)
+            for position in (1, 3)
+        ]
+        self.repository.save_full_game(game=game, players=[], properties=properties, card_decks=[])
+        
+        # A fresh repository, as after a server restart
+        repository = GameRepository(self.db)
+        repository.save_full_game(game=game, players=[], properties=properties[1:], card_decks=[])
+        
+        positions = [p.position for p in repository.get_properties_for_game(game.id)]
+        self.assertEqual(positions, [3])
 
 
 def run_tests():
@@ -756,6 +1099,7 @@ def run_tests():
         TestGameStateSnapshots,
         TestCardDeckOperations,
         TestFullGameSaveLoad,
+        TestStateDiff,
     ]
     
     for test_class in test_classes: